@@ -9,25 +9,36 @@ Usage:
     python compress.py analyze <input_file>              # Analysis only
     python compress.py compress <input_file>             # Full compression 
     python compress.py validate <original> <compressed>  # Validation only
+    python compress.py analyze-dir <paths or globs...>   # Batch analysis (JSONL summary)
+    python compress.py compress-dir <paths or globs...>  # Batch compression (JSONL summary)
+    python compress.py daemon [--status|--stop]          # Keep models loaded for fast CLI runs
 
 Flags:
     --dry-run          # Show what would be compressed
     --force           # Skip safety checks (dangerous, logs warning)
     --output <file>   # Custom output path
     --report <file>   # Save validation report
+    --stream          # Compress block by block with bounded memory
+    --no-daemon       # Do not use a running daemon
+    --embedding-cache <dir>  # Reuse similarity embeddings across runs
     --verbose         # Detailed progress logging
 """
 
 import argparse
+import glob
+import hashlib
 import json
+import os
 import sys
+import tempfile
 import time
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
 from dataclasses import dataclass, asdict
 import re
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 
 # Import validated components from previous tasks
 try:
@@ -35,6 +46,14 @@ try:
     from scripts.detect_token_drift import TokenDriftDetector, DriftResult
     from scripts.compression_score import CompressionScorer, CompressionMetrics
     from scripts.safety_checks import SafetyValidator
+    from scripts.rule_engine import RuleTable
+    from scripts.near_duplicates import NearDuplicateIndex
+    from scripts.markdown_blocks import (Block, DEFAULT_MAX_BLOCK_CHARS, iter_blocks,
+                                         parse_blocks, render_blocks)
+    from scripts.section_cache import CachedSection, SectionCache, section_key
+    from scripts import embedding_cache
+    from scripts.tokenizer_service import shared_tokenizer
+    from scripts import compression_daemon
 except ImportError as e:
     print(f"Error importing validated components: {e}")
     print("Please ensure scripts/ directory contains validated components from previous tasks.")
@@ -67,6 +86,8 @@ class ValidationResult:
     failure_reason: str
     safety_details: Dict[str, Any]
     validation_time: float
+    model_load_time: float = 0.0  # Part of validation_time spent loading models
+    decided_by: str = ''          # Safety tier that settled the outcome (see SafetyValidator)
 
 
 class ValidationReport:
@@ -94,11 +115,9 @@ class ValidationReport:
         self.safety_passed = safety_result.passed
         
     def _count_tokens(self, text: str) -> int:
-        """Count tokens using tiktoken"""
+        """Count tokens using tiktoken (cl100k_base, the gpt-3.5-turbo encoding)"""
         try:
-            import tiktoken
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-            return len(encoding.encode(text))
+            return shared_tokenizer().count(text)
         except Exception:
             # Fallback to rough estimation
             return len(text.split())
@@ -112,7 +131,7 @@ class ValidationReport:
 ## Summary {status_emoji}
 - **Status**: {"PASSED" if self.safety_result.passed else "FAILED"}
 - **Processing Time**: {self.processing_time:.2f}s
-- **Validation Time**: {self.safety_result.validation_time:.2f}s
+- **Validation Time**: {self.safety_result.validation_time:.2f}s (model loading: {self.safety_result.model_load_time:.2f}s)
 
 ## Token Count
 - **Original Tokens**: {self.original_tokens:,}
@@ -131,6 +150,8 @@ class ValidationReport:
             report += "- **Result**: ✅ All safety checks passed\n"
         else:
             report += f"- **Result**: ❌ Failed - {self.safety_result.failure_reason}\n"
+        if self.safety_result.decided_by:
+            report += f"- **Decided By**: {self.safety_result.decided_by} checks\n"
         
         if self.safety_result.warnings:
             report += "\n### Warnings\n"
@@ -161,7 +182,8 @@ class ValidationReport:
             "summary": {
                 "passed": self.safety_result.passed,
                 "processing_time": self.processing_time,
-                "validation_time": self.safety_result.validation_time
+                "validation_time": self.safety_result.validation_time,
+                "model_load_time": self.safety_result.model_load_time
             },
             # Add flat fields for test compatibility
             "original_tokens": self.original_tokens,
@@ -180,6 +202,7 @@ class ValidationReport:
                 "passed": self.safety_result.passed,
                 "warnings": self.safety_result.warnings,
                 "failure_reason": self.safety_result.failure_reason,
+                "decided_by": self.safety_result.decided_by,
                 "details": self.safety_result.safety_details
             },
             "token_drift": asdict(self.token_drift) if hasattr(self.token_drift, '__dict__') else str(self.token_drift),
@@ -188,49 +211,258 @@ class ValidationReport:
         }
 
 
+@dataclass
+class SpanTable:
+    """Protected spans of one document, found in a single scan"""
+    text: str          # Document with each protected span replaced by a placeholder
+    spans: List[str]   # Original span content, indexed by placeholder number
+
+    PLACEHOLDER_PATTERN = re.compile(r'__PRESERVE_(\d+)__')
+
+    def restore(self, text: str) -> str:
+        """Put every protected span back in a single pass"""
+        if not self.spans:
+            return text
+        return self.PLACEHOLDER_PATTERN.sub(self._span, text)
+
+    def _span(self, match: re.Match) -> str:
+        index = int(match.group(1))
+        return self.spans[index] if index < len(self.spans) else match.group(0)
+
+
+@dataclass
+class _BlockNode:
+    """A block being compressed; prose blocks carry their protected body"""
+    block: Block
+    spans: Optional[SpanTable] = None  # Set for prose blocks only
+    body: str = ''                     # Protected text the techniques rewrite
+    tail: str = ''                     # Trailing line breaks, kept as-is
+
+    def render(self) -> Block:
+        if self.spans is None:
+            return self.block
+        return Block(self.block.kind, self.spans.restore(self.body) + self.tail)
+
+
 class LSCTechniques:
     """Implementation of 5 core LSC compression techniques"""
-    
+
+    # Content that must never be compressed. Images come before links so the
+    # leading "!" stays inside the protected span.
+    PRESERVE_PATTERNS = [
+        r'```[\s\S]*?```',            # Code blocks
+        r'`[^`]+`',                  # Inline code
+        r'!\[[^\]]*\]\([^)]+\)',      # Images
+        r'\[[^\]]+\]\([^)]+\)',       # Links
+        r'^\|.*\|$',                 # Table rows
+        r'^<!--[\s\S]*?-->$',         # HTML comments
+        r'__PRESERVE_\d+__',          # Placeholder-shaped source text (restored verbatim)
+    ]
+    PRESERVE_RE = re.compile('|'.join(f'(?:{p})' for p in PRESERVE_PATTERNS), re.MULTILINE)
+
+    # Substitution tables, compiled once into as few passes as possible
+    TECHNICAL_SHORTHAND = RuleTable.from_regex({
+        r'HyperText Transfer Protocol Secure\s*\(HTTPS\)': 'HTTPS',
+        r'HyperText Transfer Protocol\s*\(HTTP\)': 'HTTP',
+        r'Transport Layer Security\s*\(TLS\)': 'TLS',
+        r'Secure Sockets Layer\s*\(SSL\)': 'SSL',
+        r'JavaScript Object Notation\s*\(JSON\)': 'JSON',
+        r'Application Programming Interface\s*\(API\)': 'API',
+        r'Uniform Resource Locator\s*\(URL\)': 'URL',
+        r'Structured Query Language\s*\(SQL\)': 'SQL',
+        r'Cascading Style Sheets\s*\(CSS\)': 'CSS',
+        r'HyperText Markup Language\s*\(HTML\)': 'HTML',
+        # OAuth patterns
+        r'OAuth\s*2\.0': 'OAuth2',
+        r'JSON Web Token\s*\(JWT\)': 'JWT',
+        # Common expansions
+        r'configuration': 'config',
+        r'authentication': 'auth',
+        r'authorization': 'authz',
+        r'environment': 'env',
+        r'development': 'dev',
+        r'production': 'prod',
+    }, re.IGNORECASE, name='technical_shorthand')
+
+    # Filler words and phrases are removed, then phrasing is made concise
+    FILLER_PATTERNS = [
+        r'\b(?:When\s+you\s+(?:are\s+)?(?:making|working|dealing)\s+with)\b',
+        r'\b(?:In\s+order\s+to)\b',
+        r'\b(?:It\s+is\s+important\s+to\s+(?:understand\s+that)?)\b',
+        r'\b(?:Please\s+(?:note\s+that|ensure\s+that|make\s+sure))\b',
+        r'\b(?:You\s+(?:need\s+to|should|must))\b',
+        r'\b(?:that\s+you\s+(?:need\s+to|should|must))\b',
+        r'\b(?:make\s+sure\s+(?:that\s+)?(?:you\s+)?)\b',
+        r'\b(?:ensure\s+that\s+(?:you\s+)?)\b',
+    ]
+    CONCISE_REPLACEMENTS = {
+        r'requests to the API': 'API requests',
+        r'include.*?in the.*?header': 'include in header',
+        r'authentication headers?': 'auth header',
+        r'in every (?:single )?request': 'in requests',
+        r'all API endpoints': 'endpoints',
+        r'making requests to': 'requesting',
+        r'for the purpose of': 'for',
+        r'in the event that': 'if',
+        r'at this point in time': 'now',
+        r'due to the fact that': 'because',
+    }
+    INFORMATION_DENSITY = RuleTable.chain(
+        RuleTable.from_regex([(p, '') for p in FILLER_PATTERNS], re.IGNORECASE),
+        RuleTable.from_regex(CONCISE_REPLACEMENTS, re.IGNORECASE),
+        name='information_density',
+    )
+
+    # Word-overlap (Jaccard) similarity above which a sentence is redundant
+    REDUNDANCY_THRESHOLD = 0.7
+
+    # Bump when technique code changes output; table edits are picked up by rules_fingerprint()
+    RULES_VERSION = "1"
+
     def __init__(self):
-        self.preserve_patterns = [
-            r'```[\s\S]*?```',  # Code blocks
-            r'`[^`]+`',         # Inline code
-            r'\[([^\]]+)\]\(([^)]+)\)',  # Links
-            r'!\[([^\]]*)\]\(([^)]+)\)', # Images
-            r'^\|.*\|$',        # Table rows
-            r'^<!--[\s\S]*?-->$', # HTML comments
-        ]
-    
-    def _preserve_special_content(self, text: str) -> Tuple[str, Dict[str, str]]:
-        """Extract and preserve special content that shouldn't be compressed"""
-        preserved = {}
-        preserved_text = text
-        
-        for i, pattern in enumerate(self.preserve_patterns):
-            matches = re.findall(pattern, text, re.MULTILINE)
-            for j, match in enumerate(matches):
-                if isinstance(match, tuple):
-                    match_text = f"[{match[0]}]({match[1]})" if pattern.endswith(r'\)') else match[0]
-                else:
-                    match_text = match
-                
-                placeholder = f"__PRESERVE_{i}_{j}__"
-                preserved[placeholder] = match_text
-                preserved_text = preserved_text.replace(match_text, placeholder, 1)
-        
-        return preserved_text, preserved
-    
-    def _restore_preserved_content(self, text: str, preserved: Dict[str, str]) -> str:
-        """Restore preserved content"""
-        restored = text
-        for placeholder, content in preserved.items():
-            restored = restored.replace(placeholder, content)
-        return restored
-    
+        self._protected_steps = {
+            'lists_tables': self._lists_tables,
+            'hierarchical_structure': self._hierarchical_structure,
+            'remove_redundancy': self._remove_redundancy,
+            'technical_shorthand': self._technical_shorthand,
+            'information_density': self._information_density,
+        }
+
+    @classmethod
+    def rules_fingerprint(cls) -> str:
+        """Identify the rule set, so cached output is invalidated when rules change"""
+        parts = [cls.RULES_VERSION, str(cls.REDUNDANCY_THRESHOLD), *cls.PRESERVE_PATTERNS]
+        for table in (cls.TECHNICAL_SHORTHAND, cls.INFORMATION_DENSITY):
+            parts.extend(f"{rule.pattern}\0{rule.replacement}\0{rule.flags}" for rule in table.rules)
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+    def protect(self, text: str) -> SpanTable:
+        """Find all protected spans once and replace them with placeholders"""
+        spans = []
+        parts = []
+        last = 0
+
+        for match in self.PRESERVE_RE.finditer(text):
+            parts.append(text[last:match.start()])
+            parts.append(f"__PRESERVE_{len(spans)}__")
+            spans.append(match.group(0))
+            last = match.end()
+
+        parts.append(text[last:])
+        return SpanTable(text=''.join(parts), spans=spans)
+
+    def apply_protected(self, technique: str, protected_text: str) -> str:
+        """Apply one technique to text that has already been through protect()"""
+        try:
+            step = self._protected_steps[technique]
+        except KeyError:
+            raise ValueError(f"Unknown LSC technique: {technique}")
+        return step(protected_text)
+
+    def apply_techniques(self, text: str, techniques: List[str]) -> str:
+        """Apply techniques in order, protecting and restoring the document once"""
+        table = self.protect(text)
+        result = table.text
+        for technique in techniques:
+            result = self.apply_protected(technique, result)
+        return table.restore(result)
+
+    def apply_to_blocks(self, blocks: List[Block], techniques: List[str]) -> List[Block]:
+        """Apply techniques in order to the prose blocks of a parsed document.
+
+        Each paragraph is protected once; code, tables and other non-prose
+        blocks are passed through untouched. Redundancy is removed across the
+        whole document and hierarchy headers are inserted as new blocks.
+        """
+        return list(self.iter_apply_to_blocks(blocks, techniques))
+
+    def iter_apply_to_blocks(self, blocks: Iterable[Block], techniques: List[str],
+                             redundancy_window: Optional[int] = None) -> Iterator[Block]:
+        """Streaming form of apply_to_blocks: blocks go in and come out one at a time.
+
+        Each technique is a generator stage, so output matches apply_to_blocks
+        while only a handful of blocks are held at once. With redundancy_window
+        set, the redundancy index is reset after that many kept sentences to
+        bound memory on unbounded input.
+        """
+        for technique in techniques:
+            if technique not in self._protected_steps:
+                raise ValueError(f"Unknown LSC technique: {technique}")
+
+        nodes = (self._block_node(block) for block in blocks)
+        for technique in techniques:
+            if technique == 'hierarchical_structure':
+                nodes = self._hierarchical_blocks(nodes)
+            elif technique == 'remove_redundancy':
+                nodes = self._remove_redundant_blocks(nodes, redundancy_window)
+            else:
+                nodes = self._rewrite_blocks(nodes, technique)
+
+        for node in nodes:
+            yield node.render()
+
+    def _block_node(self, block: Block) -> '_BlockNode':
+        if not block.is_prose:
+            return _BlockNode(block)
+        body = block.text.rstrip('\r\n')
+        spans = self.protect(body)
+        return _BlockNode(block, spans, spans.text, block.text[len(body):])
+
+    def _rewrite_blocks(self, nodes: Iterable['_BlockNode'], technique: str) -> Iterator['_BlockNode']:
+        for node in nodes:
+            if node.spans is not None:
+                node.body = self.apply_protected(technique, node.body)
+            yield node
+
+    def _hierarchical_blocks(self, nodes: Iterable['_BlockNode']) -> Iterator['_BlockNode']:
+        """Insert headers before paragraphs that open a new topic"""
+        position = 0  # Index among non-gap blocks, as _should_add_header expects
+
+        for node in nodes:
+            if node.spans is not None and self._should_add_header(node.body, position, []):
+                header = self._generate_header(node.body)
+                if header:
+                    yield _BlockNode(Block('heading', f"## {header}\n"))
+                    yield _BlockNode(Block('gap', "\n"))
+            if node.block.kind != 'gap':
+                position += 1
+            yield node
+
+    def _remove_redundant_blocks(self, nodes: Iterable['_BlockNode'],
+                                 window: Optional[int] = None) -> Iterator['_BlockNode']:
+        """Drop sentences repeated anywhere earlier in the document's prose"""
+        index = NearDuplicateIndex(threshold=self.REDUNDANCY_THRESHOLD)
+        skip_gap = False
+
+        for node in nodes:
+            if skip_gap and node.block.kind == 'gap':
+                skip_gap = False
+                continue
+            skip_gap = False
+            if node.spans is not None:
+                if window and len(index) >= window:
+                    index = NearDuplicateIndex(threshold=self.REDUNDANCY_THRESHOLD)
+                node.body = self._remove_redundancy(node.body, index)
+                if not node.body:
+                    skip_gap = True  # Paragraph fully redundant: drop it and its blank line
+                    continue
+            yield node
+
+    def apply_pipeline(self, text: str, techniques: List[str], pipeline: str = 'text') -> str:
+        """Apply techniques with the whole-text ('text') or markdown block ('ast') pipeline"""
+        if pipeline == 'ast':
+            # Parse once; techniques only see paragraphs and the tree is rendered once
+            return render_blocks(self.apply_to_blocks(parse_blocks(text), techniques))
+        if pipeline == 'text':
+            return self.apply_techniques(text, techniques)
+        raise ValueError(f"Unknown pipeline: {pipeline}")
+
     def apply_lists_tables(self, text: str) -> str:
         """Convert prose to structured lists/tables (σ↑)"""
-        preserved_text, preserved = self._preserve_special_content(text)
-        
+        return self.apply_techniques(text, ['lists_tables'])
+
+    def _lists_tables(self, preserved_text: str) -> str:
+        """Convert prose to structured lists/tables (σ↑) on protected text"""
         # Pattern: sentences describing multiple items/methods/features
         list_patterns = [
             # "First... Second... Third..." patterns
@@ -252,7 +484,7 @@ class LSCTechniques:
                     list_text = self._format_as_list(items)
                     result = result.replace(match, list_text)
         
-        return self._restore_preserved_content(result, preserved)
+        return result
     
     def _extract_list_items(self, text: str) -> List[str]:
         """Extract list items from verbose prose"""
@@ -295,13 +527,15 @@ class LSCTechniques:
     
     def apply_hierarchical_structure(self, text: str) -> str:
         """Add/improve document hierarchy (σ↑)"""
-        preserved_text, preserved = self._preserve_special_content(text)
-        
+        return self.apply_techniques(text, ['hierarchical_structure'])
+
+    def _hierarchical_structure(self, preserved_text: str) -> str:
+        """Add/improve document hierarchy (σ↑) on protected text"""
         # Split into paragraphs
         paragraphs = [p.strip() for p in preserved_text.split('\n\n') if p.strip()]
         
         if len(paragraphs) < 2:
-            return self._restore_preserved_content(preserved_text, preserved)
+            return preserved_text
         
         result_parts = []
         
@@ -320,7 +554,7 @@ class LSCTechniques:
             result_parts.append(para)
         
         result = '\n\n'.join(result_parts)
-        return self._restore_preserved_content(result, preserved)
+        return result
     
     def _should_add_header(self, paragraph: str, index: int, all_paragraphs: List[str]) -> bool:
         """Determine if paragraph should get a header"""
@@ -370,128 +604,89 @@ class LSCTechniques:
     
     def remove_redundancy(self, text: str) -> str:
         """Eliminate duplicate information (γ↓)"""
-        preserved_text, preserved = self._preserve_special_content(text)
-        
+        return self.apply_techniques(text, ['remove_redundancy'])
+
+    def _remove_redundancy(self, preserved_text: str,
+                           index: Optional[NearDuplicateIndex] = None) -> str:
+        """Eliminate duplicate information (γ↓) on protected text
+
+        Pass an index to also drop sentences already seen in earlier text.
+        """
         # Split into sentences
         sentences = re.split(r'[.!?]+', preserved_text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
-        # Remove semantically similar sentences
-        unique_sentences = []
-        
-        for sentence in sentences:
-            is_duplicate = False
-            
-            for existing in unique_sentences:
-                if self._are_semantically_similar(sentence, existing):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_sentences.append(sentence)
+        # Remove semantically similar sentences. The MinHash index only
+        # compares each sentence with kept sentences in matching LSH buckets.
+        if index is None:
+            index = NearDuplicateIndex(threshold=self.REDUNDANCY_THRESHOLD)
+        unique_sentences = [s for s in sentences if not index.is_duplicate(s)]
         
         # Rejoin sentences
         result = '. '.join(unique_sentences)
         if result and not result.endswith('.'):
             result += '.'
         
-        return self._restore_preserved_content(result, preserved)
-    
-    def _are_semantically_similar(self, sent1: str, sent2: str, threshold: float = 0.7) -> bool:
-        """Check if two sentences are semantically similar"""
-        # Simple similarity based on word overlap
-        words1 = set(sent1.lower().split())
-        words2 = set(sent2.lower().split())
-        
-        if not words1 or not words2:
-            return False
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        similarity = len(intersection) / len(union)
-        return similarity >= threshold
+        return result
     
     def apply_technical_shorthand(self, text: str) -> str:
         """Use standard abbreviations (κ↓)"""
-        preserved_text, preserved = self._preserve_special_content(text)
-        
-        # Technical term replacements
-        replacements = {
-            r'HyperText Transfer Protocol Secure\s*\(HTTPS\)': 'HTTPS',
-            r'HyperText Transfer Protocol\s*\(HTTP\)': 'HTTP',
-            r'Transport Layer Security\s*\(TLS\)': 'TLS',
-            r'Secure Sockets Layer\s*\(SSL\)': 'SSL',
-            r'JavaScript Object Notation\s*\(JSON\)': 'JSON',
-            r'Application Programming Interface\s*\(API\)': 'API',
-            r'Uniform Resource Locator\s*\(URL\)': 'URL',
-            r'Structured Query Language\s*\(SQL\)': 'SQL',
-            r'Cascading Style Sheets\s*\(CSS\)': 'CSS',
-            r'HyperText Markup Language\s*\(HTML\)': 'HTML',
-            # OAuth patterns
-            r'OAuth\s*2\.0': 'OAuth2',
-            r'JSON Web Token\s*\(JWT\)': 'JWT',
-            # Common expansions
-            r'configuration': 'config',
-            r'authentication': 'auth',
-            r'authorization': 'authz',
-            r'environment': 'env',
-            r'development': 'dev',
-            r'production': 'prod',
-        }
-        
-        result = preserved_text
-        
-        for pattern, replacement in replacements.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        return self._restore_preserved_content(result, preserved)
+        return self.apply_techniques(text, ['technical_shorthand'])
+
+    def _technical_shorthand(self, preserved_text: str) -> str:
+        """Use standard abbreviations (κ↓) on protected text"""
+        return self.TECHNICAL_SHORTHAND.apply(preserved_text)
     
     def increase_information_density(self, text: str) -> str:
         """Pack more meaning per token (σ↑ γ↑)"""
-        preserved_text, preserved = self._preserve_special_content(text)
-        
-        # Remove filler words and phrases
-        filler_patterns = [
-            r'\b(?:When\s+you\s+(?:are\s+)?(?:making|working|dealing)\s+with)\b',
-            r'\b(?:In\s+order\s+to)\b',
-            r'\b(?:It\s+is\s+important\s+to\s+(?:understand\s+that)?)\b',
-            r'\b(?:Please\s+(?:note\s+that|ensure\s+that|make\s+sure))\b',
-            r'\b(?:You\s+(?:need\s+to|should|must))\b',
-            r'\b(?:that\s+you\s+(?:need\s+to|should|must))\b',
-            r'\b(?:make\s+sure\s+(?:that\s+)?(?:you\s+)?)\b',
-            r'\b(?:ensure\s+that\s+(?:you\s+)?)\b',
-        ]
-        
-        # Conciseness replacements
-        concise_replacements = {
-            r'requests to the API': 'API requests',
-            r'include.*?in the.*?header': 'include in header',
-            r'authentication headers?': 'auth header',
-            r'in every (?:single )?request': 'in requests',
-            r'all API endpoints': 'endpoints',
-            r'making requests to': 'requesting',
-            r'for the purpose of': 'for',
-            r'in the event that': 'if',
-            r'at this point in time': 'now',
-            r'due to the fact that': 'because',
-        }
-        
-        result = preserved_text
-        
-        # Remove filler patterns
-        for pattern in filler_patterns:
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE)
-        
-        # Apply conciseness replacements
-        for pattern, replacement in concise_replacements.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+        return self.apply_techniques(text, ['information_density'])
+
+    def _information_density(self, preserved_text: str) -> str:
+        """Pack more meaning per token (σ↑ γ↑) on protected text"""
+        result = self.INFORMATION_DENSITY.apply(preserved_text)
         
         # Clean up extra whitespace
         result = re.sub(r'\s+', ' ', result)
         result = re.sub(r'\s*([.!?])', r'\1', result)
         
-        return self._restore_preserved_content(result, preserved)
+        return result
+
+
+@dataclass
+class SectionSegment:
+    """A run of document lines compressed (or passed through) as one unit"""
+    start: int            # First line (0-based, inclusive)
+    end: int              # Last line (0-based, exclusive)
+    has_header: bool      # First line is a section header, kept verbatim
+    needs_compression: bool
+
+
+# One LSCTechniques per worker process, created on first use
+_worker_lsc: Optional[LSCTechniques] = None
+
+
+def _compress_section_body(job: Tuple[str, List[str], str]) -> str:
+    """Process pool entry point: compress one section body"""
+    global _worker_lsc
+    body, techniques, pipeline = job
+    if _worker_lsc is None:
+        _worker_lsc = LSCTechniques()
+
+    # Keep the blank lines around the body so sections stay separated
+    stripped = body.strip()
+    if not stripped:
+        return body
+    leading = body[:len(body) - len(body.lstrip())]
+    trailing = body[len(body.rstrip()):]
+    return leading + _worker_lsc.apply_pipeline(stripped, techniques, pipeline) + trailing
+
+
+# Streaming mode cannot analyse the whole document, so it applies every technique
+STREAM_TECHNIQUES = ('lists_tables', 'hierarchical_structure', 'information_density',
+                     'remove_redundancy', 'technical_shorthand')
+
+# Kept sentences remembered for redundancy removal while streaming
+STREAM_REDUNDANCY_WINDOW = 50_000
 
 
 class CompressionTool:
@@ -504,23 +699,21 @@ class CompressionTool:
         self.safety = SafetyValidator()
         self.drift_detector = TokenDriftDetector()
         self.lsc = LSCTechniques()
-        
-        # Add score_text method to scorer for compatibility
-        if not hasattr(self.scorer, 'score_text'):
-            self.scorer.score_text = lambda text: type('obj', (object,), {
-                'compression_score': self.scorer.calculate_score(text)['overall_score'],
-                'metrics': self.scorer.calculate_score(text)['metrics']
-            })()
     
     def analyze_document(self, file_path: str) -> AnalysisResult:
         """Analyze document and recommend compression techniques"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return self._analyze_content(file_path, content)
+
+    def _analyze_content(self, file_path: str, content: str) -> AnalysisResult:
+        """Analyze already-read document content (one scoring run)"""
         start_time = time.time()
         
         try:
-            # Read document
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+            # Each section and the document are scored once per run
+            self.scorer.clear_memo()
+
             # Analyze with ContentAnalyzer
             analysis = self.analyzer.analyze_document(content)
             
@@ -528,8 +721,7 @@ class CompressionTool:
             recommended_techniques = self._determine_techniques(analysis)
             
             # Calculate overall compression score
-            score_result = self.scorer.calculate_score(content)
-            compression_score = score_result['overall_score']
+            compression_score = self.scorer.score_text(content).compression_score
             
             analysis_time = time.time() - start_time
             
@@ -578,43 +770,280 @@ class CompressionTool:
 
         return techniques
     
-    def compress_file(self, file_path: str, dry_run: bool = False) -> str:
-        """Compress a file using appropriate LSC techniques"""
+    def compress_file(self, file_path: str, dry_run: bool = False, pipeline: str = 'text',
+                      workers: Optional[int] = None) -> str:
+        """Compress a file using appropriate LSC techniques
+
+        pipeline='text' runs techniques over the whole document string;
+        pipeline='ast' parses the markdown once and only rewrites prose blocks.
+        With workers set, sections flagged needs_compression are compressed
+        independently in a process pool (0 = one process per CPU).
+        """
         logger.info(f"{'Dry run: ' if dry_run else ''}Compressing {file_path}")
         
         with open(file_path, 'r', encoding='utf-8') as f:
             original = f.read()
         
         # Analyze first
-        analysis = self.analyze_document(file_path)
+        analysis = self._analyze_content(file_path, original)
         
         if not analysis.needs_compression:
             logger.info("Document doesn't need compression (score >= 0.6)")
             return original
         
-        # Apply techniques
-        compressed = original
-        
-        for technique in analysis.recommended_techniques:
-            logger.info(f"Applying technique: {technique}")
-            
-            if technique == 'lists_tables':
-                compressed = self.lsc.apply_lists_tables(compressed)
-            elif technique == 'hierarchical_structure':
-                compressed = self.lsc.apply_hierarchical_structure(compressed)
-            elif technique == 'remove_redundancy':
-                compressed = self.lsc.remove_redundancy(compressed)
-            elif technique == 'technical_shorthand':
-                compressed = self.lsc.apply_technical_shorthand(compressed)
-            elif technique == 'information_density':
-                compressed = self.lsc.increase_information_density(compressed)
-        
+        if workers is not None:
+            compressed = self.compress_sections(original, analysis.sections,
+                                                analysis.recommended_techniques, pipeline, workers)
+        else:
+            for technique in analysis.recommended_techniques:
+                logger.info(f"Applying technique: {technique}")
+            compressed = self.lsc.apply_pipeline(original, analysis.recommended_techniques, pipeline)
+
         if dry_run:
             logger.info(f"Dry run complete. Would reduce from {len(original)} to {len(compressed)} characters")
             return compressed
         
         return compressed
     
+    def compress_stream(self, input_path: str, output_path: str,
+                        techniques: Optional[List[str]] = None,
+                        max_block_chars: int = DEFAULT_MAX_BLOCK_CHARS,
+                        redundancy_window: int = STREAM_REDUNDANCY_WINDOW) -> Dict[str, int]:
+        """Compress a file block by block without reading it into memory.
+
+        Blocks are read lazily (see iter_blocks), compressed with the ast
+        pipeline and written out as they are produced, so peak memory depends
+        on max_block_chars rather than file size. Whole-document analysis and
+        safety validation need the full text and are not run; techniques
+        default to all five. Output goes to a temporary file that replaces
+        output_path on success, so input_path may equal output_path.
+        """
+        if techniques is None:
+            techniques = list(STREAM_TECHNIQUES)
+        logger.info(f"Streaming {input_path} with techniques: {', '.join(techniques)}")
+
+        stats = {'blocks': 0, 'prose_blocks': 0, 'input_chars': 0, 'output_chars': 0}
+
+        def counted(blocks: Iterable[Block]) -> Iterator[Block]:
+            for block in blocks:
+                stats['blocks'] += 1
+                stats['prose_blocks'] += block.is_prose
+                stats['input_chars'] += len(block.text)
+                yield block
+
+        output = Path(output_path)
+        fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=output.name, suffix='.tmp')
+        try:
+            # newline='' keeps line endings byte-for-byte through the round trip
+            with open(input_path, 'r', encoding='utf-8', newline='') as src, \
+                    os.fdopen(fd, 'w', encoding='utf-8', newline='') as dst:
+                blocks = counted(iter_blocks(src, max_block_chars))
+                for block in self.lsc.iter_apply_to_blocks(blocks, techniques, redundancy_window):
+                    dst.write(block.text)
+                    stats['output_chars'] += len(block.text)
+            os.replace(tmp_path, output)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        return stats
+
+    def compress_sections(self, document: str, sections: List[Dict], techniques: List[str],
+                          pipeline: str = 'text', workers: int = 0) -> str:
+        """Compress flagged sections in parallel and reassemble the document in order"""
+        lines = document.split('\n')
+        segments = self._plan_segments(lines, sections)
+
+        jobs = []
+        for segment in segments:
+            if segment.needs_compression and techniques:
+                body_start = segment.start + 1 if segment.has_header else segment.start
+                jobs.append(('\n'.join(lines[body_start:segment.end]), techniques, pipeline))
+
+        logger.info(f"Compressing {len(jobs)} of {len(segments)} sections "
+                    f"with techniques: {', '.join(techniques)}")
+
+        bodies = iter(self._run_section_jobs(jobs, workers))
+
+        parts = []
+        for segment in segments:
+            if not (segment.needs_compression and techniques):
+                parts.append('\n'.join(lines[segment.start:segment.end]))
+            elif segment.has_header and segment.end - segment.start == 1:
+                next(bodies)  # Header with no body
+                parts.append(lines[segment.start])
+            elif segment.has_header:
+                parts.append(lines[segment.start] + '\n' + next(bodies))
+            else:
+                parts.append(next(bodies))
+        return '\n'.join(parts)
+
+    @staticmethod
+    def _run_section_jobs(jobs: List[Tuple[str, List[str], str]], workers: Optional[int]) -> List[str]:
+        """Compress section bodies, in a process pool when there is more than one"""
+        max_workers = 1 if workers is None else (workers or os.cpu_count() or 1)
+        if len(jobs) > 1 and max_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+                return list(pool.map(_compress_section_body, jobs))
+        return [_compress_section_body(job) for job in jobs]
+
+    def compress_incremental(self, file_path: str, cache_path: str, pipeline: str = 'text',
+                             workers: Optional[int] = None, force: bool = False,
+                             dry_run: bool = False) -> Tuple[str, Dict]:
+        """Compress a file section by section, reusing cached results for unchanged sections.
+
+        Sections are keyed by a hash of their text, the pipeline and the rule
+        fingerprint. Only changed sections are analysed, compressed and
+        safety-checked; a section that fails its safety check is kept as-is.
+        The output carries compression frontmatter with document and
+        per-section token baselines for TokenDriftDetector. A dry run reads
+        the cache but leaves the cache file untouched.
+
+        Returns:
+            (compressed document, stats dict)
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            original = f.read()
+        self.scorer.clear_memo()
+
+        cache = SectionCache(cache_path)
+        rules_version = self.lsc.rules_fingerprint()
+
+        body = self.drift_detector._strip_frontmatter(original)
+        frontmatter = original[:len(original) - len(body)]
+        lines = body.split('\n')
+        sections = [dict(s, needs_compression=True) for s in self.analyzer.split_into_sections(body)]
+        segments = self._plan_segments(lines, sections)
+
+        outcomes: List[Optional[CachedSection]] = []
+        keys: List[Optional[str]] = []
+        pending = []  # (segment index, section body, techniques)
+
+        for i, segment in enumerate(segments):
+            text = '\n'.join(lines[segment.start:segment.end])
+            if not segment.needs_compression:
+                # Lines outside any scored section pass through
+                outcomes.append(CachedSection(compressed=text))
+                keys.append(None)
+                continue
+
+            key = section_key(text, pipeline, rules_version)
+            keys.append(key)
+            cached = cache.get(key)
+            if cached is not None and (force or not cached.techniques or cached.safety is not None):
+                outcomes.append(cached)
+                continue
+
+            title = lines[segment.start].strip().lstrip('#').strip() if segment.has_header else 'Introduction'
+            body_start = segment.start + 1 if segment.has_header else segment.start
+            section_body = '\n'.join(lines[body_start:segment.end])
+            analysis = self.analyzer.analyze_section(section_body.strip())
+
+            techniques = []
+            if analysis['needs_compression']:
+                techniques = self._determine_techniques({
+                    'overall_state': 'uncompressed' if analysis['state'] == 'verbose' else analysis['state'],
+                    'sections': [{'content': section_body}],
+                })
+            outcomes.append(CachedSection(compressed=text, techniques=techniques, title=title))
+            if techniques:
+                pending.append((i, section_body, techniques))
+
+        logger.info(f"Incremental compression: {cache.hits} sections reused, "
+                    f"{len(pending)} to compress")
+        compressed_bodies = self._run_section_jobs(
+            [(section_body, techniques, pipeline) for _, section_body, techniques in pending], workers)
+
+        blocked = 0
+        for (i, section_body, techniques), compressed_body in zip(pending, compressed_bodies):
+            outcome, segment = outcomes[i], segments[i]
+            header = [lines[segment.start]] if segment.has_header else []
+            safety = None
+            if not force:
+                result = self.compress_with_safety(section_body, compressed_body)
+                safety = {
+                    'passed': result.passed,
+                    'warnings': result.warnings,
+                    'failure_reason': result.failure_reason,
+                }
+                if not result.passed:
+                    blocked += 1
+                    logger.warning(f"Section '{outcome.title}' kept uncompressed: {result.failure_reason}")
+            if force or safety['passed']:
+                outcome.compressed = '\n'.join(header + [compressed_body])
+            outcome.safety = safety
+
+        if not dry_run:
+            for key, outcome in zip(keys, outcomes):
+                if key is not None:
+                    cache.put(key, outcome)
+            cache.prune([key for key in keys if key is not None])
+            cache.save()
+
+        compressed = frontmatter + '\n'.join(outcome.compressed for outcome in outcomes)
+        compressed = self.drift_detector.stamp_baseline(compressed, per_section=True)
+
+        stats = {
+            'sections': sum(1 for key in keys if key is not None),
+            'reused': cache.hits,
+            'recomputed': len(pending),
+            'blocked': blocked,
+        }
+        return compressed, stats
+
+    def _plan_segments(self, lines: List[str], sections: List[Dict]) -> List[SectionSegment]:
+        """Cover every line with section segments and pass-through gaps.
+
+        Sections come from ContentAnalyzer.split_into_sections (1-based line
+        numbers). A boundary that falls inside a fenced code block is ignored
+        so a fence is never split across two segments.
+        """
+        ranged = [s for s in sections if 'start_line' in s and 'end_line' in s]
+        if not ranged:
+            # No sections found: the whole document is one unit
+            needs = any(s.get('needs_compression', True) for s in sections) if sections else True
+            return [SectionSegment(0, len(lines), False, needs)]
+
+        segments: List[SectionSegment] = []
+        cursor = 0
+        for section in sorted(ranged, key=lambda s: s['start_line']):
+            start, end = section['start_line'] - 1, section['end_line']
+            if start > cursor:
+                segments.append(SectionSegment(cursor, start, False, False))
+            has_header = bool(re.match(r'^#{1,3}\s+', lines[start].strip()))
+            segments.append(SectionSegment(start, end, has_header, section.get('needs_compression', False)))
+            cursor = end
+        if cursor < len(lines):
+            segments.append(SectionSegment(cursor, len(lines), False, False))
+
+        in_fence = self._fenced_lines(lines)
+        merged: List[SectionSegment] = []
+        for segment in segments:
+            if merged and in_fence[segment.start]:
+                previous = merged[-1]
+                previous.end = segment.end
+                previous.needs_compression = previous.needs_compression or segment.needs_compression
+            else:
+                merged.append(segment)
+        return merged
+
+    @staticmethod
+    def _fenced_lines(lines: List[str]) -> List[bool]:
+        """Flag lines inside (or closing) a fenced code block"""
+        flags = []
+        fence = None
+        for line in lines:
+            marker = re.match(r'^\s*(`{3,}|~{3,})', line)
+            if fence is None:
+                flags.append(False)
+                if marker:
+                    fence = marker.group(1)[0]
+            else:
+                flags.append(True)
+                if marker and marker.group(1)[0] == fence:
+                    fence = None
+        return flags
+
     def compress_with_safety(self, original: str, compressed: str) -> ValidationResult:
         """Apply compression with comprehensive safety validation"""
         start_time = time.time()
@@ -630,7 +1059,9 @@ class CompressionTool:
                 warnings=safety_result.get('warnings', []),
                 failure_reason=safety_result.get('summary', ''),
                 safety_details=safety_result.get('checks', {}),
-                validation_time=validation_time
+                validation_time=validation_time,
+                model_load_time=safety_result.get('model_load_time', 0.0),
+                decided_by=safety_result.get('decided_by', '')
             )
             
         except Exception as e:
@@ -660,7 +1091,7 @@ class CompressionTool:
             import tempfile
             with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
                 # Add baseline tokens to content for drift detection
-                baseline_tokens = len(self.drift_detector.encoding.encode(original))
+                baseline_tokens = self.drift_detector.token_cache.count(original)
                 content_with_header = f"""---
 baseline_tokens: {baseline_tokens}
 ---
@@ -692,6 +1123,260 @@ baseline_tokens: {baseline_tokens}
         )
 
 
+# One CompressionTool per batch worker process, so models load once per worker
+_batch_tool: Optional['CompressionTool'] = None
+
+
+def _init_batch_worker() -> None:
+    """Process pool initializer: load the scorer and safety models once"""
+    global _batch_tool
+    _batch_tool = CompressionTool()
+
+
+def expand_inputs(patterns: List[str], files_from: Optional[str] = None,
+                  skip_outputs: bool = False, output_dir: Optional[str] = None) -> List[str]:
+    """Resolve globs, directories (all *.md below) and a file list into unique paths
+
+    With skip_outputs, files a compress batch writes are left out, so a
+    re-run never compresses its own output: everything under output_dir,
+    or without one, the <stem>_compressed.md next to another input.
+    """
+    candidates = list(patterns)
+    if files_from:
+        with open(files_from, 'r', encoding='utf-8') as f:
+            candidates.extend(line.strip() for line in f if line.strip())
+
+    paths: Dict[str, None] = {}  # Ordered set
+    for candidate in candidates:
+        path = Path(candidate)
+        if path.is_dir():
+            matches = sorted(str(p) for p in path.rglob('*.md'))
+        elif any(ch in candidate for ch in '*?['):
+            matches = sorted(p for p in glob.glob(candidate, recursive=True) if os.path.isfile(p))
+        else:
+            matches = [candidate]
+        for match in matches:
+            paths.setdefault(match, None)
+
+    if skip_outputs:
+        if output_dir:
+            out = Path(output_dir).resolve()
+            return [p for p in paths if not Path(p).resolve().is_relative_to(out)]
+        outputs = {_batch_output_path(p, None, None).resolve() for p in paths}
+        return [p for p in paths if Path(p).resolve() not in outputs]
+    return list(paths)
+
+
+def _batch_output_path(file_path: str, output_dir: Optional[str], base_dir: Optional[str]) -> Path:
+    """Output location for one batch file, mirroring the input tree under output_dir"""
+    path = Path(file_path)
+    if not output_dir:
+        return path.parent / f"{path.stem}_compressed{path.suffix}"
+    relative = path.resolve().relative_to(base_dir) if base_dir else Path(path.name)
+    return Path(output_dir) / relative
+
+
+def _batch_job(job: Tuple[str, str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Process pool entry point: analyze or compress one file, returning its summary line"""
+    command, file_path, options = job
+    start_time = time.time()
+    summary: Dict[str, Any] = {'file': file_path, 'command': command}
+
+    try:
+        if command == 'analyze':
+            result = _batch_tool.analyze_document(file_path)
+            summary.update(status='analyzed',
+                           compression_score=round(result.compression_score, 3),
+                           needs_compression=result.needs_compression,
+                           techniques=result.recommended_techniques,
+                           sections=len(result.sections))
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                original = f.read()
+            compressed = _batch_tool.compress_file(file_path, pipeline=options['pipeline'])
+            summary.update(original_chars=len(original), compressed_chars=len(compressed))
+
+            if compressed == original:
+                summary['status'] = 'unchanged'
+            else:
+                if not options['force']:
+                    safety_result = _batch_tool.compress_with_safety(original, compressed)
+                    summary['warnings'] = safety_result.warnings
+                    if not safety_result.passed:
+                        summary.update(status='blocked', failure_reason=safety_result.failure_reason)
+                        return summary
+
+                output_path = _batch_output_path(file_path, options['output_dir'], options['base_dir'])
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(compressed)
+                summary.update(status='compressed', output=str(output_path),
+                               reduction=round((1 - len(compressed) / len(original)) * 100, 1))
+    except Exception as e:
+        # One bad file must not stop the batch
+        summary.update(status='error', error=f"{type(e).__name__}: {e}")
+    finally:
+        summary['time'] = round(time.time() - start_time, 3)
+
+    return summary
+
+
+def run_batch(command: str, paths: List[str], summary_file, workers: Optional[int] = None,
+              pipeline: str = 'text', force: bool = False,
+              output_dir: Optional[str] = None) -> Dict[str, int]:
+    """Analyze or compress many files, writing one JSONL summary line per file.
+
+    Files are spread over a process pool whose workers each build one
+    CompressionTool (workers=None: one process, 0: one per CPU). Lines are
+    written in input order as results arrive. Returns counts per status.
+    """
+    base_dir = None
+    if output_dir and paths:
+        base_dir = os.path.commonpath([str(Path(p).resolve().parent) for p in paths])
+    options = {'pipeline': pipeline, 'force': force, 'output_dir': output_dir, 'base_dir': base_dir}
+    jobs = [(command, path, options) for path in paths]
+
+    max_workers = 1 if workers is None else (workers or os.cpu_count() or 1)
+    max_workers = min(max_workers, len(jobs)) or 1
+    logger.info(f"Batch {command}: {len(jobs)} files with {max_workers} worker(s)")
+
+    counts: Dict[str, int] = {}
+
+    def record(summary: Dict[str, Any]) -> None:
+        summary_file.write(json.dumps(summary, ensure_ascii=False) + '\n')
+        summary_file.flush()
+        counts[summary['status']] = counts.get(summary['status'], 0) + 1
+
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker) as pool:
+            for summary in pool.map(_batch_job, jobs):
+                record(summary)
+    else:
+        if _batch_tool is None:
+            _init_batch_worker()
+        for job in jobs:
+            record(_batch_job(job))
+
+    return counts
+
+
+def _daemon_dispatch(tool: 'CompressionTool'):
+    """Map daemon requests onto a resident CompressionTool"""
+    def dispatch(method: str, params: Dict[str, Any]) -> Any:
+        if method == 'analyze_document':
+            return asdict(tool.analyze_document(**params))
+        if method == 'compress_file':
+            return tool.compress_file(**params)
+        if method == 'compress_incremental':
+            return list(tool.compress_incremental(**params))
+        if method == 'compress_stream':
+            return tool.compress_stream(**params)
+        if method == 'compress_with_safety':
+            return asdict(tool.compress_with_safety(**params))
+        if method == 'validate_compression':
+            report = tool.validate_compression(**params)
+            drift = report.token_drift
+            return {
+                'safety_result': asdict(report.safety_result),
+                'compression_score': report.compression_score,
+                # check_drift() returns a dict; the fallback is a plain attribute object
+                'token_drift': drift if isinstance(drift, dict) else
+                               {key: getattr(drift, key) for key in ('growth_detected', 'ratio', 'recommendation')},
+                'drift_is_dict': isinstance(drift, dict),
+                'processing_time': report.processing_time,
+            }
+        raise ValueError(f"Unknown daemon method: {method}")
+    return dispatch
+
+
+class DaemonClient:
+    """Stand-in for CompressionTool that forwards calls to a running daemon.
+
+    Exposes the CompressionTool methods the CLI uses, returning the same
+    result types. File paths are made absolute because the daemon has its
+    own working directory.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path
+
+    def _call(self, method: str, **params) -> Any:
+        try:
+            return compression_daemon.send_request(method, params, self.socket_path)
+        except compression_daemon.DaemonError as e:
+            if e.error_type == 'FileNotFoundError':
+                raise FileNotFoundError(str(e)) from e
+            raise
+
+    def analyze_document(self, file_path: str) -> AnalysisResult:
+        return AnalysisResult(**self._call('analyze_document', file_path=os.path.abspath(file_path)))
+
+    def compress_file(self, file_path: str, dry_run: bool = False, pipeline: str = 'text',
+                      workers: Optional[int] = None) -> str:
+        return self._call('compress_file', file_path=os.path.abspath(file_path), dry_run=dry_run,
+                          pipeline=pipeline, workers=workers)
+
+    def compress_incremental(self, file_path: str, cache_path: str, pipeline: str = 'text',
+                             workers: Optional[int] = None, force: bool = False,
+                             dry_run: bool = False) -> Tuple[str, Dict]:
+        compressed, stats = self._call('compress_incremental', file_path=os.path.abspath(file_path),
+                                       cache_path=os.path.abspath(cache_path), pipeline=pipeline,
+                                       workers=workers, force=force, dry_run=dry_run)
+        return compressed, stats
+
+    def compress_stream(self, input_path: str, output_path: str,
+                        techniques: Optional[List[str]] = None) -> Dict[str, int]:
+        return self._call('compress_stream', input_path=os.path.abspath(input_path),
+                          output_path=os.path.abspath(output_path), techniques=techniques)
+
+    def compress_with_safety(self, original: str, compressed: str) -> ValidationResult:
+        return ValidationResult(**self._call('compress_with_safety', original=original, compressed=compressed))
+
+    def validate_compression(self, original: str, compressed: str) -> ValidationReport:
+        result = self._call('validate_compression', original=original, compressed=compressed)
+        if result['drift_is_dict']:
+            drift = result['token_drift']
+        else:
+            drift = type('DriftResult', (), result['token_drift'])()
+        return ValidationReport(
+            original=original,
+            compressed=compressed,
+            safety_result=ValidationResult(**result['safety_result']),
+            compression_score=result['compression_score'],
+            token_drift=drift,
+            processing_time=result['processing_time']
+        )
+
+
+def connect_tool(socket_path: Optional[str] = None, use_daemon: bool = True) -> Union['CompressionTool', DaemonClient]:
+    """A DaemonClient when a daemon is listening, otherwise a local CompressionTool"""
+    if use_daemon and compression_daemon.daemon_running(socket_path):
+        logger.debug("Using compression daemon")
+        return DaemonClient(socket_path)
+    return CompressionTool()
+
+
+def run_daemon_command(args: argparse.Namespace) -> int:
+    """Start the daemon in the foreground, or query / stop a running one"""
+    socket_path = args.socket or compression_daemon.default_socket_path()
+
+    if args.status or args.stop:
+        if not compression_daemon.daemon_running(socket_path):
+            print(f"⏹️ No compression daemon on {socket_path}")
+            return 1
+        info = compression_daemon.send_request('shutdown' if args.stop else 'ping', socket_path=socket_path)
+        print(f"{'🛑 Stopped' if args.stop else '✅ Running:'} daemon pid {info['pid']} on {socket_path}")
+        return 0
+
+    start_time = time.time()
+    tool = CompressionTool()
+    tool.safety.preload_models()  # Keep the daemon warm: no request pays a model load
+    logger.info(f"Models loaded in {time.time() - start_time:.2f}s; listening on {socket_path}")
+    compression_daemon.serve(_daemon_dispatch(tool), socket_path)
+    logger.info("Compression daemon stopped")
+    return 0
+
+
 def setup_cli() -> argparse.ArgumentParser:
     """Set up command-line interface"""
     parser = argparse.ArgumentParser(
@@ -702,10 +1387,21 @@ Examples:
   python compress.py analyze document.md
   python compress.py compress document.md --output compressed.md
   python compress.py compress document.md --dry-run --verbose
+  python compress.py compress huge.md --stream --techniques technical_shorthand
   python compress.py validate original.md compressed.md --report report.md
+  python compress.py compress-dir 'docs/**/*.md' --workers 8 --output-dir out --summary summary.jsonl
+  python compress.py daemon &    # Later commands reuse its loaded models
         """
     )
     
+    parser.add_argument('--socket', metavar='PATH',
+                        help='Daemon socket (default: $COMPRESS_DAEMON_SOCKET or a per-user runtime path)')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Load models in this process even if a daemon is running')
+    parser.add_argument('--embedding-cache', metavar='DIR',
+                        help='Persist similarity embeddings in DIR (default: $COMPRESS_EMBEDDING_CACHE; '
+                             'a running daemon keeps its own setting)')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Analyze command
@@ -719,9 +1415,42 @@ Examples:
     compress_parser.add_argument('--output', '-o', help='Output file (default: input_compressed.md)')
     compress_parser.add_argument('--dry-run', action='store_true', help='Show changes without applying')
     compress_parser.add_argument('--force', action='store_true', help='Skip safety checks (dangerous)')
+    compress_parser.add_argument('--pipeline', choices=['text', 'ast'], default='text',
+                                 help='text: whole-document passes; ast: parse once, rewrite prose blocks only')
+    compress_parser.add_argument('--workers', type=int, metavar='N',
+                                 help='Compress flagged sections in parallel with N processes (0 = all CPUs)')
+    compress_parser.add_argument('--cache', metavar='FILE',
+                                 help='Incremental mode: reuse per-section results cached in FILE')
+    compress_parser.add_argument('--stream', action='store_true',
+                                 help='Stream very large files block by block (no whole-document safety checks)')
+    compress_parser.add_argument('--techniques', nargs='+', choices=list(STREAM_TECHNIQUES), metavar='NAME',
+                                 help='Techniques to apply in --stream mode (default: all)')
     compress_parser.add_argument('--report', help='Save validation report to file')
     compress_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     
+    # Batch commands: many files, models loaded once per worker
+    for name, help_text in (('analyze-dir', 'Analyze many documents'),
+                            ('compress-dir', 'Compress many documents with safety validation')):
+        batch_parser = subparsers.add_parser(name, help=help_text)
+        batch_parser.add_argument('inputs', nargs='*', help='Files, directories (all *.md below) or glob patterns')
+        batch_parser.add_argument('--files-from', metavar='FILE', help='Read more input paths from FILE, one per line')
+        batch_parser.add_argument('--workers', type=int, default=0, metavar='N',
+                                  help='Worker processes (default 0 = one per CPU, 1 = no pool)')
+        batch_parser.add_argument('--summary', metavar='FILE', help='Write JSONL summary to FILE (default: stdout)')
+        batch_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+        if name == 'compress-dir':
+            batch_parser.add_argument('--output-dir', metavar='DIR',
+                                      help='Mirror the input tree under DIR (default: input_compressed.md beside each file)')
+            batch_parser.add_argument('--force', action='store_true', help='Skip safety checks (dangerous)')
+            batch_parser.add_argument('--pipeline', choices=['text', 'ast'], default='text',
+                                      help='text: whole-document passes; ast: parse once, rewrite prose blocks only')
+    
+    # Daemon command
+    daemon_parser = subparsers.add_parser('daemon', help='Keep models loaded and serve CLI requests')
+    daemon_parser.add_argument('--status', action='store_true', help='Report whether a daemon is running')
+    daemon_parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    daemon_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    
     # Validate command
     validate_parser = subparsers.add_parser('validate', help='Validate compression safety')
     validate_parser.add_argument('original', help='Original markdown file')
@@ -732,6 +1461,34 @@ Examples:
     return parser
 
 
+def run_batch_command(args: argparse.Namespace) -> int:
+    """Run analyze-dir / compress-dir; the per-file JSONL goes to --summary or stdout"""
+    command = 'analyze' if args.command == 'analyze-dir' else 'compress'
+    output_dir = getattr(args, 'output_dir', None)
+    paths = expand_inputs(args.inputs, args.files_from, skip_outputs=command == 'compress', output_dir=output_dir)
+    if not paths:
+        print("❌ No input files matched", file=sys.stderr)
+        return 1
+
+    start_time = time.time()
+    if getattr(args, 'force', False):
+        logger.warning("Safety checks skipped with --force flag")
+
+    summary_file = open(args.summary, 'w', encoding='utf-8') if args.summary else sys.stdout
+    try:
+        counts = run_batch(command, paths, summary_file, workers=args.workers,
+                           pipeline=getattr(args, 'pipeline', 'text'), force=getattr(args, 'force', False),
+                           output_dir=output_dir)
+    finally:
+        if args.summary:
+            summary_file.close()
+
+    total_time = time.time() - start_time
+    breakdown = ', '.join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(f"✅ {len(paths)} files in {total_time:.2f}s ({breakdown})", file=sys.stderr)
+    return 1 if counts.get('error') else 0
+
+
 def main():
     """Main CLI entry point"""
     parser = setup_cli()
@@ -745,8 +1502,17 @@ def main():
     if hasattr(args, 'verbose') and args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # Through the environment so batch workers and a daemon started here see it too
+    if args.embedding_cache:
+        os.environ[embedding_cache.CACHE_ENV_VAR] = args.embedding_cache
+    
+    if args.command in ('analyze-dir', 'compress-dir'):
+        return run_batch_command(args)
+    if args.command == 'daemon':
+        return run_daemon_command(args)
+    
     try:
-        tool = CompressionTool()
+        tool = connect_tool(args.socket, use_daemon=not args.no_daemon)
         
         if args.command == 'analyze':
             # Analyze document
@@ -780,15 +1546,39 @@ def main():
                 input_path = Path(args.input_file)
                 output_path = input_path.parent / f"{input_path.stem}_compressed{input_path.suffix}"
             
+            if args.stream:
+                if args.dry_run or args.cache or args.report:
+                    parser.error("--stream cannot be combined with --dry-run, --cache or --report")
+                logger.warning("Streaming mode: whole-document safety checks are not run")
+                stats = tool.compress_stream(args.input_file, str(output_path), techniques=args.techniques)
+                
+                total_time = time.time() - start_time
+                print(f"✅ Streamed compression completed in {total_time:.2f}s")
+                print(f"📥 Input: {args.input_file} ({stats['input_chars']} chars, {stats['blocks']} blocks)")
+                print(f"📤 Output: {output_path} ({stats['output_chars']} chars)")
+                if stats['input_chars']:
+                    print(f"📊 Reduction: {(1 - stats['output_chars']/stats['input_chars'])*100:.1f}%")
+                return
+            
             # Read original
             with open(args.input_file, 'r', encoding='utf-8') as f:
                 original = f.read()
             
             # Compress
-            compressed = tool.compress_file(args.input_file, dry_run=args.dry_run)
+            if args.cache:
+                # Sections are safety-checked individually as they are recompressed
+                compressed, stats = tool.compress_incremental(args.input_file, args.cache,
+                                                              pipeline=args.pipeline, workers=args.workers,
+                                                              force=args.force, dry_run=args.dry_run)
+                print(f"♻️ Sections: {stats['sections']} "
+                      f"(reused {stats['reused']}, recomputed {stats['recomputed']}, "
+                      f"kept uncompressed {stats['blocked']})")
+            else:
+                compressed = tool.compress_file(args.input_file, dry_run=args.dry_run,
+                                                pipeline=args.pipeline, workers=args.workers)
             
-            # Safety validation (unless forced to skip)
-            if not args.force:
+            # Safety validation (unless forced to skip, or already done per section)
+            if not args.force and not args.cache:
                 safety_result = tool.compress_with_safety(original, compressed)
                 
                 if not safety_result.passed:
@@ -802,7 +1592,7 @@ def main():
                     print(f"⚠️ Compression warnings:")
                     for warning in safety_result.warnings:
                         print(f"   - {warning}")
-            else:
+            elif args.force:
                 logger.warning("Safety checks skipped with --force flag")
             
             # Generate report if requested
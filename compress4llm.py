@@ -8,7 +8,7 @@ Achieves ~85% size reduction while maintaining 95%+ information retention.
 Target: 19-22KB output, 400-450 lines for complete technical references.
 
 Usage:
-    python3 compress4llm.py <input_file> [--output <file>] [--verbose]
+    python3 compress4llm.py <input_file> [--output <file>] [--verbose] [--stream]
 
 Key Difference from compress.py:
     - compress.py: Basic LSC (20-30% reduction, human-readable)
@@ -16,14 +16,156 @@ Key Difference from compress.py:
 """
 
 import argparse
+import os
 import sys
 import re
+import tempfile
 from pathlib import Path
 from typing import Dict, Tuple, List
 
+from scripts.markdown_blocks import DEFAULT_MAX_BLOCK_CHARS, iter_blocks
+from scripts.rule_engine import RuleTable
+
 class V7Techniques:
     """V7 compression techniques for LLM optimization"""
-    
+
+    # Substitution tables, compiled once into as few passes as possible.
+    # Order matters: rules are applied as if one after another.
+
+    # Ultra-terse headers
+    HEADERS = RuleTable.from_regex({
+        # Common header abbreviations
+        r'\*\*Source\*\*:': '**Src**:',
+        r'\*\*Original\*\*:': '**Orig**:',
+        r'\*\*Compressed\*\*:': '**Comp**:',
+        r'\*\*Documentation\*\*:': '**Doc**:',
+        r'\*\*Definition\*\*:': '**Def**:',
+        r'\*\*Description\*\*:': '**Desc**:',
+        r'\*\*Example\*\*:': '**Ex**:',
+        r'\*\*Examples\*\*:': '**Exs**:',
+        r'\*\*Implementation\*\*:': '**Impl**:',
+        r'\*\*Configuration\*\*:': '**Config**:',
+        r'\*\*Reference\*\*:': '**Ref**:',
+        r'\*\*References\*\*:': '**Refs**:',
+        r'\*\*Requirements\*\*:': '**Reqs**:',
+        r'\*\*Performance\*\*:': '**Perf**:',
+        r'\*\*Analysis\*\*:': '**Anal**:',
+        
+        # Units
+        r'(\d+)\s+lines': r'\1L',
+        r'(\d+)\s+kilobytes': r'\1KB',
+        r'(\d+)\s+megabytes': r'\1MB',
+        r'(\d+)\s+tokens': r'\1T',
+        r'(\d+)\s+characters': r'\1C',
+        r'(\d+)\s+words': r'\1W',
+    }, re.IGNORECASE, name='headers')
+
+    # Standard V7 abbreviations (use in prose/headers, NOT in code/prompts)
+    ABBREVIATIONS = RuleTable.from_regex({
+        # Assessment terms
+        r'\bEffectiveness\b': 'E',
+        r'\bReliability\b': 'R',
+        r'\bChain-of-Thought\b': 'CoT',
+        r'\bChain of Thought\b': 'CoT',
+        r'\bTree-of-Thoughts\b': 'ToT',
+        r'\bTree of Thoughts\b': 'ToT',
+        
+        # Common phrases
+        r'\bwith\b': 'w/',
+        r'\bwithout\b': 'w/o',
+        r'\bdocumentation\b': 'doc',
+        r'\bDocumentation\b': 'Doc',
+        
+        # Technical terms (already abbreviated in compress.py but more aggressive)
+        r'\bauthentication\b': 'auth',
+        r'\bAuthentication\b': 'Auth',
+        r'\bauthorization\b': 'authz',
+        r'\bAuthorization\b': 'Authz',
+        r'\bconfiguration\b': 'config',
+        r'\bConfiguration\b': 'Config',
+        r'\benvironment\b': 'env',
+        r'\bEnvironment\b': 'Env',
+        r'\bimplementation\b': 'impl',
+        r'\bImplementation\b': 'Impl',
+        r'\bperformance\b': 'perf',
+        r'\bPerformance\b': 'Perf',
+    }, name='abbreviations')
+
+    # These should only be used in analysis/status, NOT in prompts
+    SYMBOLS = RuleTable.from_regex({
+        # Status indicators
+        r'\bpassed\b': '✓',
+        r'\bsuccess\b': '✓',
+        r'\bsuccessful\b': '✓',
+        r'\bfailed\b': '✗',
+        r'\bfailure\b': '✗',
+        r'\bwarning\b': '⚠',
+        
+        # Directional
+        r'\bincreases?\b': '↑',
+        r'\bdecreases?\b': '↓',
+        r'\bto\s+(?=\w)': '→',  # "to" before word (arrows)
+        
+        # Comparisons (be careful not to break code)
+        r'\bequals?\b': '=',
+        r'\bnot equal\b': '≠',
+        r'\bgreater than or equal\b': '≥',
+        r'\bless than or equal\b': '≤',
+    }, re.IGNORECASE, name='symbols')
+
+    # Common sentence subjects/scaffolding are removed, then sentences made terse
+    PROSE_PATTERNS_TO_REMOVE = [
+        r'The model\'s\s+',
+        r'The system\'s\s+',
+        r'This (?:approach|method|technique)\s+',
+        r'It is (?:important|notable|worth noting) that\s+',
+        r'As we can see,?\s+',
+        r'It should be noted that\s+',
+        r'We can observe that\s+',
+        r'Now let\'s examine\s+',
+        r'Let\'s consider\s+',
+        r'In order to\s+',
+        r'For the purpose of\s+',
+    ]
+    PROSE_CONCISE_REPLACEMENTS = {
+        r'was excellent': '→excellent',
+        r'was very good': '→very good',
+        r'is capable of': 'can',
+        r'in the context of': 'in',
+        r'in terms of': 'for',
+        r'on the other hand': 'however',
+        r'as a result of': 'due to',
+        r'in spite of': 'despite',
+    }
+    PROSE_FRAGMENTS = RuleTable.chain(
+        RuleTable.from_regex([(p, '') for p in PROSE_PATTERNS_TO_REMOVE], re.IGNORECASE),
+        RuleTable.from_regex(PROSE_CONCISE_REPLACEMENTS, re.IGNORECASE),
+        name='prose_fragments',
+    )
+
+    # Markdown table headers
+    TABLE_HEADERS = RuleTable.from_regex({
+        r'\|\s*Effectiveness\s*\|': '| E |',
+        r'\|\s*Reliability\s*\|': '| R |',
+        r'\|\s*Performance\s*\|': '| Perf |',
+        r'\|\s*Documentation\s*\|': '| Doc |',
+        r'\|\s*Implementation\s*\|': '| Impl |',
+    }, re.IGNORECASE, name='table_headers')
+
+    # Meta-commentary and transitional phrases
+    SCAFFOLDING_PATTERNS = [
+        r'^As mentioned (?:above|previously|earlier),?\s*',
+        r'^In summary,?\s*',
+        r'^To summarize,?\s*',
+        r'^In conclusion,?\s*',
+        r'^(?:Additionally|Furthermore|Moreover),?\s*',
+        r'^It\'s (?:also )?worth noting that\s+',
+        r'(?:As we have seen|As demonstrated),?\s*',
+    ]
+    SCAFFOLDING = RuleTable.from_regex(
+        [(p, '') for p in SCAFFOLDING_PATTERNS], re.MULTILINE | re.IGNORECASE, name='scaffolding'
+    )
+
     def __init__(self):
         # Patterns for content that must be preserved VERBATIM
         self.sacred_patterns = [
@@ -76,182 +218,27 @@ class V7Techniques:
     
     def _compress_headers(self, text: str) -> str:
         """Ultra-terse headers: '**Source**: 1,332 lines' → '**Src**: 1,332L'"""
-        replacements = {
-            # Common header abbreviations
-            r'\*\*Source\*\*:': '**Src**:',
-            r'\*\*Original\*\*:': '**Orig**:',
-            r'\*\*Compressed\*\*:': '**Comp**:',
-            r'\*\*Documentation\*\*:': '**Doc**:',
-            r'\*\*Definition\*\*:': '**Def**:',
-            r'\*\*Description\*\*:': '**Desc**:',
-            r'\*\*Example\*\*:': '**Ex**:',
-            r'\*\*Examples\*\*:': '**Exs**:',
-            r'\*\*Implementation\*\*:': '**Impl**:',
-            r'\*\*Configuration\*\*:': '**Config**:',
-            r'\*\*Reference\*\*:': '**Ref**:',
-            r'\*\*References\*\*:': '**Refs**:',
-            r'\*\*Requirements\*\*:': '**Reqs**:',
-            r'\*\*Performance\*\*:': '**Perf**:',
-            r'\*\*Analysis\*\*:': '**Anal**:',
-            
-            # Units
-            r'(\d+)\s+lines': r'\1L',
-            r'(\d+)\s+kilobytes': r'\1KB',
-            r'(\d+)\s+megabytes': r'\1MB',
-            r'(\d+)\s+tokens': r'\1T',
-            r'(\d+)\s+characters': r'\1C',
-            r'(\d+)\s+words': r'\1W',
-        }
-        
-        result = text
-        for pattern, replacement in replacements.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        return result
+        return self.HEADERS.apply(text)
     
     def _apply_abbreviations(self, text: str) -> str:
         """Extreme abbreviations: Effectiveness→E, Reliability→R, with→w/, without→w/o"""
-        # Standard V7 abbreviations (use in prose/headers, NOT in code/prompts)
-        replacements = {
-            # Assessment terms
-            r'\bEffectiveness\b': 'E',
-            r'\bReliability\b': 'R',
-            r'\bChain-of-Thought\b': 'CoT',
-            r'\bChain of Thought\b': 'CoT',
-            r'\bTree-of-Thoughts\b': 'ToT',
-            r'\bTree of Thoughts\b': 'ToT',
-            
-            # Common phrases
-            r'\bwith\b': 'w/',
-            r'\bwithout\b': 'w/o',
-            r'\bdocumentation\b': 'doc',
-            r'\bDocumentation\b': 'Doc',
-            
-            # Technical terms (already abbreviated in compress.py but more aggressive)
-            r'\bauthentication\b': 'auth',
-            r'\bAuthentication\b': 'Auth',
-            r'\bauthorization\b': 'authz',
-            r'\bAuthorization\b': 'Authz',
-            r'\bconfiguration\b': 'config',
-            r'\bConfiguration\b': 'Config',
-            r'\benvironment\b': 'env',
-            r'\bEnvironment\b': 'Env',
-            r'\bimplementation\b': 'impl',
-            r'\bImplementation\b': 'Impl',
-            r'\bperformance\b': 'perf',
-            r'\bPerformance\b': 'Perf',
-        }
-        
-        result = text
-        for pattern, replacement in replacements.items():
-            result = re.sub(pattern, replacement, result)
-        
-        return result
+        return self.ABBREVIATIONS.apply(text)
     
     def _apply_symbols(self, text: str) -> str:
         """Use symbols: ✓✗⚠→↑↓=≠≥≤ in analysis sections"""
-        # These should only be used in analysis/status, NOT in prompts
-        replacements = {
-            # Status indicators
-            r'\bpassed\b': '✓',
-            r'\bsuccess\b': '✓',
-            r'\bsuccessful\b': '✓',
-            r'\bfailed\b': '✗',
-            r'\bfailure\b': '✗',
-            r'\bwarning\b': '⚠',
-            
-            # Directional
-            r'\bincreases?\b': '↑',
-            r'\bdecreases?\b': '↓',
-            r'\bto\s+(?=\w)': '→',  # "to" before word (arrows)
-            
-            # Comparisons (be careful not to break code)
-            r'\bequals?\b': '=',
-            r'\bnot equal\b': '≠',
-            r'\bgreater than or equal\b': '≥',
-            r'\bless than or equal\b': '≤',
-        }
-        
-        result = text
-        for pattern, replacement in replacements.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        return result
+        return self.SYMBOLS.apply(text)
     
     def _compress_prose_to_fragments(self, text: str) -> str:
         """Convert prose to fragments: 'The model's performance was excellent' → 'Excellent perf'"""
-        # Remove common sentence subjects/scaffolding
-        patterns_to_remove = [
-            r'The model\'s\s+',
-            r'The system\'s\s+',
-            r'This (?:approach|method|technique)\s+',
-            r'It is (?:important|notable|worth noting) that\s+',
-            r'As we can see,?\s+',
-            r'It should be noted that\s+',
-            r'We can observe that\s+',
-            r'Now let\'s examine\s+',
-            r'Let\'s consider\s+',
-            r'In order to\s+',
-            r'For the purpose of\s+',
-        ]
-        
-        result = text
-        for pattern in patterns_to_remove:
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE)
-        
-        # Make sentences more terse
-        concise_replacements = {
-            r'was excellent': '→excellent',
-            r'was very good': '→very good',
-            r'is capable of': 'can',
-            r'in the context of': 'in',
-            r'in terms of': 'for',
-            r'on the other hand': 'however',
-            r'as a result of': 'due to',
-            r'in spite of': 'despite',
-        }
-        
-        for pattern, replacement in concise_replacements.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        return result
+        return self.PROSE_FRAGMENTS.apply(text)
     
     def _compress_tables(self, text: str) -> str:
         """Compress table headers: 'Effectiveness' → 'E', 'Reliability' → 'R'"""
-        # Look for markdown table headers and compress them
-        # This is a simple version - could be more sophisticated
-        
-        header_replacements = {
-            r'\|\s*Effectiveness\s*\|': '| E |',
-            r'\|\s*Reliability\s*\|': '| R |',
-            r'\|\s*Performance\s*\|': '| Perf |',
-            r'\|\s*Documentation\s*\|': '| Doc |',
-            r'\|\s*Implementation\s*\|': '| Impl |',
-        }
-        
-        result = text
-        for pattern, replacement in header_replacements.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        return result
+        return self.TABLE_HEADERS.apply(text)
     
     def _remove_scaffolding(self, text: str) -> str:
         """Remove meta-commentary and transitional phrases"""
-        scaffolding_patterns = [
-            r'^As mentioned (?:above|previously|earlier),?\s*',
-            r'^In summary,?\s*',
-            r'^To summarize,?\s*',
-            r'^In conclusion,?\s*',
-            r'^(?:Additionally|Furthermore|Moreover),?\s*',
-            r'^It\'s (?:also )?worth noting that\s+',
-            r'(?:As we have seen|As demonstrated),?\s*',
-        ]
-        
-        result = text
-        for pattern in scaffolding_patterns:
-            result = re.sub(pattern, '', result, flags=re.MULTILINE | re.IGNORECASE)
-        
-        return result
+        return self.SCAFFOLDING.apply(text)
 
 
 def compress_file(input_path: str, output_path: str = None, verbose: bool = False):
@@ -301,6 +288,52 @@ def compress_file(input_path: str, output_path: str = None, verbose: bool = Fals
         print(f"⚠️  Warning: Output lines {comp_lines} outside target range (400-450L)")
 
 
+def compress_stream(input_path: str, output_path: str = None, verbose: bool = False,
+                    max_block_chars: int = DEFAULT_MAX_BLOCK_CHARS):
+    """Compress a markdown file block by block without reading it into memory.
+
+    Every block except code fences and front matter is compressed on its
+    own and written out immediately; fences (which may arrive in pieces)
+    are copied verbatim. Patterns that would span two blocks are not applied.
+    """
+    if not output_path:
+        input_file = Path(input_path)
+        output_path = input_file.parent / f"{input_file.stem}_V7{input_file.suffix}"
+    output = Path(output_path)
+
+    compressor = V7Techniques()
+    orig_size = comp_size = orig_lines = comp_lines = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=output.name, suffix='.tmp')
+    try:
+        with open(input_path, 'r', encoding='utf-8', newline='') as src, \
+                os.fdopen(fd, 'w', encoding='utf-8', newline='') as dst:
+            for block in iter_blocks(src, max_block_chars):
+                if block.kind in ('fence', 'front_matter', 'gap'):
+                    text = block.text
+                else:
+                    text = compressor.compress(block.text)
+                dst.write(text)
+                orig_size += len(block.text)
+                orig_lines += block.text.count('\n')
+                comp_size += len(text)
+                comp_lines += text.count('\n')
+        os.replace(tmp_path, output)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    reduction = (1 - comp_size / orig_size) * 100 if orig_size else 0.0
+    if verbose:
+        print(f"Streamed {input_path} in blocks of at most {max_block_chars} characters")
+    print(f"\n✅ Compression complete!")
+    print(f"📥 Input:  {input_path}")
+    print(f"    {orig_lines}L / {orig_size/1024:.1f}KB")
+    print(f"📤 Output: {output_path}")
+    print(f"    {comp_lines}L / {comp_size/1024:.1f}KB")
+    print(f"📊 Reduction: {reduction:.1f}%")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="LLM-Optimized Compression (V7 Methodology)",
@@ -315,17 +348,23 @@ V7 Compression Target:
 Example:
   python3 compress4llm.py input.md
   python3 compress4llm.py input.md --output compressed.md --verbose
+  python3 compress4llm.py huge.md --stream
         """
     )
     
     parser.add_argument('input_file', help='Input markdown file to compress')
     parser.add_argument('--output', '-o', help='Output file path (default: input_V7.md)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--stream', action='store_true',
+                        help='Compress block by block with bounded memory (for very large files)')
     
     args = parser.parse_args()
     
     try:
-        compress_file(args.input_file, args.output, args.verbose)
+        if args.stream:
+            compress_stream(args.input_file, args.output, args.verbose)
+        else:
+            compress_file(args.input_file, args.output, args.verbose)
     except FileNotFoundError:
         print(f"❌ Error: File not found: {args.input_file}")
         return 1
@@ -16,6 +16,8 @@ import argparse
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+from scripts.rule_engine import RuleTable
+
 
 # ============================================================================
 # SACRED CONTENT EXTRACTION (Step 1)
@@ -402,6 +404,26 @@ SCAFFOLDING_KEEP_PATTERNS = [
     r'\*\*Important\*\*:',
 ]
 
+# Compiled rule tables: each group of tables is applied as one ordered table,
+# with independent neighbouring rules fused into a single pass
+ABBREVIATION_TABLE = RuleTable.from_literals(
+    list(HEADER_ABBREVIATIONS.items())
+    + list(STANDARD_ABBREVIATIONS.items())
+    + list(CONTEXT_ABBREVIATIONS.items()),
+    name='abbreviations',
+)
+SYMBOL_TABLE = RuleTable.from_literals(
+    list(STATUS_SYMBOLS.items())
+    + list(COMPARISON_SYMBOLS.items())
+    + list(LOGICAL_SYMBOLS.items()),
+    name='symbols',
+)
+PROSE_TABLE = RuleTable.chain(
+    RuleTable.from_regex(PROSE_FRAGMENT_RULES, re.MULTILINE),
+    RuleTable.from_regex(SECTION_HEADER_RULES),
+    name='prose',
+)
+
 
 def restore_sacred(compressed: str, sacred_items: List[dict]) -> str:
     """
@@ -425,41 +447,18 @@ def restore_sacred(compressed: str, sacred_items: List[dict]) -> str:
 
 def apply_abbreviations(text: str) -> str:
     """Apply header, standard, and context abbreviations."""
-    for old, new in HEADER_ABBREVIATIONS.items():
-        text = text.replace(old, new)
-
-    for old, new in STANDARD_ABBREVIATIONS.items():
-        text = text.replace(old, new)
-
-    for old, new in CONTEXT_ABBREVIATIONS.items():
-        text = text.replace(old, new)
-
-    return text
+    return ABBREVIATION_TABLE.apply(text)
 
 
 def apply_symbols(text: str) -> str:
     """Apply status, comparison, and logical symbols."""
-    for old, new in STATUS_SYMBOLS.items():
-        text = text.replace(old, new)
-
-    for old, new in COMPARISON_SYMBOLS.items():
-        text = text.replace(old, new)
-
-    for old, new in LOGICAL_SYMBOLS.items():
-        text = text.replace(old, new)
-
-    return text
+    return SYMBOL_TABLE.apply(text)
 
 
 def apply_prose_transforms(text: str) -> str:
     """Apply prose fragment and section header transformations."""
-    # Prose fragment rules (regex)
-    for pattern, replacement in PROSE_FRAGMENT_RULES:
-        text = re.sub(pattern, replacement, text, flags=re.MULTILINE)
-
-    # Section header rules
-    for pattern, replacement in SECTION_HEADER_RULES:
-        text = re.sub(pattern, replacement, text)
+    # Prose fragment and section header rules
+    text = PROSE_TABLE.apply(text)
 
     # Remove scaffolding (but keep critical markers)
     for pattern in SCAFFOLDING_PATTERNS:
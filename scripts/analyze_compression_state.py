@@ -7,14 +7,15 @@ Detects and handles documents with mixed compression states.
 """
 import re
 import yaml
-import tiktoken
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
 # Import dependencies from previous tasks
 from scripts.compression_score import CompressionScorer
+from scripts.line_classifier import BLANK, LIST, classify_lines
 from scripts.detect_token_drift import TokenDriftDetector
+from scripts.tokenizer_service import shared_tokenizer
 
 
 @dataclass
@@ -40,7 +41,8 @@ class ContentAnalyzer:
             scorer: CompressionScorer instance for scoring sections
         """
         self.scorer = scorer
-        self.encoding = tiktoken.encoding_for_model("gpt-4")
+        self.token_cache = shared_tokenizer()  # cl100k_base, the gpt-4 encoding
+        self.encoding = self.token_cache.encoding
         
         # Thresholds for state classification
         self.VERBOSE_THRESHOLD = 0.4      # Below this = verbose/uncompressed
@@ -139,7 +141,7 @@ class ContentAnalyzer:
             
         # Count tokens using tiktoken
         try:
-            tokens = len(self.encoding.encode(content))
+            tokens = self.token_cache.count(content)
             return tokens >= self.MIN_SECTION_TOKENS
         except Exception:
             # Fallback to word count
@@ -206,8 +208,9 @@ class ContentAnalyzer:
         
         # Simple heuristics for compression scoring
         lines = text.split('\n')
-        list_lines = sum(1 for line in lines if line.strip().startswith(('-', '*', '•', '1.', '2.')))
-        total_lines = len([line for line in lines if line.strip()])
+        line_types = classify_lines(lines)
+        list_lines = line_types.count(LIST)
+        total_lines = len(lines) - line_types.count(BLANK)
         
         if total_lines == 0:
             return 0.0
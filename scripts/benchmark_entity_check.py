@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the entity preservation check before and after the slim spaCy pipeline.
+
+"Before" is the original check: the full en_core_web_sm pipeline (tagger,
+parser, lemmatizer, NER) run over the original and the compressed text one
+document per call. "After" is SafetyValidator.check_entity_preservation: NER
+only, both texts batched through nlp.pipe in paragraph chunks.
+
+Each document is paired with a compressed stand-in (every other paragraph
+dropped) and throughput is reported in document pairs per second.
+
+Usage:
+    python scripts/benchmark_entity_check.py [files...] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Add scripts directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from safety_checks import SafetyValidator
+
+
+DEFAULT_FILES = sorted(str(p) for p in (Path(__file__).parent.parent / "tests" / "fixtures").glob("*.md"))
+
+
+def drop_alternate_paragraphs(text: str) -> str:
+    return "\n\n".join(text.split("\n\n")[::2])
+
+
+def docs_per_second(check: Callable[[str, str], object], pairs: List[Tuple[str, str]], repeat: int) -> float:
+    check(*pairs[0])  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for original, compressed in pairs:
+            check(original, compressed)
+    return repeat * len(pairs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity check throughput (docs/sec)")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="Markdown documents (default: test fixtures)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the documents (default: 3)")
+    args = parser.parse_args()
+
+    import spacy
+
+    texts = [Path(f).read_text(encoding="utf-8") for f in args.files]
+    pairs = [(text, drop_alternate_paragraphs(text)) for text in texts]
+    validator = SafetyValidator()
+
+    full_nlp = spacy.load("en_core_web_sm")
+
+    def full_pipeline_check(original: str, compressed: str):
+        orig_entities = {ent.text.lower() for ent in full_nlp(original).ents}
+        comp_entities = {ent.text.lower() for ent in full_nlp(compressed).ents}
+        orig_entities.update(validator._extract_technical_entities(original))
+        comp_entities.update(validator._extract_technical_entities(compressed))
+        return orig_entities & comp_entities
+
+    print(f"📄 {len(pairs)} documents, {sum(map(len, texts)):,} characters, {args.repeat} passes")
+    print(f"   Full pipeline: {', '.join(full_nlp.pipe_names)}")
+    print(f"   Slim pipeline: {', '.join(validator.nlp.pipe_names)}\n")
+
+    before = docs_per_second(full_pipeline_check, pairs, args.repeat)
+    after = docs_per_second(validator.check_entity_preservation, pairs, args.repeat)
+
+    print(f"Before (full pipeline, per document): {before:8.1f} docs/sec")
+    print(f"After  (NER only, batched chunks):    {after:8.1f} docs/sec")
+    print(f"Speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
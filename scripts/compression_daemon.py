@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Local daemon transport for the compression tool.
+
+A long-lived process keeps the CompressionTool (scorer, analyzer, safety
+models, drift detector) loaded and answers requests on a Unix socket, so
+CLI runs from pre-commit hooks and CI skip the model load entirely.
+
+The protocol is one JSON object per line: the client sends a request
+({"method": ..., "params": {...}}) and reads back one response
+({"ok": true, "result": ...} or {"ok": false, "error": ..., "error_type": ...}).
+The client only talks to a socket owned by the current user: the
+documents it sends are private, and a socket someone else created could
+read them and answer with made-up results. Without XDG_RUNTIME_DIR the
+socket lives in a per-user 0700 directory under the temp directory.
+
+Each connection gets its own thread, so a ping is answered while another
+client's request is running, but dispatch holds a lock: the models only
+ever see one call at a time, and other requests queue behind it.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+SOCKET_ENV_VAR = 'COMPRESS_DAEMON_SOCKET'
+
+# Seconds a client waits to connect before falling back to running locally
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonError(RuntimeError):
+    """Raised on the client when the daemon reports a failure"""
+
+    def __init__(self, message: str, error_type: str = ''):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+def default_socket_path() -> str:
+    """Per-user socket path, overridable with COMPRESS_DAEMON_SOCKET"""
+    if os.environ.get(SOCKET_ENV_VAR):
+        return os.environ[SOCKET_ENV_VAR]
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], f"compression-daemon-{os.getuid()}.sock")
+    return os.path.join(_private_dir(), "daemon.sock")
+
+
+def _private_dir() -> str:
+    """Per-user directory in the shared temp directory, for the fallback socket"""
+    return os.path.join(tempfile.gettempdir(), f"compression-daemon-{os.getuid()}")
+
+
+def _check_private_dir(path: str) -> None:
+    """Raise PermissionError unless path is a directory only this user can access"""
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory owned by this user")
+
+
+def _check_socket(path: str) -> None:
+    """Raise ConnectionError unless path is a socket this user owns (in a private directory if the default one)"""
+    try:
+        info = os.lstat(path)
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is not a socket owned by this user")
+        if os.path.dirname(os.path.abspath(path)) == _private_dir():
+            _check_private_dir(_private_dir())
+    except FileNotFoundError as e:
+        raise ConnectionError(f"No compression daemon at {path}") from e
+    except PermissionError as e:
+        raise ConnectionError(f"Not using compression daemon: {e}") from e
+
+
+def send_request(method: str, params: Optional[Dict[str, Any]] = None,
+                 socket_path: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+    """Call the daemon and return its result.
+
+    Raises ConnectionError if no daemon is listening (or the socket is not
+    this user's) and DaemonError if the request failed on the daemon side.
+    """
+    path = socket_path or default_socket_path()
+    _check_socket(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+            raise ConnectionError(f"No compression daemon at {path}") from e
+        sock.settimeout(timeout)
+
+        payload = json.dumps({'method': method, 'params': params or {}}, ensure_ascii=False)
+        sock.sendall(payload.encode('utf-8') + b'\n')
+        with sock.makefile('r', encoding='utf-8') as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+
+    if not line:
+        raise ConnectionError("Compression daemon closed the connection")
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise DaemonError(response.get('error', 'Unknown daemon error'), response.get('error_type', ''))
+    return response.get('result')
+
+
+def daemon_running(socket_path: Optional[str] = None) -> bool:
+    try:
+        send_request('ping', socket_path=socket_path, timeout=CONNECT_TIMEOUT)
+        return True
+    except (ConnectionError, DaemonError, OSError):
+        return False
+
+
+def _json_default(value: Any) -> Any:
+    """Encode numpy scalars and other stragglers found in safety details"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            method = request['method']
+            if method == 'ping':
+                result = {'pid': os.getpid()}
+            elif method == 'shutdown':
+                result = {'pid': os.getpid()}
+                # shutdown() waits for serve_forever to return, so it cannot run on this thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                with self.server.dispatch_lock:
+                    result = self.server.dispatch(method, request.get('params', {}))
+            response = {'ok': True, 'result': result}
+        except Exception as e:
+            # Report the failure to the client; the daemon keeps serving
+            response = {'ok': False, 'error': str(e), 'error_type': type(e).__name__}
+
+        self.wfile.write(json.dumps(response, ensure_ascii=False, default=_json_default).encode('utf-8') + b'\n')
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, dispatch: Callable[[str, Dict[str, Any]], Any]):
+        self.dispatch = dispatch
+        self.dispatch_lock = threading.Lock()  # The CompressionTool is not thread-safe
+        super().__init__(socket_path, _RequestHandler)
+
+
+def serve(dispatch: Callable[[str, Dict[str, Any]], Any], socket_path: Optional[str] = None) -> None:
+    """Serve requests until a 'shutdown' request arrives.
+
+    dispatch(method, params) does the work and returns a JSON-serialisable
+    result; exceptions it raises are sent back to the client.
+    """
+    path = Path(os.path.abspath(socket_path or default_socket_path()))
+    if str(path.parent) == _private_dir():
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        _check_private_dir(str(path.parent))
+    if path.exists():
+        if daemon_running(str(path)):
+            raise RuntimeError(f"A compression daemon is already listening on {path}")
+        path.unlink()  # Stale socket from a daemon that did not exit cleanly
+
+    old_umask = os.umask(0o177)  # Socket readable and writable by this user only
+    try:
+        server = _DaemonServer(str(path), dispatch)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        with server:
+            server.serve_forever(poll_interval=0.2)
+    finally:
+        path.unlink(missing_ok=True)
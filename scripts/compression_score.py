@@ -1,12 +1,14 @@
-import tiktoken
-from markdown_it import MarkdownIt
-import nltk
 import numpy as np
 import re
-import math
-from collections import Counter
-from typing import Dict, List
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, fields
+
+try:
+    from scripts.line_classifier import LIST, PROSE, classify_lines
+    from scripts.tokenizer_service import shared_tokenizer
+except ImportError:  # Imported from inside scripts/ (see safety_checks.py)
+    from line_classifier import LIST, PROSE, classify_lines
+    from tokenizer_service import shared_tokenizer
 
 @dataclass
 class CompressionMetrics:
@@ -17,10 +19,16 @@ class CompressionMetrics:
     explanation_markers: int
     information_entropy: float
 
+@dataclass
+class TextScore:
+    """Overall score and metrics for one text (see CompressionScorer.score_text)."""
+    compression_score: float
+    metrics: CompressionMetrics
+
 class CompressionScorer:
     def __init__(self):
-        self.encoding = tiktoken.get_encoding("cl100k_base")
-        self.md_parser = MarkdownIt()
+        self.token_cache = shared_tokenizer()
+        self.encoding = self.token_cache.encoding
 
         # Explanation markers to look for
         self.explanation_markers = [
@@ -28,32 +36,16 @@ class CompressionScorer:
             "to illustrate", "that is to say", "specifically"
         ]
 
-        # Download required NLTK data
-        try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('punkt_tab', quiet=True)
-        except:
-            pass  # In case NLTK is not available
+        # Scores by text for the current run, see score_text()
+        self._memo: Dict[str, TextScore] = {}
 
     def calculate_score(self, text: str) -> Dict:
         """Main entry point for scoring."""
-        if not text.strip():
-            return {
-                "overall_score": 0.0,
-                "metrics": {
-                    "list_density": 0.0,
-                    "prose_ratio": 0.0,
-                    "avg_sentence_length": 0.0,
-                    "redundancy": 0.0,
-                    "explanation_markers": 0,
-                    "information_entropy": 0.0
-                },
-                "interpretation": "verbose",
-                "safe_to_compress": True
-            }
+        return self._result(self._score(text))
 
-        metrics = self._calculate_metrics(text)
-        overall_score = self._compute_overall_score(metrics)
+    def _result(self, score: TextScore) -> Dict:
+        """calculate_score's result dict for a TextScore."""
+        overall_score, metrics = score.compression_score, score.metrics
 
         return {
             "overall_score": overall_score,
@@ -69,19 +61,86 @@ class CompressionScorer:
             "safe_to_compress": overall_score < 0.8
         }
 
-    def _calculate_metrics(self, text: str) -> CompressionMetrics:
-        """Calculate all individual metrics."""
+    def score_text(self, text: str) -> TextScore:
+        """
+        Score text, memoized for the current run.
+
+        A command scores each section and then the whole document, and
+        sections often repeat; the same text is only scored once until
+        clear_memo() is called, so callers should clear it per run.
+        """
+        score = self._memo.get(text)
+        if score is None:
+            score = self._memo[text] = self._score(text)
+        return score
+
+    def clear_memo(self) -> None:
+        """Forget scores memoized by score_text (call at the start of each run)."""
+        self._memo.clear()
+
+    def _score(self, text: str) -> TextScore:
+        if not text.strip():
+            return TextScore(0.0, CompressionMetrics(0.0, 0.0, 0.0, 0.0, 0, 0.0))
+        metrics = self._calculate_metrics(text)
+        return TextScore(self._compute_overall_score(metrics), metrics)
+
+    def calculate_scores(self, texts: List[str], num_threads: int = 8) -> Dict:
+        """
+        Score many documents at once; per-document values match calculate_score.
+
+        Texts are tokenized together with tiktoken's multi-threaded
+        encode_batch (through the shared token cache), entropy is computed
+        for all documents in one NumPy pass, and the overall scores are
+        combined column-wise.
+
+        Returns a columnar dict shaped like calculate_score's result, with a
+        NumPy array (or list, for interpretation) per field, indexed like texts.
+        """
+        n = len(texts)
+        columns = {field.name: np.zeros(n) for field in fields(CompressionMetrics)}
+        columns["explanation_markers"] = np.zeros(n, dtype=np.int64)
+
+        scored = [i for i, text in enumerate(texts) if text.strip()]
+        token_lists = self.token_cache.encode_batch([texts[i] for i in scored], num_threads=num_threads)
+        entropies = self._information_entropies(token_lists)
+
+        for i, tokens, entropy in zip(scored, token_lists, entropies):
+            metrics = self._calculate_metrics(texts[i], tokens, float(entropy))
+            for name, value in vars(metrics).items():
+                columns[name][i] = value
+
+        overall = self._compute_overall_scores(columns)
+        blank = np.ones(n, dtype=bool)
+        blank[scored] = False
+        overall[blank] = 0.0
+
+        return {
+            "overall_score": overall,
+            "metrics": columns,
+            "interpretation": [self._interpret_score(score) for score in overall],
+            "safe_to_compress": overall < 0.8
+        }
+
+    def _calculate_metrics(self, text: str, tokens: Optional[List[int]] = None,
+                           information_entropy: Optional[float] = None) -> CompressionMetrics:
+        """Calculate all individual metrics (tokens and entropy may be precomputed)."""
 
-        # Count total tokens
-        total_tokens = len(self.encoding.encode(text))
+        # Tokenize once; every token-based metric is derived from this stream
+        if tokens is None:
+            tokens = self.token_cache.encode(text)
+        total_tokens = len(tokens)
         if total_tokens == 0:
             return CompressionMetrics(0.0, 0.0, 0.0, 0.0, 0, 0.0)
 
+        lines = text.split('\n')
+        line_tokens = self._line_token_counts(tokens, lines)
+        line_types = np.frombuffer(classify_lines(lines), dtype=np.uint8)
+
         # 1. List density calculation
-        list_density = self._calculate_list_density(text, total_tokens)
+        list_density = self._calculate_list_density(line_types, line_tokens, total_tokens)
 
         # 2. Prose ratio calculation
-        prose_ratio = self._calculate_prose_ratio(text, total_tokens)
+        prose_ratio = self._calculate_prose_ratio(line_types, line_tokens, total_tokens)
 
         # 3. Average sentence length
         avg_sentence_length = self._calculate_avg_sentence_length(text)
@@ -93,7 +152,8 @@ class CompressionScorer:
         explanation_markers = self._count_explanation_markers(text, total_tokens)
 
         # 6. Information entropy
-        information_entropy = self._calculate_information_entropy(text)
+        if information_entropy is None:
+            information_entropy = self._calculate_information_entropy(tokens)
 
         return CompressionMetrics(
             list_density=list_density,
@@ -104,74 +164,60 @@ class CompressionScorer:
             information_entropy=information_entropy
         )
 
-    def _calculate_list_density(self, text: str, total_tokens: int) -> float:
-        """Calculate ratio of list items to total tokens."""
-        # Find list patterns: lines starting with -, *, +, or numbers
-        list_patterns = [
-            r'^\s*[-*+]\s+.+$',  # Bullet lists
-            r'^\s*\d+\.\s+.+$',  # Numbered lists
-            r'^\s*[a-zA-Z]\.\s+.+$',  # Letter lists
-        ]
+    def _line_token_counts(self, tokens: List[int], lines: List[str]) -> np.ndarray:
+        """Number of tokens starting on each line of the text.
 
-        list_content = ""
-        lines = text.split('\n')
+        Token byte offsets come from the token stream itself, so the text is
+        never re-encoded. A token spanning a line break counts toward the
+        line it starts on. Returns an array of shape (2, lines): all tokens
+        per line, and tokens per line excluding the one that starts at the
+        line's own newline.
+        """
+        token_lengths = np.fromiter((len(b) for b in self.encoding.decode_tokens_bytes(tokens)),
+                                    dtype=np.int64, count=len(tokens))
+        token_starts = np.cumsum(token_lengths) - token_lengths
+
+        # Byte offset where each line after the first begins (+1 for the '\n')
+        line_lengths = np.fromiter((len(line.encode('utf-8')) + 1 for line in lines),
+                                   dtype=np.int64, count=len(lines))
+        line_starts = np.cumsum(line_lengths)[:-1]
+
+        line_index = np.searchsorted(line_starts, token_starts, side='right')
+        counts = np.bincount(line_index, minlength=len(lines))
 
-        for line in lines:
-            for pattern in list_patterns:
-                if re.match(pattern, line, re.MULTILINE):
-                    list_content += line + "\n"
-                    break
+        at_break = np.isin(token_starts, line_starts - 1)
+        content_counts = counts - np.bincount(line_index[at_break], minlength=len(lines))
+        return np.stack([counts, content_counts])
 
-        if not list_content:
+    def _calculate_list_density(self, line_types: np.ndarray, line_tokens: np.ndarray, total_tokens: int) -> float:
+        """Calculate ratio of list items to total tokens."""
+        # The old list text kept each newline
+        list_tokens = line_tokens[0, line_types == LIST].sum()
+
+        if not list_tokens:
             return 0.0
 
-        list_tokens = len(self.encoding.encode(list_content))
-        return min(1.0, list_tokens / total_tokens)
+        return min(1.0, float(list_tokens) / total_tokens)
 
-    def _calculate_prose_ratio(self, text: str, total_tokens: int) -> float:
+    def _calculate_prose_ratio(self, line_types: np.ndarray, line_tokens: np.ndarray, total_tokens: int) -> float:
         """Calculate ratio of paragraph tokens to total tokens."""
-        # Don't rely on markdown parser as it misclassifies list content
-        prose_content = ""
+        # Don't rely on markdown parser as it misclassifies list content.
+        # Only substantial prose lines count (see line_classifier); prose
+        # lines are joined by spaces, so their newlines are excluded.
+        prose_tokens = line_tokens[1, line_types == PROSE].sum()
 
-        # Analyze line by line to be more precise
-        lines = text.split('\n')
-        for line in lines:
-            original_line = line
-            line = line.strip()
-
-            # Skip empty lines
-            if not line:
-                continue
-
-            # Skip any markdown structural elements
-            if (line.startswith('#') or         # Headers
-                line.startswith('-') or         # Bullet lists
-                line.startswith('*') or         # Bullet lists
-                line.startswith('+') or         # Bullet lists
-                re.match(r'^\d+\.', line) or    # Numbered lists
-                line.startswith('```') or       # Code blocks
-                line.startswith('|') or         # Tables
-                line.startswith('**') or        # Bold formatting
-                line.endswith(':') or           # Section labels
-                re.match(r'^\w+\s*:\s*', line) or  # Key: value pairs
-                '`' in line):                   # Code snippets
-                continue
-
-            # Must be substantial prose - at least 5 words, multiple meaningful words
-            words = line.split()
-            if (len(words) > 4 and
-                len([word for word in words if len(word) > 3]) > 2 and
-                not any(char in line for char in '()[]{}|`')):  # No code-like formatting
-                prose_content += line + " "
-
-        if not prose_content.strip():
+        if not prose_tokens:
             return 0.0
 
-        prose_tokens = len(self.encoding.encode(prose_content))
-        return min(1.0, prose_tokens / total_tokens)
+        return min(1.0, float(prose_tokens) / total_tokens)
 
     def _calculate_avg_sentence_length(self, text: str) -> float:
         """Calculate average sentence length in words."""
+        sentences, sentence_words, words = self._sentence_stats(text)
+        return self._average_sentence_length(sentences, sentence_words, words, text.count('\n') + 1)
+
+    def _sentence_stats(self, text: str) -> Tuple[int, int, int]:
+        """(real sentences, words in them, all words) after stripping markdown syntax."""
         # Remove markdown syntax for sentence analysis
         clean_text = re.sub(r'[#*_`\[\](){}]', '', text)
         clean_text = re.sub(r'^\s*[-+*]\s+', '', clean_text, flags=re.MULTILINE)
@@ -181,28 +227,27 @@ class CompressionScorer:
         # This better handles compressed formats with short fragments
         sentences = re.split(r'[.!?:\n]+', clean_text)
 
-        if not sentences:
-            return 0.0
-
         # Filter out very short fragments and empty strings
-        real_sentences = []
+        real_sentences = 0
+        sentence_words = 0
         for s in sentences:
-            s = s.strip()
             words = s.split()
             # Must have at least 2 words and not be just punctuation/markdown
             if len(words) >= 2 and not all(len(word) <= 2 for word in words):
-                real_sentences.append(s)
+                real_sentences += 1
+                sentence_words += len(words)
+
+        return real_sentences, sentence_words, len(clean_text.split())
 
-        if not real_sentences:
+    def _average_sentence_length(self, sentences: int, sentence_words: int, words: int, lines: int) -> float:
+        if not sentences:
             # If no "real" sentences found, treat the whole text as short fragments
             # This handles highly compressed content better
-            words = clean_text.split()
-            if len(words) > 0:
-                return min(5.0, len(words) / max(1, text.count('\n') + 1))
+            if words > 0:
+                return min(5.0, words / max(1, lines))
             return 0.0
 
-        word_counts = [len(sentence.split()) for sentence in real_sentences]
-        return sum(word_counts) / len(word_counts)
+        return sentence_words / sentences
 
     def _calculate_redundancy(self, text: str) -> float:
         """Calculate redundancy based on repeated phrases."""
@@ -212,25 +257,24 @@ class CompressionScorer:
         if len(words) < 3:
             return 1.0  # No redundancy possible
 
-        # Generate 3-word phrases
-        phrases = []
-        for i in range(len(words) - 2):
-            phrase = ' '.join(words[i:i+3])
-            phrases.append(phrase)
-
-        if not phrases:
-            return 1.0
+        # Number the distinct words, then pack each 3-word phrase into one
+        # integer key so phrases are counted without building a string apiece
+        vocabulary = {}
+        ids = np.fromiter((vocabulary.setdefault(word, len(vocabulary)) for word in words),
+                          dtype=np.int64, count=len(words))
+        size = len(vocabulary)
+        if size ** 3 < 2 ** 63:
+            phrases = (ids[:-2] * size + ids[1:-1]) * size + ids[2:]
+        else:
+            phrases = np.stack([ids[:-2], ids[1:-1], ids[2:]], axis=1)
 
         # Count phrase frequencies
-        phrase_counts = Counter(phrases)
+        _, phrase_counts = np.unique(phrases, axis=0, return_counts=True)
 
         # Calculate how many phrases appear more than once
-        repeated_phrases = sum(1 for count in phrase_counts.values() if count > 1)
+        repeated_phrases = int(np.count_nonzero(phrase_counts > 1))
         total_unique_phrases = len(phrase_counts)
 
-        if total_unique_phrases == 0:
-            return 1.0
-
         # More sensitive redundancy calculation
         # If many phrases are repeated, redundancy score drops significantly
         redundancy_score = 1.0 - (repeated_phrases / total_unique_phrases)
@@ -247,25 +291,34 @@ class CompressionScorer:
 
         return marker_count
 
-    def _calculate_information_entropy(self, text: str) -> float:
+    def _calculate_information_entropy(self, tokens: List[int]) -> float:
         """Calculate Shannon entropy of token distribution."""
-        tokens = self.encoding.encode(text)
-
         if not tokens:
             return 0.0
-
-        # Count token frequencies
-        token_counts = Counter(tokens)
-        total_tokens = len(tokens)
-
-        # Calculate Shannon entropy
-        entropy = 0.0
-        for count in token_counts.values():
-            probability = count / total_tokens
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
-
-        return entropy
+        return float(self._information_entropies([tokens])[0])
+
+    def _information_entropies(self, token_lists: List[List[int]]) -> np.ndarray:
+        """Shannon entropy of each document's token distribution, in one pass.
+
+        Every (document, token) pair gets an integer key; counting unique keys
+        gives all token frequencies at once, and a weighted bincount sums
+        -p*log2(p) per document.
+        """
+        lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+        entropies = np.zeros(len(token_lists))
+        if not lengths.sum():
+            return entropies
+
+        vocab = self.encoding.n_vocab
+        doc_ids = np.repeat(np.arange(len(token_lists), dtype=np.int64), lengths)
+        tokens = np.concatenate([np.asarray(t, dtype=np.int64) for t in token_lists if len(t)])
+        keys, counts = np.unique(doc_ids * vocab + tokens, return_counts=True)
+
+        key_docs = keys // vocab
+        probabilities = counts / lengths[key_docs]
+        entropies += np.bincount(key_docs, weights=-probabilities * np.log2(probabilities),
+                                 minlength=len(token_lists))
+        return entropies
 
     def _compute_overall_score(self, metrics: CompressionMetrics) -> float:
         """Weighted combination of metrics."""
@@ -290,6 +343,23 @@ class CompressionScorer:
 
         return max(0.0, min(1.0, overall_score))
 
+    def _compute_overall_scores(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """_compute_overall_score over metric columns (same operations, element-wise)."""
+        normalized_sentence_length = np.clip((25 - columns["avg_sentence_length"]) / 20, 0, 1)
+        normalized_explanation = np.clip(1 - (columns["explanation_markers"] / 3), 0, 1)
+        normalized_entropy = np.clip((columns["information_entropy"] - 3.0) / 3.5, 0, 1)
+
+        overall_score = (
+            columns["list_density"] * 0.40 +
+            (1 - columns["prose_ratio"]) * 0.30 +
+            normalized_sentence_length * 0.15 +
+            columns["redundancy"] * 0.05 +
+            normalized_explanation * 0.05 +
+            normalized_entropy * 0.05
+        )
+
+        return np.clip(overall_score, 0.0, 1.0)
+
     def _interpret_score(self, score: float) -> str:
         """Convert score to interpretation."""
         if score < 0.3:
@@ -5,12 +5,15 @@ Token drift detection system - STUB IMPLEMENTATION
 This is a placeholder implementation that will make all tests fail.
 The actual implementation will be added in Checkpoint 2.
 """
-import tiktoken
+import hashlib
+import re
 import yaml
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from scripts.tokenizer_service import shared_tokenizer
+
 @dataclass
 class DriftResult:
     """Data class to hold drift analysis results."""
@@ -33,7 +36,8 @@ class TokenDriftDetector:
 
     def __init__(self):
         """Initialize the detector."""
-        self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.token_cache = shared_tokenizer()
+        self.encoding = self.token_cache.encoding
 
     def check_drift(self, file_path: str) -> Dict:
         """
@@ -58,64 +62,164 @@ class TokenDriftDetector:
 
         return self._format_result(result)
 
-    def _extract_baseline(self, content: str) -> Optional[int]:
-        """Extract baseline_tokens from YAML frontmatter."""
+    def _frontmatter_end(self, lines: List[str]) -> int:
+        """Index of the closing '---' line of the YAML frontmatter, or -1."""
+        if not lines or not lines[0].startswith('---'):
+            return -1
+        for i, line in enumerate(lines[1:], 1):
+            if line.strip() == '---':
+                return i
+        return -1
+
+    def _compression_header(self, content: str) -> Optional[Dict]:
+        """Parse the `compression:` mapping from YAML frontmatter, if any."""
         if not content.startswith('---'):
             return None
 
         try:
-            # Find the end of the YAML frontmatter
             lines = content.split('\n')
-            yaml_end = -1
-            for i, line in enumerate(lines[1:], 1):
-                if line.strip() == '---':
-                    yaml_end = i
-                    break
-
+            yaml_end = self._frontmatter_end(lines)
             if yaml_end == -1:
                 return None
 
             # Extract and parse YAML
-            yaml_content = '\n'.join(lines[1:yaml_end])
-            parsed = yaml.safe_load(yaml_content)
-
+            parsed = yaml.safe_load('\n'.join(lines[1:yaml_end]))
             if not isinstance(parsed, dict):
                 return None
 
-            # Navigate to compression.baseline_tokens
             compression = parsed.get('compression', {})
             if not isinstance(compression, dict):
                 return None
+            return compression
 
-            baseline = compression.get('baseline_tokens')
-
-            # Ensure it's a valid integer
-            if isinstance(baseline, int) and baseline > 0:
-                return baseline
-
+        except (yaml.YAMLError, AttributeError, ValueError):
             return None
 
-        except (yaml.YAMLError, AttributeError, ValueError):
+    def _extract_baseline(self, content: str) -> Optional[int]:
+        """Extract baseline_tokens from YAML frontmatter."""
+        compression = self._compression_header(content)
+        if compression is None:
             return None
 
+        baseline = compression.get('baseline_tokens')
+
+        # Ensure it's a valid integer
+        if isinstance(baseline, int) and baseline > 0:
+            return baseline
+
+        return None
+
+    def _strip_frontmatter(self, content: str) -> str:
+        """Document body without the YAML frontmatter."""
+        if content.startswith('---'):
+            lines = content.split('\n')
+            yaml_end = self._frontmatter_end(lines)
+            if yaml_end != -1:
+                # Content starts after the second ---
+                return '\n'.join(lines[yaml_end + 1:])
+        return content
+
     def _count_tokens(self, content: str) -> int:
         """Count tokens in document (excluding YAML header)."""
-        # Remove YAML frontmatter if present
+        return self.token_cache.count(self._strip_frontmatter(content))
+
+    def stamp_baseline(self, content: str, per_section: bool = False) -> str:
+        """
+        Write compression.baseline_tokens (and optionally per-section baselines)
+        into the document's frontmatter, keeping any other frontmatter keys.
+
+        Args:
+            content: Document, with or without frontmatter
+            per_section: Also record title, content hash and tokens per H1-H3 section
+
+        Returns:
+            Document with updated frontmatter
+        """
+        metadata = {}
         if content.startswith('---'):
             lines = content.split('\n')
-            yaml_end = -1
-            for i, line in enumerate(lines[1:], 1):
-                if line.strip() == '---':
-                    yaml_end = i
-                    break
-
+            yaml_end = self._frontmatter_end(lines)
             if yaml_end != -1:
-                # Content starts after the second ---
-                content = '\n'.join(lines[yaml_end + 1:])
+                try:
+                    parsed = yaml.safe_load('\n'.join(lines[1:yaml_end]))
+                    if isinstance(parsed, dict):
+                        metadata = parsed
+                except yaml.YAMLError:
+                    pass
+        body = self._strip_frontmatter(content)
+
+        compression = metadata.get('compression')
+        if not isinstance(compression, dict):
+            compression = {}
+        compression['baseline_tokens'] = self.token_cache.count(body)
+        if per_section:
+            compression['sections'] = [
+                {
+                    'title': title,
+                    'hash': hashlib.sha256(text.encode('utf-8')).hexdigest()[:16],
+                    'baseline_tokens': self.token_cache.count(text),
+                }
+                for title, text in self._split_sections(body)
+            ]
+        metadata['compression'] = compression
+
+        header = yaml.safe_dump(metadata, sort_keys=False, allow_unicode=True)
+        return f"---\n{header}---\n{body}"
+
+    def check_section_drift(self, file_path: str) -> List[Dict]:
+        """
+        Check token drift per section against the per-section baselines.
+
+        Sections are matched by title, in order. Sections without a recorded
+        baseline are reported as untracked.
+
+        Args:
+            file_path: Path to markdown file
 
-        # Count tokens using tiktoken
-        tokens = self.encoding.encode(content)
-        return len(tokens)
+        Returns:
+            List of drift dictionaries, each with the section title added
+        """
+        content = Path(file_path).read_text()
+        compression = self._compression_header(content) or {}
+        baselines = [s for s in compression.get('sections') or [] if isinstance(s, dict)]
+
+        results = []
+        for title, text in self._split_sections(self._strip_frontmatter(content)):
+            baseline = None
+            for i, recorded in enumerate(baselines):
+                if recorded.get('title') == title:
+                    baseline = recorded.get('baseline_tokens')
+                    del baselines[i]
+                    break
+            if not (isinstance(baseline, int) and baseline > 0):
+                baseline = None
+            result = self._format_result(
+                self._calculate_drift(baseline, self.token_cache.count(text)))
+            result['title'] = title
+            results.append(result)
+        return results
+
+    def _split_sections(self, body: str) -> List[tuple]:
+        """(title, text) for each H1-H3 section, ignoring headers inside code fences."""
+        sections = []
+        title, current, fence = None, [], None
+        for line in body.split('\n'):
+            marker = re.match(r'^\s*(`{3,}|~{3,})', line)
+            if marker:
+                if fence is None:
+                    fence = marker.group(1)[0]
+                elif marker.group(1)[0] == fence:
+                    fence = None
+            header = None if fence else re.match(r'^(#{1,3})\s+(.+)$', line.strip())
+            if header and not marker:
+                if title is not None or any(l.strip() for l in current):
+                    sections.append((title or 'Introduction', '\n'.join(current)))
+                title, current = header.group(2).strip(), [line]
+            else:
+                current.append(line)
+        if title is not None or any(l.strip() for l in current):
+            sections.append((title or 'Introduction', '\n'.join(current)))
+        return sections
 
     def _calculate_drift(self, baseline: Optional[int], current: int) -> DriftResult:
         """Calculate drift metrics and recommendation."""
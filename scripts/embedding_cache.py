@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of sentence embeddings.
+
+Re-validating one original against several candidate compressions, or
+re-running the pipeline in CI, embeds the same text again and again. The
+cache keys each vector by embedding model, chunking configuration and a hash
+of the exact text, so unchanged text is never re-encoded.
+
+Layout of the cache directory:
+    vectors.f16  memory-mapped float16 matrix, one row per slot
+    keys.bin     memory-mapped 16-byte key digest per slot
+    index.json   key -> slot map in least-recently-used order
+    lock         held by the process that writes the cache
+
+Rows are reused least-recently-used first once the disk budget is full.
+Only one process writes at a time; others that find the lock taken open the
+cache read-only, and every read checks the slot's key digest so a slot
+rewritten since the reader loaded its index is a miss, not a wrong vector.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+CACHE_ENV_VAR = 'COMPRESS_EMBEDDING_CACHE'
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_KEY_BYTES = 16
+_MIN_ROWS = 256
+
+
+def embedding_key(text: str, model_name: str, config: str = '') -> str:
+    """Cache key for text embedded by model_name under a chunking configuration."""
+    digest = hashlib.blake2b(digest_size=_KEY_BYTES)
+    for part in (str(CACHE_FORMAT_VERSION), model_name, config, text):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> Optional[str]:
+    """Cache directory from COMPRESS_EMBEDDING_CACHE, or None (caching off)."""
+    return os.environ.get(CACHE_ENV_VAR) or None
+
+
+class EmbeddingCache:
+    """float16 memmap of embedding vectors with an LRU index, bounded by max_bytes."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.dim: Optional[int] = None
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._rows = 0
+        self._vectors: Optional[np.memmap] = None
+        self._keys: Optional[np.memmap] = None
+        self._dirty = False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.directory / 'lock', 'a')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.writable = True
+        except OSError:
+            self.writable = False  # Another process is writing; read its last saved state
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def capacity(self) -> int:
+        """Vectors that fit in the disk budget (unknown until the dimension is)."""
+        if self.dim is None:
+            return 0
+        return max(1, self.max_bytes // (self.dim * 2 + _KEY_BYTES))
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached vector (float32) for key, or None."""
+        slot = self._index.get(key)
+        if slot is not None and slot < self._rows:
+            expected = bytes.fromhex(key)
+            if self._keys[slot].tobytes() == expected:
+                vector = np.array(self._vectors[slot], dtype=np.float32)
+                if self._keys[slot].tobytes() == expected:  # Not rewritten while copying
+                    self._index.move_to_end(key)
+                    self._dirty = True
+                    self.hits += 1
+                    return vector
+        self.misses += 1
+        return None
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store vector (ignored when the cache is read-only)."""
+        if not self.writable:
+            return
+        vector = np.asarray(vector).ravel()
+        if self.dim != len(vector):
+            self._reset(len(vector))
+        if key in self._index:
+            self._index.move_to_end(key)
+            return
+
+        if len(self._index) < self.capacity:
+            slot = len(self._index)
+            self._grow(slot + 1)
+        else:
+            _, slot = self._index.popitem(last=False)
+            self.evictions += 1
+
+        # Clear the key first so a concurrent reader never pairs it with a half-written row
+        self._keys[slot] = 0
+        self._vectors[slot] = vector
+        self._keys[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+        self._index[key] = slot
+        self._dirty = True
+
+    def save(self) -> None:
+        """Flush vectors and write the index (writer only)."""
+        if not (self.writable and self._dirty) or self.dim is None:
+            return
+        self._vectors.flush()
+        self._keys.flush()
+
+        payload = json.dumps({'version': CACHE_FORMAT_VERSION, 'dim': self.dim,
+                              'rows': self._rows, 'entries': list(self._index.items())})
+        index_path = self.directory / 'index.json'
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='index.json', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._dirty = False
+
+    def close(self) -> None:
+        self.save()
+        self._lock_file.close()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads((self.directory / 'index.json').read_text(encoding='utf-8'))
+            if data.get('version') != CACHE_FORMAT_VERSION:
+                return
+            dim, rows = int(data['dim']), int(data['rows'])
+            self._vectors = self._open(self.directory / 'vectors.f16', np.float16, (rows, dim))
+            self._keys = self._open(self.directory / 'keys.bin', np.uint8, (rows, _KEY_BYTES))
+            self.dim, self._rows = dim, rows
+            self._index = OrderedDict((key, slot) for key, slot in data['entries'] if slot < rows)
+        except (OSError, ValueError, KeyError, TypeError):
+            # A missing or corrupt cache is only a missed optimisation
+            self.dim, self._rows, self._index = None, 0, OrderedDict()
+
+    def _open(self, path: Path, dtype, shape) -> np.memmap:
+        return np.memmap(path, dtype=dtype, mode='r+' if self.writable else 'r', shape=shape)
+
+    def _reset(self, dim: int) -> None:
+        """Start an empty cache for vectors of a new dimension."""
+        # Unlink rather than truncate: readers keep their mapping of the old files
+        for name in ('vectors.f16', 'keys.bin', 'index.json'):
+            (self.directory / name).unlink(missing_ok=True)
+        self.dim, self._rows, self._index = dim, 0, OrderedDict()
+        self._vectors = self._keys = None
+        self._dirty = True
+
+    def _grow(self, rows: int) -> None:
+        """Make room for at least rows slots, doubling up to capacity."""
+        if rows <= self._rows:
+            return
+        new_rows = min(self.capacity, max(rows, 2 * self._rows, _MIN_ROWS))
+        for name, width in (('vectors.f16', self.dim * 2), ('keys.bin', _KEY_BYTES)):
+            with open(self.directory / name, 'ab') as f:
+                f.truncate(new_rows * width)
+        self._rows = new_rows
+        self._vectors = self._open(self.directory / 'vectors.f16', np.float16, (new_rows, self.dim))
+        self._keys = self._open(self.directory / 'keys.bin', np.uint8, (new_rows, _KEY_BYTES))
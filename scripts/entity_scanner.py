@@ -0,0 +1,107 @@
+"""
+Single-pass technical entity scanner.
+
+The safety validator and the mock compressor both check that compression
+keeps technical entities: API paths, URLs, identifiers, acronyms, file
+extensions. scan_entities() finds every category with one precompiled regex
+in one pass over the text, and returns each entity with its category and
+character span, so callers can also say where an entity occurs.
+
+Matches do not overlap, except that a backticked identifier and a dotted
+extension are reported without consuming the words inside them: `user_id`
+is both CODE ("user_id") and SNAKE_CASE, and a.json is both EXTENSION
+(".json") and the word "json". A path is one entity, and the words in
+each of its segments are reported as well, so JSON/CSV is the acronym
+JSON, the path /CSV and the acronym CSV. A URL is one entity; the words
+inside it are not reported separately.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Collection, List, Optional
+
+
+# Entity categories
+URL = 'url'                  # http(s)://host
+PATH = 'path'                # /api/users
+CODE = 'code'                # Identifier in backticks (text without the backticks)
+EXTENSION = 'extension'      # .py (with the dot)
+ACRONYM = 'acronym'          # HTTP: 2-5 capitals
+CONSTANT = 'constant'        # MAX_RETRIES: capitals and underscores
+SNAKE_CASE = 'snake_case'    # user_id
+CAMEL_CASE = 'camel_case'    # getUser
+PROPER_NOUN = 'proper_noun'  # React, UserTable
+CALL = 'call'                # save() (with the parentheses)
+
+# Categories the safety validator compares (proper nouns are left to NER)
+TECHNICAL_KINDS = frozenset({URL, PATH, EXTENSION, ACRONYM, CONSTANT, SNAKE_CASE, CAMEL_CASE})
+
+# One alternation, dispatched on the first character. Possessive quantifiers
+# match the same text as greedy ones here and never backtrack into a word.
+_SCANNER = re.compile(r"""
+      (?P<url>https?://[\w.-]++)
+    | \b(?:
+          (?=[A-Z])(?:
+              (?P<acronym>[A-Z]{2,5}+)\b
+            | (?P<constant>[A-Z][A-Z_]{2,}+)\b
+            | (?P<proper_noun>[A-Z][a-z]++(?:[A-Z][a-z]*+)*+)\b)
+        | (?=[a-z])(?:
+              (?P<snake_case>[a-z]++_[a-z_]++)\b
+            | (?P<camel_case>[a-z]++[A-Z][a-zA-Z]++)\b)
+        | (?P<word>\w++)(?=\(\))
+      )(?P<call>\(\))?
+    | (?P<path>/[\w/\-]++)
+    | `(?=(?P<code>[a-zA-Z_][a-zA-Z0-9_.]*+)`)
+    | \.(?=(?P<extension>[a-z]{2,4}+)\b)
+""", re.VERBOSE)
+
+_KIND_GROUPS = {_SCANNER.groupindex[kind]: kind
+                for kind in (URL, PATH, CODE, EXTENSION, ACRONYM, CONSTANT, SNAKE_CASE, CAMEL_CASE, PROPER_NOUN)}
+_CALL_GROUP = _SCANNER.groupindex[CALL]
+_PATH_GROUP = _SCANNER.groupindex[PATH]
+
+_PATH_SEGMENT = re.compile(r'[^/]+')
+
+
+@dataclass(frozen=True)
+class Entity:
+    """One entity occurrence"""
+    kind: str
+    text: str
+    start: int  # Character offsets of text in the scanned string
+    end: int
+
+
+def scan_entities(text: str, kinds: Optional[Collection[str]] = None) -> List[Entity]:
+    """Entities of the given kinds (default: all) in text order."""
+    entities: List[Entity] = []
+    _scan(text, 0, len(text), kinds, entities)
+    return entities
+
+
+def _scan(text: str, pos: int, endpos: int, kinds: Optional[Collection[str]], entities: List[Entity]) -> None:
+    """Append the entities in text[pos:endpos] to entities."""
+    for match in _SCANNER.finditer(text, pos, endpos):
+        group = match.lastindex
+        if group == _CALL_GROUP:
+            # The name before the call suffix matched too
+            group = next(i for i in range(_CALL_GROUP - 1, 0, -1) if match.start(i) >= 0)
+        kind = _KIND_GROUPS.get(group)
+        if kind is not None and (kinds is None or kind in kinds):
+            start = match.start() if kind == EXTENSION else match.start(group)  # Keep the dot
+            entities.append(Entity(kind, text[start:match.end(group)], start, match.end(group)))
+        if match.start(_CALL_GROUP) >= 0 and (kinds is None or CALL in kinds):
+            name = match.group(group)
+            if group in _KIND_GROUPS or not name[0].isdigit():
+                entities.append(Entity(CALL, name + '()', match.start(group), match.end(_CALL_GROUP)))
+        if group == _PATH_GROUP:
+            # Segments hold no slash, so scanning them finds words, never another path
+            for segment in _PATH_SEGMENT.finditer(text, match.start(group), match.end(group)):
+                _scan(text, segment.start(), segment.end(), kinds, entities)
+
+
+def line_numbers(text: str, offsets: List[int]) -> List[int]:
+    """1-based line number of each character offset in text."""
+    line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+    return [bisect_right(line_starts, offset) for offset in offsets]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Incremental compression scoring for documents under edit.
+
+An editor integration re-scores a document on every save. IncrementalScorer
+keeps the state behind each CompressionScorer metric (token frequencies for
+entropy, trigram counts for redundancy, per-line types, token and sentence
+counts) and updates it from a line-level edit, so re-scoring costs time
+proportional to the edit rather than the document.
+
+Tokens are re-encoded only for the lines around an edit. tiktoken never
+merges a token across a line break followed by a non-whitespace character,
+so the document splits into chunks at those lines, and encoding the chunks
+an edit touches gives the same tokens as encoding the whole text. Scores
+therefore match CompressionScorer.calculate_score on the edited text.
+"""
+import math
+import re
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scripts.compression_score import CompressionMetrics, CompressionScorer, TextScore
+from scripts.line_classifier import LIST, PROSE, classify_line
+
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
+def _starts_chunk(line: str) -> bool:
+    """Tokens never span the line break before a line starting with non-whitespace"""
+    return bool(line) and not line[0].isspace()
+
+
+class IncrementalScorer:
+    """CompressionScorer state for one document, updated line edit by line edit"""
+
+    def __init__(self, text: str = '', scorer: Optional[CompressionScorer] = None):
+        self.scorer = scorer or CompressionScorer()
+        self.encoding = self.scorer.encoding
+
+        # Per line
+        self._lines: List[str] = []
+        self._fences: List[Optional[str]] = []     # Fence state before the line
+        self._types = array('B')
+        self._tokens: List[np.ndarray] = []        # Tokens starting on the line
+        self._content_tokens = array('L')          # ... excluding one starting at its newline
+        self._words: List[List[str]] = []
+        self._markers = array('L')
+        self._sentences: List[Tuple[int, int, int]] = []
+
+        # Document totals
+        self._nonblank_lines = 0
+        self._total_tokens = 0
+        self._list_tokens = 0
+        self._prose_tokens = 0
+        self._token_counts: Dict[int, int] = {}
+        self._token_entropy_sum = 0.0              # Sum of c*log2(c) over token counts
+        self._trigram_counts: Dict[Tuple[str, str, str], int] = {}
+        self._repeated_trigrams = 0
+        self._word_count = 0
+        self._marker_count = 0
+        self._sentence_totals = [0, 0, 0]           # Real sentences, their words, all words
+
+        if text:
+            self.edit(0, 0, text.split('\n'))
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self._lines)
+
+    def update(self, text: str) -> Dict:
+        """Score new document text, applying only the lines that changed.
+
+        The changed range is found by trimming the common leading and trailing
+        lines; callers with a real diff should use edit() directly.
+        """
+        new_lines = text.split('\n') if text else []
+        old_lines = self._lines
+        limit = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+        return self.edit(prefix, len(old_lines) - suffix, new_lines[prefix:len(new_lines) - suffix])
+
+    def edit(self, start: int, end: int, lines: Sequence[str]) -> Dict:
+        """Replace lines[start:end] with lines and return the new score.
+
+        Only the edited lines and the token chunks around them are rescanned,
+        plus any following lines whose code-fence state the edit changed.
+        """
+        old_count = len(self._lines)
+        if not 0 <= start <= end <= old_count:
+            raise ValueError(f"Invalid line range {start}:{end} for {old_count} lines")
+
+        # Rescan from the chunk before the edit (an indented first line joins it,
+        # and the line before a tail edit may become the last line) to the next chunk
+        low = start - 1 if start > 0 else 0
+        while low > 0 and not _starts_chunk(self._lines[low]):
+            low -= 1
+        high = end
+        while high < old_count and not _starts_chunk(self._lines[high]):
+            high += 1
+
+        window = self._lines[low:start] + list(lines) + self._lines[end:high]
+        at_end = high == old_count
+
+        # Take out the old window, then add the rescanned one
+        self._count_lines(low, high, -1)
+        trigram_context = self._trigram_context(low, high)
+        self._count_trigrams(self._window_words(low, high), trigram_context, -1)
+
+        fence = self._fences[low] if low < old_count else None
+        fences, types = [], array('B')
+        for line in window:
+            fences.append(fence)
+            line_type, fence = classify_line(line, fence)
+            types.append(line_type)
+
+        tokens, content = self._tokens_by_line(window, trailing_newline=not at_end)
+        words = [_WORD_RE.findall(line.lower()) for line in window]
+        markers = array('L', (self.scorer._count_explanation_markers(line, 0) for line in window))
+        sentences = [self.scorer._sentence_stats(line if at_end and i == len(window) - 1 else line + '\n')
+                     for i, line in enumerate(window)]
+
+        # Lines after the window keep their tokens, but a new or removed
+        # fence changes their types until the fence state agrees again
+        j = high
+        while j < old_count and fence != self._fences[j]:
+            self._count_type(j, -1)
+            self._fences[j] = fence
+            self._types[j], fence = classify_line(self._lines[j], fence)
+            self._count_type(j, 1)
+            j += 1
+
+        self._lines[low:high] = window
+        self._fences[low:high] = fences
+        self._types[low:high] = types
+        self._tokens[low:high] = tokens
+        self._content_tokens[low:high] = content
+        self._words[low:high] = words
+        self._markers[low:high] = markers
+        self._sentences[low:high] = sentences
+
+        self._count_lines(low, low + len(window), 1)
+        self._count_trigrams(self._window_words(low, low + len(window)), trigram_context, 1)
+        return self.score()
+
+    def score(self) -> Dict:
+        """Current score, shaped like CompressionScorer.calculate_score's result."""
+        scorer = self.scorer
+        if not self._nonblank_lines:
+            return scorer._result(scorer._score(''))
+
+        total = self._total_tokens
+        list_density = min(1.0, self._list_tokens / total) if self._list_tokens else 0.0
+        prose_ratio = min(1.0, self._prose_tokens / total) if self._prose_tokens else 0.0
+        avg_sentence_length = scorer._average_sentence_length(*self._sentence_totals, len(self._lines))
+
+        if self._word_count < 3:
+            redundancy = 1.0
+        else:
+            redundancy = max(0.0, 1.0 - self._repeated_trigrams / len(self._trigram_counts))
+
+        entropy = max(0.0, math.log2(total) - self._token_entropy_sum / total)
+
+        metrics = CompressionMetrics(
+            list_density=list_density,
+            prose_ratio=prose_ratio,
+            avg_sentence_length=avg_sentence_length,
+            redundancy=redundancy,
+            explanation_markers=self._marker_count,
+            information_entropy=entropy
+        )
+        return scorer._result(TextScore(scorer._compute_overall_score(metrics), metrics))
+
+    def _tokens_by_line(self, lines: List[str], trailing_newline: bool) -> Tuple[List[np.ndarray], array]:
+        """Encode lines as one text and split the tokens by the line each starts on."""
+        if not lines:
+            return [], array('L')
+        tokens = np.array(self.encoding.encode('\n'.join(lines) + ('\n' if trailing_newline else '')),
+                          dtype=np.uint32)
+        token_lengths = np.fromiter((len(b) for b in self.encoding.decode_tokens_bytes(tokens.tolist())),
+                                    dtype=np.int64, count=len(tokens))
+        token_starts = np.cumsum(token_lengths) - token_lengths
+
+        line_ends = np.cumsum([len(line.encode('utf-8')) + 1 for line in lines])
+        line_index = np.searchsorted(line_ends, token_starts, side='right')
+        per_line = np.split(tokens, np.searchsorted(line_index, np.arange(1, len(lines))))
+
+        at_break = np.isin(token_starts, line_ends - 1)
+        content = (np.bincount(line_index, minlength=len(lines))
+                   - np.bincount(line_index[at_break], minlength=len(lines)))
+        return per_line, array('L', content.tolist())
+
+    def _count_type(self, index: int, sign: int) -> None:
+        line_type = self._types[index]
+        if line_type == LIST:
+            self._list_tokens += sign * len(self._tokens[index])
+        elif line_type == PROSE:
+            self._prose_tokens += sign * self._content_tokens[index]
+
+    def _count_lines(self, low: int, high: int, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) lines[low:high] from the document totals."""
+        if low == high:
+            return
+        for i in range(low, high):
+            self._count_type(i, sign)
+            self._nonblank_lines += sign * bool(self._lines[i].strip())
+            self._word_count += sign * len(self._words[i])
+            self._marker_count += sign * self._markers[i]
+            for k, value in enumerate(self._sentences[i]):
+                self._sentence_totals[k] += sign * value
+
+        tokens = np.concatenate(self._tokens[low:high])
+        self._total_tokens += sign * len(tokens)
+        counts = self._token_counts
+        for token, n in zip(*np.unique(tokens, return_counts=True)):
+            token = int(token)
+            before = counts.get(token, 0)
+            after = before + sign * int(n)
+            self._token_entropy_sum += self._c_log_c(after) - self._c_log_c(before)
+            if after:
+                counts[token] = after
+            else:
+                del counts[token]
+
+    @staticmethod
+    def _c_log_c(count: int) -> float:
+        return count * math.log2(count) if count > 1 else 0.0
+
+    def _window_words(self, low: int, high: int) -> List[str]:
+        return [word for words in self._words[low:high] for word in words]
+
+    def _trigram_context(self, low: int, high: int) -> Tuple[List[str], List[str]]:
+        """Up to two words before lines[low:high] and two after (trigrams may span lines)"""
+        before: List[str] = []
+        i = low - 1
+        while i >= 0 and len(before) < 2:
+            before[:0] = self._words[i][-(2 - len(before)):]
+            i -= 1
+        after: List[str] = []
+        i = high
+        while i < len(self._words) and len(after) < 2:
+            after.extend(self._words[i][:2 - len(after)])
+            i += 1
+        return before, after
+
+    def _count_trigrams(self, words: List[str], context: Tuple[List[str], List[str]], sign: int) -> None:
+        """Add or remove the trigrams of words, including those spanning into the context."""
+        sequence = context[0] + words + context[1]
+        counts = self._trigram_counts
+        for i in range(len(sequence) - 2):
+            key = (sequence[i], sequence[i + 1], sequence[i + 2])
+            before = counts.get(key, 0)
+            after = before + sign
+            self._repeated_trigrams += (after > 1) - (before > 1)
+            if after:
+                counts[key] = after
+            else:
+                del counts[key]
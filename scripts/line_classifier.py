@@ -0,0 +1,83 @@
+"""
+One-pass markdown line classifier.
+
+The scorer's list and prose metrics, the analyzer's fallback score and the
+mock compressor all need to know what each line is. classify_lines() walks
+the lines once, tracking fenced code, and returns one type code per line in
+a compact array('B'); consumers index it, or view it as a NumPy uint8 array
+with np.frombuffer, instead of rescanning the text with their own regexes.
+
+Lines inside a code fence (and the fence lines themselves) are CODE, so code
+is never counted as prose or list content.
+"""
+
+import re
+from array import array
+from typing import Iterable, Optional, Tuple
+
+
+# Line types
+BLANK = 0     # Empty or whitespace only
+TEXT = 1      # Text that is not substantial prose (labels, key: value, short or code-like lines)
+PROSE = 2     # Substantial prose sentence
+HEADING = 3   # ATX heading
+LIST = 4      # Bullet, numbered or lettered list item
+TABLE = 5     # Table row
+CODE = 6      # Fence line or line inside a fenced code block
+
+_FENCE_RE = re.compile(r'^\s*(`{3,}|~{3,})')
+_LIST_RE = re.compile(r'^\s*(?:[-*+•]|\d+\.|[a-zA-Z]\.)\s+\S')
+# Text that starts or reads like markup rather than a sentence
+_STRUCTURAL_RE = re.compile(r'^(?:[-*+]|\d+\.|\w+\s*:)|:$|`')
+_CODE_CHARS = frozenset('()[]{}|`')
+
+
+def _is_prose(stripped: str) -> bool:
+    """At least 5 words, 3 of them longer than 3 characters, and no code-like characters"""
+    words = stripped.split()
+    return (len(words) > 4 and
+            sum(1 for word in words if len(word) > 3) > 2 and
+            _CODE_CHARS.isdisjoint(stripped))
+
+
+def classify_line(line: str, fence: Optional[str] = None) -> Tuple[int, Optional[str]]:
+    """Type of one line and the fence state after it.
+
+    fence is the opening marker of the code block the line is in (None
+    outside code), as returned for the previous line, so classification
+    can resume anywhere in a document.
+    """
+    stripped = line.strip()
+    marker = _FENCE_RE.match(line)
+
+    if fence is not None:
+        # A closing fence uses the same character, at least as many times, and nothing else
+        closing = marker.group(1) if marker else ''
+        if closing.startswith(fence[0]) and len(closing) >= len(fence) and stripped == closing:
+            fence = None
+        return CODE, fence
+    if marker:
+        return CODE, marker.group(1)
+    if not stripped:
+        return BLANK, None
+    if stripped.startswith('#'):
+        return HEADING, None
+    if _LIST_RE.match(line):
+        return LIST, None
+    if stripped.startswith('|'):
+        return TABLE, None
+    if _STRUCTURAL_RE.search(stripped) or not _is_prose(stripped):
+        return TEXT, None
+    return PROSE, None
+
+
+def classify_lines(lines: Iterable[str]) -> array:
+    """Line type (see the module constants) for each line, as an array('B')."""
+    types = array('B')
+    fence = None  # Opening marker while inside a code block
+
+    for line in lines:
+        line_type, fence = classify_line(line, fence)
+        types.append(line_type)
+
+    return types
@@ -0,0 +1,196 @@
+"""
+Markdown block tree for the AST compression pipeline.
+
+The document is parsed once with markdown-it and split into its top-level
+blocks, each carrying its exact source text. Rendering is concatenation, so
+a tree nobody touched renders back to the original byte for byte.
+
+Only paragraphs are prose. Code, tables, HTML, lists, quotes, headings and
+YAML front matter are carried through verbatim and never rescanned.
+
+iter_blocks() is the streaming counterpart for files too large to hold in
+memory: it reads lines lazily and yields blocks as soon as they close.
+Verbatim blocks (code fences, tables, HTML) are yielded in pieces of at most
+max_block_chars, so memory stays bounded however long a block runs.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from markdown_it import MarkdownIt
+
+
+# Top-level block kinds that compression techniques may rewrite
+PROSE_KINDS = frozenset({'paragraph'})
+
+_parser = MarkdownIt('commonmark').enable('table')
+
+# Line breaks as markdown-it counts them (it normalises \r\n and \r to \n)
+_LINE_RE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+$')
+
+# Line classification for the streaming block reader
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_HEADING_RE = re.compile(r'^ {0,3}#{1,6}(?:[ \t]|$)')
+_TABLE_RE = re.compile(r'^ {0,3}\|')
+_RULE_RE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_HTML_COMMENT_RE = re.compile(r'^ {0,3}<!--')
+_VERBATIM_RE = re.compile(r'^(?: {4}|\t| {0,3}(?:>|[-+*][ \t]|\d{1,9}[.)][ \t]))')
+# Verbatim starts that may interrupt a paragraph (indented code and lists not starting at 1 cannot)
+_INTERRUPT_RE = re.compile(r'^ {0,3}(?:>|[-+*][ \t]+\S|1[.)][ \t]+\S)')
+
+DEFAULT_MAX_BLOCK_CHARS = 1 << 20
+
+
+@dataclass
+class Block:
+    """One top-level markdown block and its source text"""
+    kind: str   # markdown-it block type ('paragraph', 'fence', 'table', ...) or 'gap'
+                # for source between blocks (blank lines, link definitions)
+    text: str   # Exact source lines, including the trailing newline
+
+    @property
+    def is_prose(self) -> bool:
+        return self.kind in PROSE_KINDS
+
+
+def _front_matter_end(lines: List[str]) -> int:
+    """Number of lines taken by a leading YAML front matter block (0 if none)."""
+    if not lines or lines[0].rstrip() != '---':
+        return 0
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() in ('---', '...'):
+            return i + 1
+    return 0
+
+
+def parse_blocks(text: str) -> List[Block]:
+    """Split a document into top-level blocks covering every source line."""
+    lines = _LINE_RE.findall(text)
+    blocks: List[Block] = []
+
+    start = _front_matter_end(lines)
+    if start:
+        blocks.append(Block('front_matter', ''.join(lines[:start])))
+
+    body = ''.join(lines[start:])
+    cursor = 0
+    for token in _parser.parse(body):
+        if token.level != 0 or token.nesting == -1 or not token.map:
+            continue
+        begin, end = token.map
+        if begin > cursor:
+            blocks.append(Block('gap', ''.join(lines[start + cursor:start + begin])))
+        kind = token.type[:-len('_open')] if token.type.endswith('_open') else token.type
+        blocks.append(Block(kind, ''.join(lines[start + begin:start + end])))
+        cursor = end
+
+    if start + cursor < len(lines):
+        blocks.append(Block('gap', ''.join(lines[start + cursor:])))
+    return blocks
+
+
+def render_blocks(blocks: List[Block]) -> str:
+    """Render a block tree back to markdown."""
+    return ''.join(block.text for block in blocks)
+
+
+def iter_blocks(lines: Iterable[str],
+                max_block_chars: int = DEFAULT_MAX_BLOCK_CHARS) -> Iterator[Block]:
+    """
+    Stream top-level blocks from an iterable of lines (e.g. an open file).
+
+    A line-based approximation of parse_blocks() that never looks back: code
+    fences, tables, HTML comments, headings, lists/quotes/indented code and
+    YAML front matter pass through verbatim; everything else is paragraph
+    prose. Paragraphs longer than max_block_chars are split, and verbatim
+    blocks are yielded in pieces, so concatenating the yielded text always
+    reproduces the input exactly.
+    """
+    kind: Optional[str] = None   # Kind of the block being accumulated
+    parts: List[str] = []
+    size = 0
+    fence = None                 # Opening fence marker while inside a code fence
+    first_line = True
+    in_list = False              # Last non-blank block was a list, quote or indented code
+
+    def flush():
+        nonlocal parts, size
+        block = Block(kind, ''.join(parts))
+        parts, size = [], 0
+        return block
+
+    for line in lines:
+        content = line.rstrip('\r\n')
+
+        # Continue a multi-line verbatim construct
+        if kind == 'front_matter':
+            parts.append(line)
+            size += len(line)
+            if content.rstrip() in ('---', '...'):
+                yield flush()
+                kind = None
+            elif size >= max_block_chars:
+                yield flush()
+            continue
+        if kind == 'fence':
+            parts.append(line)
+            size += len(line)
+            marker = _FENCE_RE.match(content)
+            if marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence) \
+                    and not content[marker.end():].strip():
+                yield flush()
+                kind, fence = None, None
+            elif size >= max_block_chars:
+                yield flush()
+            continue
+        if kind == 'html_block':
+            parts.append(line)
+            size += len(line)
+            if '-->' in content:
+                yield flush()
+                kind = None
+            elif size >= max_block_chars:
+                yield flush()
+            continue
+
+        # Classify a line that starts (or continues) a simple block
+        if not content.strip():
+            line_kind = 'gap'
+        elif first_line and content.rstrip() == '---':
+            line_kind = 'front_matter'
+        elif _FENCE_RE.match(content):
+            line_kind = 'fence'
+        elif _HTML_COMMENT_RE.match(content):
+            line_kind = 'html_block'
+        elif _HEADING_RE.match(content) or _RULE_RE.match(content):
+            line_kind = 'heading'
+        elif _TABLE_RE.match(content):
+            line_kind = 'table'
+        elif (_INTERRUPT_RE if kind == 'paragraph' else _VERBATIM_RE).match(content):
+            line_kind = 'verbatim'
+        elif kind == 'verbatim' or (in_list and content[:2].isspace()):
+            line_kind = 'verbatim'  # Lazy continuation, or an indented later paragraph of a list item
+        else:
+            line_kind = 'paragraph'
+        first_line = False
+        if line_kind != 'gap':
+            in_list = line_kind == 'verbatim'
+
+        if parts and (line_kind != kind or line_kind == 'heading' or size >= max_block_chars):
+            yield flush()
+        kind = line_kind
+        parts.append(line)
+        size += len(line)
+
+        if line_kind == 'fence':
+            fence = _FENCE_RE.match(content).group(1)
+        elif line_kind == 'html_block' and '-->' in content[content.index('<!--') + 4:]:
+            yield flush()
+            kind = None
+        elif line_kind == 'heading':
+            yield flush()
+            kind = None
+
+    if parts:
+        yield flush()
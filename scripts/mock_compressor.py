@@ -15,6 +15,8 @@ import tiktoken
 import re
 from typing import Dict, Any, List
 from scripts.compression_score import CompressionScorer
+from scripts import entity_scanner
+from scripts.line_classifier import CODE, HEADING, LIST, classify_lines
 
 
 class MockCompressor:
@@ -23,6 +25,12 @@ class MockCompressor:
     In real tool, this would call actual compression algorithms.
     """
     
+    # Entity categories checked for preservation
+    ENTITY_KINDS = frozenset({
+        entity_scanner.PROPER_NOUN, entity_scanner.ACRONYM, entity_scanner.CONSTANT, entity_scanner.PATH,
+        entity_scanner.SNAKE_CASE, entity_scanner.CAMEL_CASE, entity_scanner.CALL, entity_scanner.CODE,
+    })
+    
     def __init__(self, scorer: CompressionScorer):
         """
         Initialize MockCompressor with compression scorer.
@@ -161,7 +169,10 @@ class MockCompressor:
         # Track if we should compress more aggressively
         target_reduction = 0.3  # Aim for 30% reduction minimum
         
-        for line in lines:
+        for line, line_type in zip(lines, classify_lines(lines)):
+            if line_type == CODE:
+                compressed_lines.append(line)  # Code is kept verbatim
+                continue
             line = line.strip()
             if not line:
                 continue  # Skip empty lines entirely
@@ -177,7 +188,7 @@ class MockCompressor:
                 line = self._shorten_sentence(line, gamma)
             
             # Apply sigma: Convert to structured bullet points
-            if sigma > 0.6 and len(line) > 100 and not line.startswith(('- ', '* ', '1. ', '2. ', '#')):
+            if sigma > 0.6 and len(line) > 100 and line_type not in (LIST, HEADING):
                 # Convert long explanatory paragraphs to concise bullet points
                 key_points = self._extract_key_points(line)
                 for point in key_points:
@@ -344,38 +355,15 @@ class MockCompressor:
         Extract entities from text for preservation checking.
         Simple implementation - in real system would use spaCy NER.
         
-        Extracts:
-        - Capitalized words (proper nouns)
+        Extracts (in one scan, see entity_scanner):
+        - Capitalized words (proper nouns, brand and table names)
         - ALL_CAPS words (constants, acronyms)
         - Technical paths (/api/v1/...)
         - Technical identifiers (snake_case, camelCase)
         - Function/method calls (functionName())
+        - Code-like identifiers in backticks
         """
-        entities = set()
-        
-        # Capitalized words (proper nouns, brand names)
-        entities.update(re.findall(r'\b[A-Z][a-z]+(?:[A-Z][a-z]*)*\b', text))
-        
-        # ALL_CAPS words (acronyms, constants)
-        entities.update(re.findall(r'\b[A-Z]{2,}\b', text))
-        
-        # Technical paths and endpoints
-        entities.update(re.findall(r'/[a-zA-Z][a-zA-Z0-9_/]*', text))
-        
-        # Technical identifiers (snake_case, camelCase)
-        entities.update(re.findall(r'\b[a-z]+(?:_[a-z]+)+\b', text))  # snake_case
-        entities.update(re.findall(r'\b[a-z]+(?:[A-Z][a-z]*)+\b', text))  # camelCase
-        
-        # Function/method calls
-        entities.update(re.findall(r'\b[a-zA-Z_][a-zA-Z0-9_]*\(\)', text))
-        
-        # Database/table names (often have specific patterns)
-        entities.update(re.findall(r'\b[A-Z][a-zA-Z]*(?:Table|Model|Schema|DB)\b', text))
-        
-        # Code-like identifiers in backticks
-        entities.update(re.findall(r'`([a-zA-Z_][a-zA-Z0-9_\.]*)`', text))
-        
-        return list(entities)
+        return list({entity.text for entity in entity_scanner.scan_entities(text, self.ENTITY_KINDS)})
     
     def _check_entity_preservation(self, original_entities: List[str], compressed_entities: List[str]) -> float:
         """
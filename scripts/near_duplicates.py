@@ -0,0 +1,122 @@
+"""
+Near-duplicate sentence index for redundancy removal.
+
+remove_redundancy keeps a sentence only if no previously kept sentence has a
+word-set Jaccard similarity of 0.7 or more. Comparing every sentence with
+every kept sentence is O(n²), which dominates on long documents.
+
+NearDuplicateIndex stores a MinHash signature for each kept sentence and
+buckets it by bands of that signature (locality-sensitive hashing). A query
+only computes exact Jaccard against sentences sharing at least one bucket.
+With 32 bands of 5 rows a pair at exactly the threshold becomes a candidate
+with probability ~99.7%, rising quickly above it. Identical word sets are
+always found, and small indexes are scanned exactly, so short documents keep
+the original behaviour.
+"""
+
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def word_set(sentence: str) -> FrozenSet[str]:
+    """Lower-cased whitespace tokens, as compared by redundancy removal."""
+    return frozenset(sentence.lower().split())
+
+
+def jaccard(words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
+    """Exact Jaccard similarity of two word sets (0.0 if either is empty)."""
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / len(words1 | words2)
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index answering "is this close to anything already added?"."""
+
+    def __init__(self, threshold: float = 0.7, bands: int = 32, rows: int = 5,
+                 exact_below: int = 64, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.exact_below = exact_below
+
+        # Permutations h(x) = (a*x + b) mod p, fixed per seed so results are reproducible
+        rng = np.random.RandomState(seed)
+        num_perm = bands * rows
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self._entries: List[FrozenSet[str]] = []
+        self._exact: Dict[FrozenSet[str], int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, words: Iterable[str]) -> np.ndarray:
+        """MinHash signature of a word set."""
+        hashes = np.fromiter(
+            (zlib.crc32(word.encode('utf-8')) % _MERSENNE_PRIME for word in words),
+            dtype=np.uint64,
+        )
+        if hashes.size == 0:
+            return np.full(self.bands * self.rows, _MERSENNE_PRIME, dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def candidates(self, signature: np.ndarray) -> List[int]:
+        """Indexes of stored sentences sharing at least one LSH bucket."""
+        found = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            found.update(self._buckets[band].get(key, ()))
+        return sorted(found)
+
+    def find_similar(self, words: FrozenSet[str],
+                     signature: Optional[np.ndarray] = None) -> Tuple[bool, float]:
+        """Return (is_near_duplicate, best similarity among the entries checked)."""
+        if not words:
+            return False, 0.0
+        if words in self._exact:
+            return True, 1.0
+
+        if len(self._entries) < self.exact_below:
+            pool = range(len(self._entries))
+        else:
+            if signature is None:
+                signature = self.signature(words)
+            pool = self.candidates(signature)
+
+        best = 0.0
+        for i in pool:
+            similarity = jaccard(words, self._entries[i])
+            if similarity >= self.threshold:
+                return True, similarity
+            best = max(best, similarity)
+        return False, best
+
+    def add(self, words: FrozenSet[str], signature: Optional[np.ndarray] = None) -> None:
+        """Store a kept sentence's word set."""
+        if signature is None:
+            signature = self.signature(words)
+        i = len(self._entries)
+        self._entries.append(words)
+        self._exact.setdefault(words, i)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(i)
+
+    def is_duplicate(self, sentence: str) -> bool:
+        """Check a sentence against the index, adding it when it is new."""
+        words = word_set(sentence)
+        signature = self.signature(words)
+        duplicate, _ = self.find_similar(words, signature)
+        if not duplicate:
+            self.add(words, signature)
+        return duplicate
@@ -0,0 +1,451 @@
+"""
+Precompiled substitution rule engine.
+
+Abbreviation, symbol and filler tables used to be applied one rule at a time,
+each rule a separate re.sub or str.replace over the whole text. RuleTable
+compiles a table once into a short list of stages. Each stage is a single
+alternation matcher whose callback picks the replacement for the rule that
+matched, so a stage costs one pass over the text however many rules it holds.
+
+Sequential application has semantics a naive fused pass does not: a later rule
+sees the output of earlier rules, and an earlier rule wins where two rules
+overlap. Consecutive rules are therefore only fused when a static analysis
+proves they cannot interact:
+
+- Every rule in the stage has a finite set of possible matches (expanded from
+  the regex), optionally anchored by a leading/trailing ^, $, \\A, \\Z or \\b.
+- No match of one rule can overlap a match of another.
+- No replacement can take part in, or change the anchor context of, a match of
+  a later rule.
+
+Rules that cannot be analysed (open-ended repeats, lookarounds, templated
+replacements) get a stage of their own and are applied exactly as before, so
+RuleTable.apply() is byte-identical to RuleTable.apply_sequential().
+"""
+
+import re
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+
+# Upper bound on expanded matches per rule; larger languages are not fused
+MAX_EXPANSIONS = 256
+MAX_CLASS_SIZE = 64
+
+# Flags that can be scoped to a single alternative with (?flags:...)
+_SCOPABLE_FLAGS = {re.IGNORECASE: 'i', re.MULTILINE: 'm', re.DOTALL: 's'}
+
+_ANCHORS = {
+    sre_parse.AT_BEGINNING_STRING: 'bos',
+    sre_parse.AT_END_STRING: 'eos',
+    sre_parse.AT_BOUNDARY: 'wb',
+}
+
+
+class _Unanalysable(Exception):
+    """Raised when a pattern falls outside the fusable subset."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One substitution: regex (re.sub semantics) or literal (str.replace semantics)."""
+    pattern: str
+    replacement: str
+    flags: int = 0
+    literal: bool = False
+
+
+@dataclass
+class _Shape:
+    """What the analysis knows about a rule's possible matches."""
+    strings: Tuple[str, ...]
+    lead: Optional[str]
+    trail: Optional[str]
+    ignorecase: bool
+    replacement: str
+
+
+@dataclass
+class _Stage:
+    """A run of rules applied in one pass."""
+    rules: List[Rule]
+    matcher: Optional[re.Pattern] = None
+    replacements: Dict[int, str] = field(default_factory=dict)
+
+    def apply(self, text: str) -> str:
+        if self.matcher is None:
+            return _apply_rule(self.rules[0], text)
+        return self.matcher.sub(lambda m: self.replacements[m.lastindex], text)
+
+
+def _apply_rule(rule: Rule, text: str) -> str:
+    """Reference semantics for a single rule."""
+    if rule.literal:
+        return text.replace(rule.pattern, rule.replacement)
+    return re.sub(rule.pattern, rule.replacement, text, flags=rule.flags)
+
+
+# ----------------------------------------------------------------------------
+# Pattern analysis
+# ----------------------------------------------------------------------------
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _same(a: str, b: str, ignorecase: bool) -> bool:
+    if a == b:
+        return True
+    return ignorecase and (a.lower() == b.lower() or a.upper() == b.upper())
+
+
+def _expand_class(items) -> List[str]:
+    chars = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.append(chr(av))
+        elif op is sre_parse.RANGE and av[1] - av[0] < MAX_CLASS_SIZE:
+            chars.extend(chr(c) for c in range(av[0], av[1] + 1))
+        else:
+            raise _Unanalysable(op)
+    return chars
+
+
+def _expand(items) -> List[str]:
+    """Expand a parsed (anchor-free) pattern into every string it can match."""
+    results = ['']
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            options = [chr(av)]
+        elif op is sre_parse.IN:
+            options = _expand_class(av)
+        elif op is sre_parse.SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            if add_flags or del_flags:
+                raise _Unanalysable(op)
+            options = _expand(sub)
+        elif op is sre_parse.BRANCH:
+            options = [s for alt in av[1] for s in _expand(alt)]
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = av
+            if high is sre_parse.MAXREPEAT or high > 4:
+                raise _Unanalysable(op)
+            body = _expand(sub)
+            options = [''.join(parts) for n in range(low, high + 1)
+                       for parts in product(body, repeat=n)]
+        else:
+            raise _Unanalysable(op)
+
+        results = [prefix + option for prefix in results for option in options]
+        if len(results) > MAX_EXPANSIONS:
+            raise _Unanalysable('too many expansions')
+    return results
+
+
+def _anchor(item, flags: int) -> str:
+    op, av = item
+    if op is not sre_parse.AT:
+        raise _Unanalysable(op)
+    if av is sre_parse.AT_BEGINNING:
+        return 'bol' if flags & re.MULTILINE else 'bos'
+    if av is sre_parse.AT_END and flags & re.MULTILINE:
+        return 'eol'
+    if av in _ANCHORS:
+        return _ANCHORS[av]
+    raise _Unanalysable(av)
+
+
+def _shape(rule: Rule) -> Optional[_Shape]:
+    """Analyse a rule, or return None if it must run in a stage of its own."""
+    if rule.literal:
+        if not rule.pattern:
+            return None
+        return _Shape((rule.pattern,), None, None, False, rule.replacement)
+
+    if rule.flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE):
+        return None
+    if '\\' in rule.replacement:
+        return None  # Templated replacement (group references, escapes)
+
+    try:
+        items = list(sre_parse.parse(rule.pattern, rule.flags))
+        lead = trail = None
+        if items and items[0][0] is sre_parse.AT:
+            lead = _anchor(items.pop(0), rule.flags)
+        if items and items[-1][0] is sre_parse.AT:
+            trail = _anchor(items.pop(), rule.flags)
+        strings = _expand(items)
+    except (_Unanalysable, re.error):
+        return None
+
+    if lead in ('eol', 'eos') or trail in ('bol', 'bos') or '' in strings:
+        return None
+    return _Shape(tuple(dict.fromkeys(strings)), lead, trail,
+                  bool(rule.flags & re.IGNORECASE), rule.replacement)
+
+
+# ----------------------------------------------------------------------------
+# Interaction checks
+# ----------------------------------------------------------------------------
+
+def _anchors_hold(chars: Dict[int, str], start: int, end: int, shape: _Shape) -> bool:
+    """Can the anchors of a match at [start, end) hold, given the known characters?"""
+    before, first = chars.get(start - 1), chars[start]
+    after, last = chars.get(end), chars[end - 1]
+
+    if before is not None:
+        if shape.lead == 'wb' and _is_word(before) == _is_word(first):
+            return False
+        if shape.lead == 'bol' and before != '\n':
+            return False
+        if shape.lead == 'bos':
+            return False
+    if after is not None:
+        if shape.trail == 'wb' and _is_word(after) == _is_word(last):
+            return False
+        if shape.trail == 'eol' and after != '\n':
+            return False
+        if shape.trail == 'eos':
+            return False
+    return True
+
+
+def _placements(fixed: str, s: str, ignorecase: bool):
+    """Yield offsets where s can sit overlapping fixed (which is at [0, len(fixed)))."""
+    for k in range(1 - len(s), len(fixed)):
+        lo, hi = max(0, k), min(len(fixed), k + len(s))
+        if all(_same(fixed[i], s[i - k], ignorecase) for i in range(lo, hi)):
+            yield k
+
+
+def _merged(fixed: str, s: str, k: int) -> Dict[int, str]:
+    chars = {k + i: c for i, c in enumerate(s)}
+    chars.update(enumerate(fixed))
+    return chars
+
+
+def _can_overlap(earlier: _Shape, later: _Shape) -> bool:
+    """Can a match of one rule overlap a match of the other?"""
+    ignorecase = earlier.ignorecase or later.ignorecase
+    for a in earlier.strings:
+        for b in later.strings:
+            for k in _placements(a, b, ignorecase):
+                chars = _merged(a, b, k)
+                if (_anchors_hold(chars, 0, len(a), earlier)
+                        and _anchors_hold(chars, k, k + len(b), later)):
+                    return True
+    return False
+
+
+def _context_before_join(earlier: _Shape, a: str) -> Tuple[Optional[bool], Optional[bool]]:
+    """(is_word, is_line_start) of whatever precedes a deleted match, if known."""
+    if earlier.lead == 'wb':
+        return (not _is_word(a[0])), None
+    if earlier.lead in ('bol', 'bos'):
+        return False, True
+    return None, None
+
+
+def _context_after_join(earlier: _Shape, a: str) -> Tuple[Optional[bool], Optional[bool]]:
+    """(is_word, is_line_end) of whatever follows a deleted match, if known."""
+    if earlier.trail == 'wb':
+        return (not _is_word(a[-1])), None
+    if earlier.trail in ('eol', 'eos'):
+        return False, True
+    return None, None
+
+
+def _can_follow(earlier: _Shape, a: str, b: str) -> bool:
+    """Can a match b of a later rule start right where the earlier match a ends?"""
+    if earlier.trail == 'wb':
+        return _is_word(b[0]) != _is_word(a[-1])
+    if earlier.trail == 'eol':
+        return b[0] == '\n'
+    return earlier.trail != 'eos'
+
+
+def _can_precede(earlier: _Shape, a: str, b: str) -> bool:
+    """Can a match b of a later rule end right where the earlier match a starts?"""
+    if earlier.lead == 'wb':
+        return _is_word(b[-1]) != _is_word(a[0])
+    if earlier.lead == 'bol':
+        return b[-1] == '\n'
+    return earlier.lead != 'bos'
+
+
+def _lead_changes(later: _Shape, earlier: _Shape, a: str, b: str, r: str) -> bool:
+    """Could replacing a with r change the lead anchor of a later match b right after it?"""
+    if later.lead is None or not _can_follow(earlier, a, b):
+        return False
+    if later.lead == 'bos':
+        return not r
+    if r:
+        new_word, new_line = _is_word(r[-1]), r[-1] == '\n'
+    else:
+        new_word, new_line = _context_before_join(earlier, a)
+    if later.lead == 'wb':
+        return new_word is None or new_word != _is_word(a[-1])
+    return new_line is None or new_line != (a[-1] == '\n')
+
+
+def _trail_changes(later: _Shape, earlier: _Shape, a: str, b: str, r: str) -> bool:
+    """Could replacing a with r change the trail anchor of a later match b right before it?"""
+    if later.trail is None or not _can_precede(earlier, a, b):
+        return False
+    if later.trail == 'eos':
+        return not r
+    if r:
+        new_word, new_line = _is_word(r[0]), r[0] == '\n'
+    else:
+        new_word, new_line = _context_after_join(earlier, a)
+    if later.trail == 'wb':
+        return new_word is None or new_word != _is_word(a[0])
+    return new_line is None or new_line != (a[0] == '\n')
+
+
+def _spans_join(earlier: _Shape, a: str, b: str) -> bool:
+    """After a is deleted, can b match across the join of its neighbours?"""
+    for j in range(1, len(b)):
+        left, right = b[j - 1], b[j]
+        if earlier.lead == 'bos' or earlier.trail == 'eos':
+            return False
+        if earlier.lead == 'wb' and _is_word(left) == _is_word(a[0]):
+            continue
+        if earlier.lead == 'bol' and left != '\n':
+            continue
+        if earlier.trail == 'wb' and _is_word(right) == _is_word(a[-1]):
+            continue
+        if earlier.trail == 'eol' and right != '\n':
+            continue
+        return True
+    return False
+
+
+def _can_cascade(earlier: _Shape, later: _Shape) -> bool:
+    """Can the earlier rule's output create, destroy or re-anchor a later match?"""
+    r = earlier.replacement
+    ignorecase = later.ignorecase
+    for b in later.strings:
+        if r:
+            for k in _placements(r, b, ignorecase):
+                if _anchors_hold(_merged(r, b, k), k, k + len(b), later):
+                    return True
+        for a in earlier.strings:
+            if not r and _spans_join(earlier, a, b):
+                return True
+            if (_lead_changes(later, earlier, a, b, r)
+                    or _trail_changes(later, earlier, a, b, r)):
+                return True
+    return False
+
+
+def _independent(earlier: _Shape, later: _Shape) -> bool:
+    return not (_can_overlap(earlier, later) or _can_cascade(earlier, later))
+
+
+# ----------------------------------------------------------------------------
+# Rule tables
+# ----------------------------------------------------------------------------
+
+def _alternative(rule: Rule) -> str:
+    source = re.escape(rule.pattern) if rule.literal else rule.pattern
+    scoped = ''.join(letter for flag, letter in _SCOPABLE_FLAGS.items() if rule.flags & flag)
+    return f'(?{scoped}:{source})' if scoped else f'(?:{source})'
+
+
+def _build_stage(rules: List[Rule]) -> _Stage:
+    if len(rules) == 1:
+        return _Stage(rules)
+
+    parts = []
+    replacements = {}
+    group = 0
+    for rule in rules:
+        group += 1
+        replacements[group] = rule.replacement
+        parts.append(f'({_alternative(rule)})')
+        group += re.compile(_alternative(rule)).groups
+    return _Stage(rules, re.compile('|'.join(parts)), replacements)
+
+
+class RuleTable:
+    """
+    An ordered substitution table compiled into as few passes as possible.
+
+    apply() gives exactly the same output as applying every rule in order
+    (apply_sequential()), with independent neighbouring rules fused into a
+    single matcher.
+    """
+
+    def __init__(self, rules: Iterable[Rule], name: str = ''):
+        self.name = name
+        self.rules = list(rules)
+        self.stages = self._plan(self.rules)
+
+    @classmethod
+    def from_literals(cls, table: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+                      name: str = '') -> 'RuleTable':
+        """Table of str.replace rules (old → new)."""
+        items = table.items() if isinstance(table, dict) else table
+        return cls((Rule(old, new, literal=True) for old, new in items), name)
+
+    @classmethod
+    def from_regex(cls, table: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+                   flags: int = 0, name: str = '') -> 'RuleTable':
+        """Table of re.sub rules (pattern → replacement) sharing the same flags."""
+        items = table.items() if isinstance(table, dict) else table
+        return cls((Rule(pattern, replacement, flags) for pattern, replacement in items), name)
+
+    @classmethod
+    def chain(cls, *tables: 'RuleTable', name: str = '') -> 'RuleTable':
+        """Concatenate tables that are always applied back to back."""
+        return cls((rule for table in tables for rule in table.rules), name)
+
+    @staticmethod
+    def _plan(rules: Sequence[Rule]) -> List[_Stage]:
+        stages = []
+        current: List[Rule] = []
+        shapes: List[_Shape] = []
+
+        for rule in rules:
+            shape = _shape(rule)
+            fusable = (shape is not None and len(shapes) == len(current) and
+                       all(_independent(earlier, shape) for earlier in shapes))
+            if current and not fusable:
+                stages.append(_build_stage(current))
+                current, shapes = [], []
+            current.append(rule)
+            if shape is not None and len(shapes) == len(current) - 1:
+                shapes.append(shape)
+
+        if current:
+            stages.append(_build_stage(current))
+        return stages
+
+    @property
+    def pass_count(self) -> int:
+        """Number of passes over the text apply() makes."""
+        return len(self.stages)
+
+    def apply(self, text: str) -> str:
+        for stage in self.stages:
+            text = stage.apply(text)
+        return text
+
+    def apply_sequential(self, text: str) -> str:
+        """Reference implementation: one pass per rule, in table order."""
+        for rule in self.rules:
+            text = _apply_rule(rule, text)
+        return text
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __repr__(self) -> str:
+        return f"RuleTable({self.name!r}, rules={len(self.rules)}, passes={self.pass_count})"
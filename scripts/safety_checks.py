@@ -20,19 +20,32 @@ import sys
 import os
 import re
 import time
-from typing import Dict, List, Set, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Set, Any, Optional, Tuple
+
+import numpy as np
 
 # Add scripts directory to path for imports
 sys.path.append(os.path.dirname(__file__))
 
-# Core dependencies
-import spacy
-from sentence_transformers import SentenceTransformer
-import tiktoken
-from sklearn.metrics.pairwise import cosine_similarity
+# Heavy dependencies (spaCy, sentence-transformers) are imported when first
+# needed, see SafetyValidator.nlp / similarity_model
+
+# en_core_web_sm components the entity check never reads (only doc.ents is used)
+SPACY_NER_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
 
 # Internal dependencies (from previous tasks)
 from compression_score import CompressionScorer
+try:
+    from scripts.embedding_cache import EmbeddingCache, default_cache_dir, embedding_key
+    from scripts.entity_scanner import TECHNICAL_KINDS, line_numbers, scan_entities
+    from scripts.line_classifier import BLANK, HEADING, classify_lines
+    from scripts.tokenizer_service import shared_tokenizer
+except ImportError:
+    from embedding_cache import EmbeddingCache, default_cache_dir, embedding_key
+    from entity_scanner import TECHNICAL_KINDS, line_numbers, scan_entities
+    from line_classifier import BLANK, HEADING, classify_lines
+    from tokenizer_service import shared_tokenizer
 
 
 class SafetyValidator:
@@ -53,34 +66,31 @@ class SafetyValidator:
 
     def __init__(self):
         """
-        Initialize SafetyValidator with all required models and components.
+        Initialize SafetyValidator with its lightweight components.
 
         Loads:
         - Compression scorer (from TASK-2.1)
-        - spaCy NLP model for entity recognition
-        - Sentence transformer for semantic similarity
         - tiktoken for token counting
+
+        The spaCy NLP model (entity recognition) and the sentence transformer
+        (semantic similarity) are loaded on first use, so documents refused
+        by the pre-check never pay for them. Call preload_models() to warm
+        them up front.
         """
-        print("Initializing SafetyValidator...")
+        print("Initializing SafetyValidator...", file=sys.stderr)
 
         # Initialize compression scorer (TASK-2.1 integration)
         self.scorer = CompressionScorer()
 
-        # Initialize spaCy for entity recognition
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            raise RuntimeError(
-                "spaCy English model not found. Please install with:\n"
-                "python -m spacy download en_core_web_sm"
-            )
-
-        # Initialize sentence transformer for semantic similarity
-        print("Loading sentence transformer model...")
-        self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # Heavy models, loaded lazily by the nlp / similarity_model properties
+        self._nlp = None
+        self._similarity_model = None
+        self.similarity_model_name = 'all-MiniLM-L6-v2'
+        self.model_load_times: Dict[str, float] = {}  # Model name -> seconds spent loading
 
-        # Initialize tiktoken for accurate token counting
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        # Initialize tiktoken for accurate token counting (cached, shared process-wide)
+        self.token_cache = shared_tokenizer()
+        self.tokenizer = self.token_cache.encoding
 
         # Safety thresholds (tunable)
         self.compression_refusal_threshold = 0.8   # score >= 0.8 → refuse
@@ -88,12 +98,101 @@ class SafetyValidator:
         self.minimal_benefit_threshold = 0.85      # compression ratio > 0.85 → refuse
         self.semantic_similarity_threshold = 0.75  # similarity ≥ 0.75
 
-        print("SafetyValidator initialized successfully.")
+        # Stop validate_compression once cheaper checks make the outcome certain
+        self.tiered_validation = True
+        # Run independent model-backed checks in threads instead of one after another
+        self.concurrent_checks = False
+
+        # Semantic similarity chunking: MiniLM truncates inputs at 256 word
+        # pieces, so longer texts are compared chunk by chunk
+        self.similarity_chunk_tokens = 200
+        self.similarity_batch_size = 32
+
+        # Entity recognition runs over paragraph chunks of at most
+        # ner_chunk_chars, batched through nlp.pipe
+        self.ner_chunk_chars = 10000
+        self.ner_batch_size = 32
+
+        # Persistent embedding cache, enabled by COMPRESS_EMBEDDING_CACHE=<dir>.
+        # Keys include similarity_model_name: update it when swapping models
+        cache_dir = default_cache_dir()
+        self.embedding_cache: Optional[EmbeddingCache] = EmbeddingCache(cache_dir) if cache_dir else None
+
+        print("SafetyValidator initialized successfully.", file=sys.stderr)
+
+    @property
+    def nlp(self):
+        """spaCy NER pipeline, loaded on first access without the components NER does not need."""
+        if self._nlp is None:
+            start = time.time()
+            try:
+                import spacy
+                nlp = spacy.load("en_core_web_sm", exclude=SPACY_NER_EXCLUDE)
+                # Larger models share tok2vec with NER; the small one gives NER its own
+                if "tok2vec" in nlp.pipe_names and "ner" not in nlp.get_pipe("tok2vec").listening_components:
+                    nlp.remove_pipe("tok2vec")
+                self._nlp = nlp
+            except OSError:
+                raise RuntimeError(
+                    "spaCy English model not found. Please install with:\n"
+                    "python -m spacy download en_core_web_sm"
+                )
+            self.model_load_times["nlp"] = time.time() - start
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, model):
+        self._nlp = model
+
+    @property
+    def similarity_model(self):
+        """Sentence transformer for semantic similarity, loaded on first access."""
+        if self._similarity_model is None:
+            print("Loading sentence transformer model...", file=sys.stderr)
+            start = time.time()
+            from sentence_transformers import SentenceTransformer
+            self._similarity_model = SentenceTransformer(self.similarity_model_name)
+            self.model_load_times["similarity_model"] = time.time() - start
+        return self._similarity_model
+
+    @similarity_model.setter
+    def similarity_model(self, model):
+        self._similarity_model = model
+
+    def preload_models(self) -> Dict[str, float]:
+        """Load every lazy model now (e.g. in a long-lived process) and return load times."""
+        self.nlp
+        self.similarity_model
+        return dict(self.model_load_times)
 
     def validate_compression(self, original_text: str, compressed_text: str,
                            parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
-        Run all safety checks on a compression operation.
+        Run the safety checks on a compression operation, cheapest tier first.
+
+        Recommendation rules: no failed check → accept, one → warn, two or
+        more → refuse. Checks run in tiers and stop as soon as a refusal is
+        certain, so the model-backed checks only run when the cheaper ones
+        leave the outcome open:
+
+        1. pre_check: already compressed → refuse
+        2. cheap: token ratio (minimal_benefit)
+        3. ner: entity preservation (spaCy NER + technical entities, counted
+           together). When the token ratio failed, an entity failure settles
+           the refusal and the embeddings are skipped
+        4. embeddings: semantic similarity
+
+        Skipping never changes the recommendation or which of the checks
+        that ran failed: accept and warn need every tier, and the result is
+        the same as with tiered_validation = False, which always runs every
+        check.
+
+        With concurrent_checks, model-backed checks that must both run anyway
+        (NER and embeddings once the token ratio passed, or always when
+        untiered) run in a thread pool; spaCy and torch release the GIL
+        in their heavy kernels. Results are the same as serial execution, and
+        check_times reports each check's own wall time, so a sum above the
+        call's duration shows the overlap.
 
         Args:
             original_text: Pre-compression text
@@ -103,7 +202,7 @@ class SafetyValidator:
         Returns:
             {
                 "safe": True/False,
-                "checks": {
+                "checks": {  # Checks that ran
                     "pre_check": {...},
                     "entity_preservation": {...},
                     "minimal_benefit": {...},
@@ -111,45 +210,140 @@ class SafetyValidator:
                 },
                 "failures": [...],  # List of failed checks
                 "recommendation": "accept" | "refuse" | "warn",
-                "summary": "Human-readable summary"
+                "decided_by": "pre_check" | "ner" | "embeddings",
+                "skipped_checks": [...],  # Checks the deciding tier made unnecessary
+                "summary": "Human-readable summary",
+                "check_times": {"pre_check": 0.001, ...},  # Wall seconds per check that ran
+                "model_load_time": 0.0  # Seconds spent loading models during this call
             }
         """
+        return self.validate_many([(original_text, compressed_text)], parameters)[0]
+
+    def validate_many(self, pairs: Iterable[Tuple[str, str]],
+                      parameters: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """
+        Validate many (original, compressed) pairs, one result per pair.
+
+        Each result is what validate_compression returns for that pair, but
+        the work is batched across pairs: tokens are counted with one
+        encode_batch call, texts shared by several pairs (one original
+        against many candidates) are scored and scanned once, every text
+        that needs NER goes through one nlp.pipe run (ner_batch_size), and
+        every chunk that needs an embedding through one encode call
+        (similarity_batch_size). check_times are each pair's share of the
+        batched work; model_load_time is reported on the first pair that
+        needed a model.
+
+        Args:
+            pairs: (original_text, compressed_text) tuples
+            parameters: Optional compression parameters {sigma, gamma, kappa}
+
+        Returns:
+            List of validate_compression results, in the order of pairs
+        """
         if parameters is None:
             parameters = {}
 
-        checks = {}
-        failures = []
+        pairs = list(pairs)
+        load_time_before = sum(self.model_load_times.values(), 0.0)
+        checks: List[Dict[str, Dict]] = [{} for _ in pairs]
+        failures: List[List[Dict]] = [[] for _ in pairs]
+        check_times: List[Dict[str, float]] = [{} for _ in pairs]
+        decided_by = ["pre_check"] * len(pairs)
+
+        def run(name: str, indices: List[int],
+                batch_check: Callable[[List[Tuple[str, str]]], List[Dict[str, Any]]]) -> None:
+            """Run a check over the pairs at indices as one batch and record each result."""
+            if not indices:
+                return
+            start = time.perf_counter()
+            results = batch_check([pairs[i] for i in indices])
+            share = (time.perf_counter() - start) / len(indices)
+            for i, result in zip(indices, results):
+                check_times[i][name] = share
+                checks[i][name] = result
+                if not result["passed"]:
+                    failures[i].append({"check": name, "message": result["message"]})
+
+        # Count every text's tokens in one batch; the checks read them from the cache
+        self.token_cache.encode_batch([text for pair in pairs for text in pair])
+
+        # Tier 1: Pre-check - refuse if already compressed (once per distinct original)
+        run("pre_check", list(range(len(pairs))), lambda batch: self._per_text(
+            self.pre_check_already_compressed, [original for original, _ in batch]))
+        open_pairs = [i for i in range(len(pairs)) if checks[i]["pre_check"]["passed"]]
+
+        def model_tiers(ner: List[int], semantic: List[int]) -> None:
+            """NER then embeddings, or both at once with concurrent_checks."""
+            if self.concurrent_checks and ner and semantic:
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    pending = [pool.submit(run, "entity_preservation", ner, self._entity_preservation_many),
+                               pool.submit(run, "semantic_similarity", semantic, self._semantic_similarity_many)]
+                    for future in pending:
+                        future.result()
+            else:
+                run("entity_preservation", ner, self._entity_preservation_many)
+                run("semantic_similarity", semantic, self._semantic_similarity_many)
 
-        # Step 1: Pre-check - refuse if already compressed
-        checks["pre_check"] = self.pre_check_already_compressed(original_text)
+        # Tier 2: token ratio
+        run("minimal_benefit", open_pairs, self._per_pair(self.check_minimal_benefit))
+        for i in open_pairs:
+            decided_by[i] = "embeddings"
 
-        if not checks["pre_check"]["passed"]:
+        if not self.tiered_validation:
+            model_tiers(open_pairs, open_pairs)
+        else:
+            # Tier 3: with the token ratio failed, an entity failure would settle the refusal
+            ner_first = [i for i in open_pairs if failures[i]]
+            # Tiers 3 and 4 both needed whatever NER finds: batched (or overlapped) together
+            both = [i for i in open_pairs if not failures[i]]
+
+            if self.concurrent_checks:
+                model_tiers(ner_first + both, both)
+                semantic_after = []
+            else:
+                run("entity_preservation", ner_first + both, self._entity_preservation_many)
+                semantic_after = list(both)
+            for i in ner_first:
+                if len(failures[i]) >= 2:
+                    decided_by[i] = "ner"
+                else:
+                    semantic_after.append(i)
+            run("semantic_similarity", sorted(semantic_after), self._semantic_similarity_many)
+
+        model_load_time = sum(self.model_load_times.values(), 0.0) - load_time_before
+        results = []
+        for i in range(len(pairs)):
+            load_time = 0.0
+            if model_load_time and decided_by[i] in ("ner", "embeddings"):
+                load_time, model_load_time = model_load_time, 0.0
+            results.append(self._validation_result(checks[i], failures[i], decided_by[i],
+                                                   check_times[i], load_time))
+        return results
+
+    def _validation_result(self, checks: Dict[str, Dict], failures: List[Dict], decided_by: str,
+                           check_times: Dict[str, float], model_load_time: float) -> Dict[str, Any]:
+        """validate_compression's report for one pair from the checks that ran."""
+        order = ["pre_check", "entity_preservation", "minimal_benefit", "semantic_similarity"]
+        skipped_checks = [name for name in order if name not in checks]
+
+        if decided_by == "pre_check":
             # Pre-check failure stops all processing
-            failures.append({
-                "check": "pre_check",
-                "message": checks["pre_check"]["message"]
-            })
-
             return {
                 "safe": False,
                 "checks": checks,
                 "failures": failures,
                 "recommendation": "refuse",
-                "summary": "Pre-check failed: content already compressed"
+                "decided_by": "pre_check",
+                "skipped_checks": skipped_checks,
+                "summary": "Pre-check failed: content already compressed",
+                "check_times": check_times,
+                "model_load_time": 0.0
             }
 
-        # Step 2-4: Run remaining safety checks
-        checks["entity_preservation"] = self.check_entity_preservation(original_text, compressed_text)
-        checks["minimal_benefit"] = self.check_minimal_benefit(original_text, compressed_text)
-        checks["semantic_similarity"] = self.check_semantic_similarity(original_text, compressed_text)
-
-        # Collect failures from post-checks
-        for check_name, result in checks.items():
-            if check_name != "pre_check" and not result["passed"]:
-                failures.append({
-                    "check": check_name,
-                    "message": result["message"]
-                })
+        # Keep the report in the usual check order
+        checks = {name: checks[name] for name in order if name in checks}
+        failures.sort(key=lambda failure: order.index(failure["check"]))
 
         # Determine recommendation based on failure pattern
         if len(failures) == 0:
@@ -167,9 +361,27 @@ class SafetyValidator:
             "checks": checks,
             "failures": failures,
             "recommendation": recommendation,
-            "summary": self._generate_summary(checks, failures)
+            "decided_by": decided_by,
+            "skipped_checks": skipped_checks,
+            "summary": self._generate_summary(checks, failures),
+            "check_times": check_times,
+            "model_load_time": model_load_time
         }
 
+    @staticmethod
+    def _per_text(check: Callable[[str], Dict[str, Any]], texts: List[str]) -> List[Dict[str, Any]]:
+        """check(text) for each text, computed once per distinct text."""
+        results: Dict[str, Dict[str, Any]] = {}
+        for text in texts:
+            if text not in results:
+                results[text] = check(text)
+        return [dict(results[text]) for text in texts]
+
+    @staticmethod
+    def _per_pair(check: Callable[[str, str], Dict[str, Any]]):
+        """Batch form of a pair check that has nothing to share between pairs."""
+        return lambda batch: [check(original, compressed) for original, compressed in batch]
+
     def pre_check_already_compressed(self, text: str) -> Dict[str, Any]:
         """
         Pre-check: Is content already compressed?
@@ -220,7 +432,8 @@ class SafetyValidator:
         Check if entities (names, technical terms, API endpoints) are preserved.
 
         Uses spaCy NER to extract standard entities plus custom technical extraction
-        for API paths, code identifiers, and technical acronyms.
+        for API paths, code identifiers, and technical acronyms. Both texts go
+        through NER together, in paragraph chunks (see _named_entities).
 
         Args:
             original: Original text
@@ -234,85 +447,173 @@ class SafetyValidator:
                 "preservation_rate": 0.96,
                 "threshold": 0.80,
                 "lost_entities": ["EntityName"],
+                "lost_entity_lines": {"entityname": 12},  # Line of each lost entity in the original
                 "message": "..."
             }
         """
-        try:
-            # Extract entities using spaCy NER
-            orig_doc = self.nlp(original)
-            comp_doc = self.nlp(compressed)
-
-            # Get entity text (unique, case-insensitive)
-            orig_entities = set(ent.text.lower() for ent in orig_doc.ents)
-            comp_entities = set(ent.text.lower() for ent in comp_doc.ents)
-
-            # Add technical entities not caught by spaCy
-            orig_entities.update(self._extract_technical_entities(original))
-            comp_entities.update(self._extract_technical_entities(compressed))
-
-            # Handle edge case: no entities to preserve
-            if len(orig_entities) == 0:
-                return {
-                    "passed": True,
-                    "original_entities": 0,
-                    "preserved_entities": 0,
-                    "preservation_rate": 1.0,
-                    "threshold": self.entity_preservation_threshold,
-                    "lost_entities": [],
-                    "message": "No entities to preserve"
-                }
-
-            # Calculate preservation metrics
-            preserved_entities = orig_entities & comp_entities
-            preserved_count = len(preserved_entities)
-            rate = preserved_count / len(orig_entities)
-            passed = rate >= self.entity_preservation_threshold
-
-            # Identify lost entities (limit to first 5 for readability)
-            lost = orig_entities - comp_entities
-            lost_list = sorted(list(lost))[:5]
+        return self._entity_preservation_many([(original, compressed)])[0]
 
-            # Generate message
-            if passed:
-                message = f"Preserved {rate*100:.1f}% of entities"
-            else:
-                lost_summary = ", ".join(lost_list)
-                if len(lost) > 5:
-                    lost_summary += f" (and {len(lost)-5} more)"
-                message = f"Only {rate*100:.1f}% entities preserved (lost: {lost_summary})"
+    def _entity_preservation_many(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        check_entity_preservation for many pairs, with one NER run over every distinct text.
 
-            return {
-                "passed": passed,
-                "original_entities": len(orig_entities),
-                "preserved_entities": preserved_count,
-                "preservation_rate": rate,
-                "threshold": self.entity_preservation_threshold,
-                "lost_entities": lost_list,
-                "message": message
-            }
+        If the batch fails, each pair is checked on its own, so one bad text
+        only fails its own pair.
+        """
+        try:
+            texts = list(dict.fromkeys(text for pair in pairs for text in pair))
+            named = dict(zip(texts, self._named_entities(texts)))
+            offsets = {text: self._technical_entity_offsets(text) for text in texts}
+
+            results = []
+            for original, compressed in pairs:
+                # spaCy entities plus the technical entities spaCy does not catch
+                orig_entities = named[original] | set(offsets[original])
+                comp_entities = named[compressed] | set(offsets[compressed])
+                results.append(self._entity_preservation_result(orig_entities, comp_entities,
+                                                                original, dict(offsets[original])))
+            return results
 
         except Exception as e:
+            if len(pairs) > 1:
+                return [self._entity_preservation_many([pair])[0] for pair in pairs]
             # Handle errors gracefully - assume failure for safety
-            return {
+            return [{
                 "passed": False,
                 "original_entities": 0,
                 "preserved_entities": 0,
                 "preservation_rate": 0.0,
                 "threshold": self.entity_preservation_threshold,
                 "lost_entities": [],
+                "lost_entity_lines": {},
                 "message": f"Entity preservation check error: {str(e)}"
+            }]
+
+    def _entity_preservation_result(self, orig_entities: Set[str], comp_entities: Set[str],
+                                    original: str, offsets: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Preservation rate, verdict and message for two entity sets.
+
+        Lost entities are located in the original by their scanner offsets
+        (technical entities) or by searching for them (named entities).
+        """
+        # Handle edge case: no entities to preserve
+        if len(orig_entities) == 0:
+            return {
+                "passed": True,
+                "original_entities": 0,
+                "preserved_entities": 0,
+                "preservation_rate": 1.0,
+                "threshold": self.entity_preservation_threshold,
+                "lost_entities": [],
+                "lost_entity_lines": {},
+                "message": "No entities to preserve"
             }
 
+        # Calculate preservation metrics
+        preserved_entities = orig_entities & comp_entities
+        preserved_count = len(preserved_entities)
+        rate = preserved_count / len(orig_entities)
+        passed = rate >= self.entity_preservation_threshold
+
+        # Identify lost entities (limit to first 5 for readability)
+        lost = orig_entities - comp_entities
+        lost_list = sorted(list(lost))[:5]
+
+        # Where the lost entities occur in the original
+        lowered = None
+        lost_offsets = []
+        for entity in lost_list:
+            if entity not in offsets:
+                lowered = original.lower() if lowered is None else lowered
+                offsets[entity] = lowered.find(entity)
+            lost_offsets.append(offsets[entity])
+        lost_lines = {entity: line
+                      for entity, offset, line in zip(lost_list, lost_offsets, line_numbers(original, lost_offsets))
+                      if offset >= 0}
+
+        # Generate message
+        if passed:
+            message = f"Preserved {rate*100:.1f}% of entities"
+        else:
+            lost_summary = ", ".join(f"{entity} (line {lost_lines[entity]})" if entity in lost_lines else entity
+                                     for entity in lost_list)
+            if len(lost) > 5:
+                lost_summary += f" (and {len(lost)-5} more)"
+            message = f"Only {rate*100:.1f}% entities preserved (lost: {lost_summary})"
+
+        return {
+            "passed": passed,
+            "original_entities": len(orig_entities),
+            "preserved_entities": preserved_count,
+            "preservation_rate": rate,
+            "threshold": self.entity_preservation_threshold,
+            "lost_entities": lost_list,
+            "lost_entity_lines": lost_lines,
+            "message": message
+        }
+
+    def _named_entities(self, texts: List[str]) -> List[Set[str]]:
+        """
+        spaCy entities (lowercased) of each text, from one batched nlp.pipe run.
+
+        Texts are split into paragraph chunks first, so documents of any
+        length stay under nlp.max_length and the batches stay small.
+        """
+        nlp = self.nlp
+        chunks = [(chunk, i) for i, text in enumerate(texts) for chunk in self._entity_chunks(text)]
+        entities: List[Set[str]] = [set() for _ in texts]
+        for doc, i in nlp.pipe(chunks, as_tuples=True, batch_size=self.ner_batch_size):
+            entities[i].update(ent.text.lower() for ent in doc.ents)
+        return entities
+
+    def _entity_chunks(self, text: str) -> List[str]:
+        """
+        Split text into chunks of at most ner_chunk_chars for entity recognition.
+
+        Paragraphs are packed into chunks whole; a longer paragraph is split
+        between lines, and a longer line at whitespace.
+        """
+        limit = min(self.ner_chunk_chars, self.nlp.max_length - 1)
+        if len(text) <= limit:
+            return [text] if text.strip() else []
+
+        pieces: List[str] = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            if len(paragraph) <= limit:
+                pieces.append(paragraph)
+                continue
+            for line in paragraph.split('\n'):
+                while len(line) > limit:
+                    cut = line.rfind(' ', 0, limit) + 1 or limit
+                    pieces.append(line[:cut])
+                    line = line[cut:]
+                pieces.append(line)
+
+        chunks: List[str] = []
+        current = ''
+        for piece in pieces:
+            if not piece.strip():
+                continue
+            if current and len(current) + 2 + len(piece) > limit:
+                chunks.append(current)
+                current = ''
+            current = f"{current}\n\n{piece}" if current else piece
+        if current:
+            chunks.append(current)
+        return chunks
+
     def _extract_technical_entities(self, text: str) -> Set[str]:
         """
         Extract technical entities not caught by spaCy NER.
 
-        Detects:
+        Detects (in one scan, see entity_scanner):
         - API paths: /api/users, /auth
         - Code identifiers: camelCase, snake_case
         - Technical acronyms: HTTP, API, JSON (2-5 letters, all caps)
         - File extensions: .py, .js, .md
         - Environment variables: ALL_CAPS_NAMES
+        - URLs and domains
 
         Args:
             text: Text to extract technical entities from
@@ -320,37 +621,15 @@ class SafetyValidator:
         Returns:
             Set of technical entities (lowercase for consistency)
         """
-        entities = set()
-
-        # API paths (e.g., /api/users, /auth/login)
-        api_paths = re.findall(r'/[\w/\-]+', text)
-        entities.update(path.lower() for path in api_paths)
+        return set(self._technical_entity_offsets(text))
 
-        # Snake_case identifiers
-        snake_case = re.findall(r'\b[a-z]+_[a-z_]+\b', text)
-        entities.update(identifier.lower() for identifier in snake_case)
-
-        # camelCase identifiers
-        camel_case = re.findall(r'\b[a-z]+[A-Z][a-zA-Z]+\b', text)
-        entities.update(identifier.lower() for identifier in camel_case)
-
-        # Technical acronyms (2-5 letters, all caps)
-        acronyms = re.findall(r'\b[A-Z]{2,5}\b', text)
-        entities.update(acronym.lower() for acronym in acronyms)
-
-        # File extensions
-        extensions = re.findall(r'\.[a-z]{2,4}\b', text)
-        entities.update(ext.lower() for ext in extensions)
-
-        # Environment variables (ALL_CAPS with underscores)
-        env_vars = re.findall(r'\b[A-Z][A-Z_]{2,}\b', text)
-        entities.update(var.lower() for var in env_vars)
-
-        # URLs and domains
-        urls = re.findall(r'https?://[\w\.-]+', text)
-        entities.update(url.lower() for url in urls)
-
-        return entities
+    @staticmethod
+    def _technical_entity_offsets(text: str) -> Dict[str, int]:
+        """Technical entities (lowercase) with the offset of each one's first occurrence."""
+        offsets: Dict[str, int] = {}
+        for entity in scan_entities(text, TECHNICAL_KINDS):
+            offsets.setdefault(entity.text.lower(), entity.start)
+        return offsets
 
     def check_minimal_benefit(self, original: str, compressed: str) -> Dict[str, Any]:
         """
@@ -376,8 +655,8 @@ class SafetyValidator:
         """
         try:
             # Count tokens using tiktoken
-            orig_tokens = len(self.tokenizer.encode(original))
-            comp_tokens = len(self.tokenizer.encode(compressed))
+            orig_tokens = self.token_cache.count(original)
+            comp_tokens = self.token_cache.count(compressed)
 
             # Handle edge case: empty text
             if orig_tokens == 0:
@@ -433,8 +712,14 @@ class SafetyValidator:
         """
         Check if meaning is preserved using sentence embeddings.
 
-        Uses sentence-transformers to compute cosine similarity between
-        original and compressed text embeddings.
+        Texts longer than similarity_chunk_tokens are split at section and
+        paragraph boundaries (the embedding model would otherwise only see
+        their first few hundred tokens). All chunks of both texts are
+        encoded in one batched call, and the chunk-to-chunk cosine matrix is
+        aggregated as a best-match mean: each original chunk's best match in
+        the compressed text (recall) and vice versa (precision), weighted by
+        chunk tokens and combined as their harmonic mean. Short texts are a
+        single chunk, which is plain cosine similarity.
 
         Args:
             original: Original text
@@ -445,61 +730,203 @@ class SafetyValidator:
                 "passed": True/False,
                 "similarity_score": 0.82,
                 "threshold": 0.75,
+                "chunks": [3, 2],
                 "message": "..."
             }
         """
-        try:
-            # Handle edge cases
-            if not original.strip() or not compressed.strip():
-                return {
-                    "passed": False,
-                    "similarity_score": 0.0,
-                    "threshold": self.semantic_similarity_threshold,
-                    "message": "Cannot compare empty text"
-                }
-
-            if original.strip() == compressed.strip():
-                return {
-                    "passed": True,
-                    "similarity_score": 1.0,
-                    "threshold": self.semantic_similarity_threshold,
-                    "message": "Identical text - perfect similarity"
-                }
+        return self._semantic_similarity_many([(original, compressed)])[0]
 
-            # Generate embeddings
-            orig_embedding = self.similarity_model.encode(original)
-            comp_embedding = self.similarity_model.encode(compressed)
-
-            # Compute cosine similarity
-            similarity = cosine_similarity([orig_embedding], [comp_embedding])[0][0]
-
-            # Convert to float for JSON serialization
-            similarity = float(similarity)
-
-            # Check against threshold
-            passed = similarity >= self.semantic_similarity_threshold
-
-            # Generate message
-            if passed:
-                message = f"Semantic similarity: {similarity:.3f}"
-            else:
-                message = f"Semantic similarity: {similarity:.3f} - meaning significantly changed"
+    def _semantic_similarity_many(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        check_semantic_similarity for many pairs, with every distinct chunk embedded in one batch.
 
-            return {
-                "passed": passed,
-                "similarity_score": similarity,
-                "threshold": self.semantic_similarity_threshold,
-                "message": message
-            }
+        If the batch fails, each pair is checked on its own, so one bad text
+        only fails its own pair.
+        """
+        try:
+            results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+            chunked: Dict[str, Tuple[List[str], List[int]]] = {}
+            for i, (original, compressed) in enumerate(pairs):
+                # Handle edge cases
+                if not original.strip() or not compressed.strip():
+                    results[i] = {
+                        "passed": False,
+                        "similarity_score": 0.0,
+                        "threshold": self.semantic_similarity_threshold,
+                        "message": "Cannot compare empty text"
+                    }
+                elif original.strip() == compressed.strip():
+                    results[i] = {
+                        "passed": True,
+                        "similarity_score": 1.0,
+                        "threshold": self.semantic_similarity_threshold,
+                        "message": "Identical text - perfect similarity"
+                    }
+                else:
+                    for text in (original, compressed):
+                        if text not in chunked:
+                            chunked[text] = self._similarity_chunks(text)
+            if not chunked:
+                return results
+
+            # Generate embeddings for every distinct chunk in one batch
+            rows: Dict[str, int] = {}
+            for chunks, _ in chunked.values():
+                for chunk in chunks:
+                    rows.setdefault(chunk, len(rows))
+            embeddings = self._embed_chunks(list(rows))
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.where(norms > 0, norms, 1.0)
+
+            for i, (original, compressed) in enumerate(pairs):
+                if results[i] is None:
+                    results[i] = self._similarity_result(embeddings, rows, chunked[original], chunked[compressed])
+            return results
 
         except Exception as e:
+            if len(pairs) > 1:
+                return [self._semantic_similarity_many([pair])[0] for pair in pairs]
             # Handle errors gracefully - assume failure for safety
-            return {
+            return [{
                 "passed": False,
                 "similarity_score": 0.0,
                 "threshold": self.semantic_similarity_threshold,
                 "message": f"Semantic similarity check error: {str(e)}"
-            }
+            }]
+
+    def _similarity_result(self, embeddings: np.ndarray, rows: Dict[str, int],
+                           original: Tuple[List[str], List[int]],
+                           compressed: Tuple[List[str], List[int]]) -> Dict[str, Any]:
+        """Best-match similarity of two chunked texts from normalized chunk embeddings."""
+        original_chunks, original_weights = original
+        compressed_chunks, compressed_weights = compressed
+
+        # Cosine similarity of every original chunk with every compressed chunk
+        matrix = (embeddings[[rows[chunk] for chunk in original_chunks]]
+                  @ embeddings[[rows[chunk] for chunk in compressed_chunks]].T)
+        recall = np.average(matrix.max(axis=1), weights=original_weights)
+        precision = np.average(matrix.max(axis=0), weights=compressed_weights)
+        if len(original_chunks) == len(compressed_chunks) == 1:
+            similarity = matrix[0, 0]
+        elif recall + precision > 0:
+            similarity = 2 * recall * precision / (recall + precision)
+        else:
+            similarity = 0.0
+
+        # Convert to float for JSON serialization
+        similarity = float(similarity)
+
+        # Check against threshold
+        passed = similarity >= self.semantic_similarity_threshold
+
+        # Generate message
+        chunks = f" ({len(original_chunks)} vs {len(compressed_chunks)} chunks)" if matrix.size > 1 else ""
+        if passed:
+            message = f"Semantic similarity: {similarity:.3f}{chunks}"
+        else:
+            message = f"Semantic similarity: {similarity:.3f}{chunks} - meaning significantly changed"
+
+        return {
+            "passed": passed,
+            "similarity_score": similarity,
+            "threshold": self.semantic_similarity_threshold,
+            "chunks": [len(original_chunks), len(compressed_chunks)],
+            "message": message
+        }
+
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """
+        Embed chunks in one batch, reusing vectors from the embedding cache.
+
+        With a cache, only chunks it has never seen are encoded, and every
+        vector goes through its float16 storage, so a score does not depend
+        on whether the original was embedded in this run or an earlier one.
+        """
+        cache = self.embedding_cache
+        if cache is None:
+            return np.asarray(self.similarity_model.encode(
+                chunks, batch_size=self.similarity_batch_size), dtype=np.float64)
+
+        config = f"chunk_tokens={self.similarity_chunk_tokens}"
+        keys = [embedding_key(chunk, self.similarity_model_name, config) for chunk in chunks]
+        vectors = [cache.get(key) for key in keys]
+
+        missing = {keys[i]: chunks[i] for i, vector in enumerate(vectors) if vector is None}
+        if missing:
+            encoded = self.similarity_model.encode(list(missing.values()), batch_size=self.similarity_batch_size)
+            fresh = dict(zip(missing, np.asarray(encoded, dtype=np.float16)))
+            for key, vector in fresh.items():
+                cache.put(key, vector)
+            cache.save()
+            vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+        return np.asarray(vectors, dtype=np.float64)
+
+    def _similarity_chunks(self, text: str) -> Tuple[List[str], List[int]]:
+        """
+        Split text into chunks of at most similarity_chunk_tokens for embedding.
+
+        Headings start a new chunk; paragraphs (blank-line separated, code
+        fences kept whole) are packed into chunks, and a paragraph too long
+        for one chunk is split between sentences (and within over-long
+        sentences). Returns the chunks and their token counts.
+        """
+        budget = self.similarity_chunk_tokens
+        total = self.token_cache.count(text)
+        if total <= budget:
+            return [text], [total]
+
+        # Paragraphs, each flagged if it starts a section
+        lines = text.split('\n')
+        paragraphs: List[Tuple[bool, List[str]]] = []
+        for line, line_type in zip(lines, classify_lines(lines)):
+            if line_type == BLANK:
+                if paragraphs and paragraphs[-1][1]:
+                    paragraphs.append((False, []))
+            elif line_type == HEADING or not paragraphs:
+                paragraphs.append((line_type == HEADING, [line]))
+            else:
+                paragraphs[-1][1].append(line)
+
+        chunks: List[str] = []
+        weights: List[int] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        def flush():
+            nonlocal current, current_tokens
+            if current:
+                chunks.append('\n\n'.join(current))
+                weights.append(current_tokens)
+            current, current_tokens = [], 0
+
+        for starts_section, paragraph_lines in paragraphs:
+            if not paragraph_lines:
+                continue
+            paragraph = '\n'.join(paragraph_lines)
+            tokens = self.token_cache.count(paragraph)
+            if starts_section or current_tokens + tokens > budget:
+                flush()
+            if tokens <= budget:
+                current.append(paragraph)
+                current_tokens += tokens
+                continue
+
+            # Oversized paragraph: pack its sentences instead, cutting any
+            # sentence that is itself too long into budget-sized token runs
+            for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+                if not sentence.strip():
+                    continue
+                token_ids = self.token_cache.encode(sentence)
+                for start in range(0, len(token_ids), budget):
+                    piece = token_ids[start:start + budget]
+                    if current_tokens + len(piece) > budget:
+                        flush()
+                    current.append(sentence if len(token_ids) <= budget else self.tokenizer.decode(piece))
+                    current_tokens += len(piece)
+        flush()
+
+        return chunks, weights
 
     def _generate_summary(self, checks: Dict[str, Dict], failures: List[Dict]) -> str:
         """
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Persistent per-section compression cache (incremental recompression).
+
+Each section is keyed by a SHA-256 of its exact text, the compression
+pipeline, and the fingerprint of the tool's rule tables. Entries store the
+compressed section and its safety result, so re-running compression on an
+edited document only recomputes sections whose text (or the rules) changed.
+
+The cache is a single JSON file; writes go to a temporary file first and are
+renamed into place so an interrupted run never leaves it half written.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class CachedSection:
+    """Compression outcome for one section."""
+    compressed: str                        # Section text to emit (original if not compressed)
+    techniques: List[str] = field(default_factory=list)
+    safety: Optional[Dict] = None          # passed / warnings / failure_reason, None if not checked
+    title: str = ''
+
+
+def section_key(text: str, pipeline: str, rules_version: str) -> str:
+    """Stable cache key for a section's text under a given tool configuration."""
+    digest = hashlib.sha256()
+    for part in (str(CACHE_FORMAT_VERSION), rules_version, pipeline, text):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class SectionCache:
+    """JSON-backed map of section key -> CachedSection."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get('version') == CACHE_FORMAT_VERSION:
+                    self._entries = data.get('sections', {})
+            except (json.JSONDecodeError, AttributeError):
+                # A corrupt cache is only a missed optimisation
+                self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedSection]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedSection(**entry)
+
+    def put(self, key: str, section: CachedSection) -> None:
+        self._entries[key] = asdict(section)
+        self._dirty = True
+
+    def prune(self, keep: List[str]) -> None:
+        """Drop entries not used by the latest run, keeping the file bounded."""
+        keep_set = set(keep)
+        stale = [key for key in self._entries if key not in keep_set]
+        for key in stale:
+            del self._entries[key]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({'version': CACHE_FORMAT_VERSION, 'sections': self._entries},
+                             ensure_ascii=False)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._dirty = False
@@ -37,6 +37,7 @@ except ImportError:
 sys.path.append(str(Path(__file__).parent.parent))
 try:
     from compress import CompressionTool, LSCTechniques
+    from scripts.tokenizer_service import shared_tokenizer
 except ImportError as e:
     logger.error(f"Error importing compression tool: {e}")
     logger.error("Ensure compress.py is available in the project root")
@@ -50,8 +51,9 @@ class ConvergenceTester:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
-        # Initialize tiktoken encoder
-        self.encoder = tiktoken.encoding_for_model("gpt-4")
+        # Initialize tiktoken encoder (shared, cached token counts)
+        self.token_cache = shared_tokenizer()
+        self.encoder = self.token_cache.encoding
         
         # Initialize compression components
         self.compression_tool = CompressionTool()
@@ -140,7 +142,7 @@ class ConvergenceTester:
             raise FileNotFoundError(f"Test document not found: {doc_path}")
             
         original_text = doc_path.read_text(encoding='utf-8')
-        original_tokens = len(self.encoder.encode(original_text))
+        original_tokens = self.token_cache.count(original_text)
         
         trajectory = {
             "document": doc_path.name,
@@ -163,9 +165,9 @@ class ConvergenceTester:
                     compressed = self.compress_single_technique(current_text, technique, safety)
                 
                 # Measure results
-                tokens = len(self.encoder.encode(compressed))
+                tokens = self.token_cache.count(compressed)
                 content_hash = hash(compressed)
-                current_tokens = len(self.encoder.encode(current_text))
+                current_tokens = self.token_cache.count(current_text)
                 
                 round_data = {
                     "round": round_num,
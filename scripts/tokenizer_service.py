@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Process-wide token count cache.
+
+The scorer, analyzer, safety validator, drift detector and validation report
+all tokenize the same documents and sections. shared_tokenizer() hands every
+component one TokenizerService per encoding, which caches encodings by a hash
+of the text in a bounded LRU, evicting by approximate memory use.
+"""
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List
+
+import tiktoken
+
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Cache bounds: memory held by cached token arrays, and number of entries
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Approximate per-entry cost beyond the token array (key, dict slot, array header)
+_ENTRY_OVERHEAD = 160
+
+
+class TokenizerService:
+    """tiktoken encoding with a content-addressed LRU cache of token arrays"""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[bytes, array]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def encode(self, text: str) -> List[int]:
+        """Token ids for text (a fresh list, safe for the caller to modify)."""
+        return self._tokens(text).tolist()
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        return len(self._tokens(text))
+
+    def encode_batch(self, texts: List[str], num_threads: int = 8) -> List[List[int]]:
+        """Token ids for many texts; cache misses are encoded together on tiktoken's thread pool."""
+        keys = [self._key(text) for text in texts]
+        found: Dict[bytes, array] = {}
+        with self._lock:
+            for key in keys:
+                tokens = self._entries.get(key)
+                if tokens is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = tokens
+
+        pending = {}  # Distinct missing texts, by key
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        if pending:
+            encoded = self.encoding.encode_batch(list(pending.values()), num_threads=num_threads)
+            for key, tokens in zip(pending, encoded):
+                found[key] = self._store(key, array('I', tokens))
+
+        with self._lock:
+            self.misses += len(pending)
+            self.hits += len(keys) - len(pending)
+        return [found[key].tolist() for key in keys]
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _tokens(self, text: str) -> array:
+        key = self._key(text)
+
+        with self._lock:
+            tokens = self._entries.get(key)
+            if tokens is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return tokens
+            self.misses += 1
+
+        # Encode outside the lock so threads tokenizing different texts do not wait
+        return self._store(key, array('I', self.encoding.encode(text)))
+
+    def _store(self, key: bytes, tokens: array) -> array:
+        size = _ENTRY_OVERHEAD + tokens.itemsize * len(tokens)
+        if size > self.max_bytes:
+            return tokens  # Too large to cache without evicting everything else
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = tokens
+                self._bytes += size
+                while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= _ENTRY_OVERHEAD + evicted.itemsize * len(evicted)
+                    self.evictions += 1
+        return tokens
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_services: Dict[str, TokenizerService] = {}
+_services_lock = threading.Lock()
+
+
+def shared_tokenizer(encoding_name: str = DEFAULT_ENCODING) -> TokenizerService:
+    """The process-wide TokenizerService for an encoding."""
+    with _services_lock:
+        service = _services.get(encoding_name)
+        if service is None:
+            service = _services[encoding_name] = TokenizerService(encoding_name)
+        return service
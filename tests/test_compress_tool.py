@@ -14,15 +14,21 @@ Tests are designed to initially fail (red phase) until implementation is complet
 """
 
 import pytest
+import io
+import json
 import os
 import subprocess
+import sys
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 # Import the actual implementation classes (green phase)
 from compress import CompressionTool, LSCTechniques, ValidationReport
 from compress import AnalysisResult, ValidationResult
+from compress import expand_inputs, run_batch, DaemonClient, _daemon_dispatch
+from scripts.compression_daemon import daemon_running, send_request, serve
 
 
 def run_cli(command: str):
@@ -177,6 +183,24 @@ Our platform provides three main features. First, user authentication which hand
         finally:
             os.unlink(list_file)
 
+    def test_sections_and_document_scored_once(self):
+        """analyze and compress score each section and the document exactly once"""
+        tool = CompressionTool()
+        fixture_path = Path(__file__).parent / "fixtures" / "mixed_state.md"
+        calls = []
+        calculate_metrics = tool.scorer._calculate_metrics
+        with patch.object(tool.scorer, '_calculate_metrics',
+                          side_effect=lambda text, *a: calls.append(text) or calculate_metrics(text, *a)):
+            result = tool.analyze_document(str(fixture_path))
+            assert len(calls) == len(set(calls)) == len(result.sections) + 1
+
+            calls.clear()
+            tool.compress_file(str(fixture_path))
+            assert len(calls) == len(set(calls)) == len(result.sections) + 1
+
+        # Sections are scored by the real scorer, not the fallback heuristic
+        assert 'error' not in tool.analyzer.analyze_section("Some prose here.")['metrics']
+
 
 class TestLSCTechniques:
     """Test individual compression technique application (10 tests)"""
@@ -296,6 +320,412 @@ This table shows the HTTP methods."""
         assert "##" in result or "- " in result, \
             f"Expected hierarchical structure (headers or lists) in result, got: {result}"
 
+    def test_span_table_round_trip(self):
+        """Protected spans are found once and restored verbatim"""
+        lsc = LSCTechniques()
+        original = """Intro with `inline code` and a [link](https://example.com).
+
+```python
+config = load_configuration()
+```
+
+| Name | Value |
+|------|-------|
+
+<!-- production note -->
+![Diagram](./diagram.png) shows the authentication flow."""
+
+        table = lsc.protect(original)
+        assert len(table.spans) == 7, f"Expected 7 protected spans, got {table.spans}"
+        assert "```" not in table.text and "`inline code`" not in table.text
+        assert "![Diagram](./diagram.png)" in table.spans, \
+            f"Expected image kept whole (with '!'), got spans: {table.spans}"
+        assert table.restore(table.text) == original
+
+    def test_apply_techniques_shares_span_table(self):
+        """Chained techniques protect once and restore once"""
+        lsc = LSCTechniques()
+        original = """The production configuration uses authentication.
+
+```bash
+export ENVIRONMENT=production  # configuration
+```
+
+See [authentication docs](https://example.com/authentication) for the development environment."""
+
+        result = lsc.apply_techniques(original, ['technical_shorthand', 'information_density'])
+        assert "export ENVIRONMENT=production  # configuration" in result, \
+            f"Expected code block untouched, got: {result}"
+        assert "[authentication docs](https://example.com/authentication)" in result, \
+            f"Expected link untouched, got: {result}"
+        assert "__PRESERVE_" not in result, f"Placeholder leaked into output: {result}"
+        assert "prod config" in result, f"Expected prose abbreviated, got: {result}"
+
+    def test_placeholder_shaped_source_text_is_kept(self):
+        """Literal placeholder text in the source survives protect and restore"""
+        lsc = LSCTechniques()
+        for original in ["Token __PRESERVE_99__ and `code` in production.",
+                         "Token __PRESERVE_0__ and `code` in production."]:
+            result = lsc.apply_techniques(original, ['technical_shorthand'])
+            assert result == original.replace("production", "prod"), f"Got: {result}"
+
+        table = lsc.protect("plain text")
+        assert table.restore("kept __PRESERVE_7__") == "kept __PRESERVE_7__"
+
+    def test_nested_spans_restored_verbatim(self):
+        """Placeholder text inside spans, and spans inside table rows, come back unchanged"""
+        lsc = LSCTechniques()
+        code = "```text\n__PRESERVE_1__ in the production configuration\n```"
+        row = "| Setting | See [configuration docs](https://example.com/configuration) and `env` |"
+        original = f"""The production configuration uses `__PRESERVE_0__` for authentication.
+
+{code}
+
+{row}
+|---|---|"""
+
+        table = lsc.protect(original)
+        assert table.spans[:3] == ["`__PRESERVE_0__`", code, row], \
+            f"Expected each outermost span kept whole, got: {table.spans}"
+
+        result = lsc.apply_techniques(original, ['technical_shorthand'])
+        assert result == original.replace("The production configuration uses", "The prod config uses") \
+                                 .replace("for authentication.", "for auth."), f"Got: {result}"
+
+    def test_apply_protected_unknown_technique(self):
+        """Unknown technique names are rejected"""
+        lsc = LSCTechniques()
+        with pytest.raises(ValueError):
+            lsc.apply_protected('not_a_technique', 'text')
+
+    def test_apply_to_blocks_only_rewrites_prose(self):
+        """AST pipeline leaves headings, code and tables byte-identical"""
+        from scripts.markdown_blocks import parse_blocks, render_blocks
+        lsc = LSCTechniques()
+        original = """# Production Configuration
+
+The production configuration uses authentication.
+
+```bash
+export ENVIRONMENT=production  # configuration
+```
+
+| Setting | Environment |
+|---------|-------------|
+| debug   | development |
+"""
+        blocks = lsc.apply_to_blocks(parse_blocks(original),
+                                     ['technical_shorthand', 'information_density'])
+        result = render_blocks(blocks)
+
+        assert result.startswith("# Production Configuration\n\n"), \
+            f"Expected heading untouched, got: {result}"
+        assert "export ENVIRONMENT=production  # configuration" in result
+        assert "| debug   | development |" in result, f"Expected table untouched, got: {result}"
+        assert "prod config uses auth." in result, f"Expected prose abbreviated, got: {result}"
+
+    def test_apply_to_blocks_removes_redundancy_across_paragraphs(self):
+        """Repeated sentences are dropped document-wide, keeping paragraphs"""
+        from scripts.markdown_blocks import parse_blocks, render_blocks
+        lsc = LSCTechniques()
+        original = """Tokens are validated on every request. Keys rotate daily.
+
+Tokens are validated on every request.
+
+Sessions expire after one hour.
+"""
+        result = render_blocks(lsc.apply_to_blocks(parse_blocks(original), ['remove_redundancy']))
+        assert result == ("Tokens are validated on every request. Keys rotate daily.\n\n"
+                          "Sessions expire after one hour.\n"), f"Unexpected result: {result!r}"
+
+
+class TestSectionParallelCompression:
+    """Test cases for compressing sections in a process pool"""
+
+    DOCUMENT = """# Guide
+
+## Setup
+
+The production configuration uses authentication.
+
+## Reference
+
+The production configuration uses authentication.
+
+```python
+# configuration comment that looks like a header
+print("production configuration")
+```
+
+## Notes
+
+The development environment is documented elsewhere."""
+
+    def _sections(self, flagged):
+        tool = CompressionTool()
+        sections = tool.analyzer.split_into_sections(self.DOCUMENT)
+        for section in sections:
+            section['needs_compression'] = flagged is None or section['title'] in flagged
+        return tool, sections
+
+    def test_only_flagged_sections_compressed(self):
+        """Sections not flagged needs_compression pass through untouched"""
+        tool, sections = self._sections({'Setup'})
+        result = tool.compress_sections(self.DOCUMENT, sections, ['technical_shorthand'], workers=2)
+
+        assert "## Setup\n\nThe prod config uses auth.\n" in result, f"Unexpected result: {result}"
+        assert "## Reference\n\nThe production configuration uses authentication." in result
+        assert "The development environment is documented elsewhere." in result
+
+    def test_parallel_matches_serial(self):
+        tool, sections = self._sections(None)
+        techniques = ['technical_shorthand', 'information_density']
+        serial = tool.compress_sections(self.DOCUMENT, sections, techniques, workers=1)
+        parallel = tool.compress_sections(self.DOCUMENT, sections, techniques, workers=4)
+        assert serial == parallel
+
+    def test_fenced_code_never_split(self):
+        """A header-like line inside a fence does not start a new section"""
+        tool, sections = self._sections(None)
+        result = tool.compress_sections(self.DOCUMENT, sections, ['technical_shorthand'], workers=2)
+        assert '# configuration comment that looks like a header\nprint("production configuration")' in result, \
+            f"Expected code block untouched, got: {result}"
+        assert result.startswith("# Guide\n\n## Setup\n\n"), f"Headers should be kept: {result}"
+
+
+class TestStreamingCompression:
+    """Test cases for block-by-block streaming compression"""
+
+    DOCUMENT = (
+        "# Guide\n\n"
+        "The production configuration uses authentication.\n\n"
+        "```python\n" + "config = 'production configuration'\n" * 40 + "```\n\n"
+        "| Setting | Value |\n|---------|-------|\n| environment | production |\n\n"
+        "The development environment uses authentication too.\n"
+    )
+
+    def test_stream_matches_block_pipeline(self, tmp_path):
+        """Streaming in tiny pieces gives the same output as the in-memory ast pipeline"""
+        source = tmp_path / "doc.md"
+        source.write_text(self.DOCUMENT, encoding='utf-8')
+        output = tmp_path / "doc_compressed.md"
+        techniques = ['technical_shorthand', 'remove_redundancy']
+
+        tool = CompressionTool()
+        stats = tool.compress_stream(str(source), str(output), techniques, max_block_chars=64)
+
+        expected = tool.lsc.apply_pipeline(self.DOCUMENT, techniques, 'ast')
+        assert output.read_text(encoding='utf-8') == expected
+        assert "config = 'production configuration'\n" * 40 in expected
+        assert "| environment | production |" in expected
+        assert stats['input_chars'] == len(self.DOCUMENT)
+        assert stats['output_chars'] == len(expected)
+
+    def test_stream_in_place(self, tmp_path):
+        source = tmp_path / "doc.md"
+        source.write_text(self.DOCUMENT, encoding='utf-8')
+
+        CompressionTool().compress_stream(str(source), str(source), ['technical_shorthand'])
+
+        assert "The prod config uses auth." in source.read_text(encoding='utf-8')
+        assert list(tmp_path.iterdir()) == [source]
+
+
+class TestBatchProcessing:
+    """Test cases for analyze-dir / compress-dir"""
+
+    VERBOSE = """# API Guide
+
+When you are making requests to the API, you need to include the authentication header in every single request.
+The Application Programming Interface (API) uses JavaScript Object Notation (JSON) for all request and response bodies.
+It is important to understand that the production configuration differs from the development environment configuration.
+"""
+
+    def _tree(self, tmp_path):
+        docs = tmp_path / "docs"
+        (docs / "sub").mkdir(parents=True)
+        (docs / "a.md").write_text(self.VERBOSE, encoding='utf-8')
+        (docs / "sub" / "b.md").write_text(self.VERBOSE, encoding='utf-8')
+        (docs / "notes.txt").write_text("not markdown", encoding='utf-8')
+        return docs
+
+    def test_expand_inputs(self, tmp_path):
+        docs = self._tree(tmp_path)
+        file_list = tmp_path / "files.txt"
+        file_list.write_text(f"{docs / 'a.md'}\n\n{docs / 'notes.txt'}\n", encoding='utf-8')
+
+        paths = expand_inputs([str(docs), str(docs / "*.md")], str(file_list))
+
+        assert paths == [str(docs / "a.md"), str(docs / "sub" / "b.md"), str(docs / "notes.txt")]
+
+    def test_summary_line_per_file(self, tmp_path):
+        docs = self._tree(tmp_path)
+        paths = [str(docs / "a.md"), str(docs / "missing.md"), str(docs / "sub" / "b.md")]
+        summary = io.StringIO()
+
+        counts = run_batch('analyze', paths, summary, workers=1)
+
+        lines = [json.loads(line) for line in summary.getvalue().splitlines()]
+        assert [line['file'] for line in lines] == paths
+        assert lines[1]['status'] == 'error'
+        assert lines[0]['status'] == 'analyzed' and 'compression_score' in lines[0]
+        assert counts == {'analyzed': 2, 'error': 1}
+
+    def test_compress_dir_mirrors_tree_in_pool(self, tmp_path):
+        docs = self._tree(tmp_path)
+        out = tmp_path / "out"
+        summary = io.StringIO()
+
+        run_batch('compress', expand_inputs([str(docs)]), summary, workers=2, force=True,
+                  output_dir=str(out))
+
+        lines = [json.loads(line) for line in summary.getvalue().splitlines()]
+        assert [line['status'] for line in lines] == ['compressed', 'compressed']
+        assert (out / "a.md").exists() and (out / "sub" / "b.md").exists()
+        assert (out / "a.md").read_text(encoding='utf-8') == (out / "sub" / "b.md").read_text(encoding='utf-8')
+
+    def test_stdout_summary_is_valid_jsonl(self, tmp_path, capfd):
+        docs = self._tree(tmp_path)
+        paths = expand_inputs([str(docs)])
+
+        # Fresh pool workers load their models while writing to the same stdout
+        run_batch('compress', paths, sys.stdout, workers=2, output_dir=str(tmp_path / "out"))
+        run_batch('analyze', paths, sys.stdout, workers=2)
+
+        lines = capfd.readouterr().out.splitlines()
+        assert len(lines) == 2 * len(paths)
+        for line in lines:
+            json.loads(line)
+
+    @pytest.mark.parametrize("output_dir", [None, "docs/out"])
+    def test_rerun_skips_own_outputs(self, tmp_path, output_dir):
+        docs = self._tree(tmp_path)
+        out = str(tmp_path / output_dir) if output_dir else None
+
+        for _ in range(2):
+            paths = expand_inputs([str(docs)], skip_outputs=True, output_dir=out)
+            assert paths == [str(docs / "a.md"), str(docs / "sub" / "b.md")]
+            run_batch('compress', paths, io.StringIO(), workers=1, force=True, output_dir=out)
+
+        written = sorted(str(p.relative_to(docs)) for p in docs.rglob("*.md"))
+        if output_dir:
+            assert written == ["a.md", "out/a.md", "out/sub/b.md", "sub/b.md"]
+        else:
+            assert written == ["a.md", "a_compressed.md", "sub/b.md", "sub/b_compressed.md"]
+
+
+class TestDaemonClient:
+    """Test cases for running CLI calls through a resident daemon"""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        socket_path = str(tmp_path / "compress.sock")
+        thread = threading.Thread(target=serve, args=(_daemon_dispatch(CompressionTool()), socket_path),
+                                  daemon=True)
+        thread.start()
+        for _ in range(100):
+            if daemon_running(socket_path):
+                break
+            threading.Event().wait(0.02)
+        yield DaemonClient(socket_path)
+        send_request('shutdown', socket_path=socket_path)
+        thread.join(timeout=5)
+
+    def test_results_match_local_tool(self, client):
+        file_path = Path(__file__).parent / "fixtures" / "verbose_api_doc.md"
+        tool = CompressionTool()
+
+        remote = client.analyze_document(str(file_path))
+        local = tool.analyze_document(str(file_path))
+        assert isinstance(remote, AnalysisResult)
+        assert remote.recommended_techniques == local.recommended_techniques
+        assert remote.compression_score == local.compression_score
+
+        compressed = client.compress_file(str(file_path))
+        assert compressed == tool.compress_file(str(file_path))
+
+        original = file_path.read_text(encoding='utf-8')
+        safety = client.compress_with_safety(original, compressed)
+        assert isinstance(safety, ValidationResult)
+        assert safety.passed == tool.compress_with_safety(original, compressed).passed
+
+        report = client.validate_compression(original, compressed)
+        assert report.compressed_tokens == tool.validate_compression(original, compressed).compressed_tokens
+        assert "Compression Validation Report" in report.to_markdown()
+
+    def test_missing_file_raises_file_not_found(self, client, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            client.analyze_document(str(tmp_path / "missing.md"))
+
+
+class TestIncrementalCompression:
+    """Test cases for section-level caching between runs"""
+
+    def _run(self, tool, doc_path, cache_path, **kwargs):
+        passed = ValidationResult(passed=True, warnings=[], failure_reason="",
+                                  safety_details={}, validation_time=0.0)
+        with patch.object(tool, 'compress_with_safety', return_value=passed) as safety:
+            compressed, stats = tool.compress_incremental(str(doc_path), str(cache_path), **kwargs)
+        return compressed, stats, safety.call_count
+
+    def test_unchanged_document_reuses_every_section(self, tmp_path):
+        tool = CompressionTool()
+        doc_path = tmp_path / "doc.md"
+        doc_path.write_text((Path(__file__).parent / "fixtures" / "verbose_api_doc.md").read_text())
+        cache_path = tmp_path / "cache.json"
+
+        first, stats, checks = self._run(tool, doc_path, cache_path)
+        assert stats['recomputed'] > 0 and checks == stats['recomputed']
+
+        second, stats, checks = self._run(tool, doc_path, cache_path)
+        assert second == first
+        assert stats['recomputed'] == 0 and checks == 0
+        assert stats['reused'] == stats['sections']
+
+    def test_only_changed_section_recomputed(self, tmp_path):
+        tool = CompressionTool()
+        original = (Path(__file__).parent / "fixtures" / "verbose_api_doc.md").read_text()
+        doc_path = tmp_path / "doc.md"
+        doc_path.write_text(original)
+        cache_path = tmp_path / "cache.json"
+        self._run(tool, doc_path, cache_path)
+
+        doc_path.write_text(original.replace("exclusively", "exclusively and only"))
+        _, stats, checks = self._run(tool, doc_path, cache_path)
+        assert stats['recomputed'] == 1 and checks == 1
+
+    def test_dry_run_leaves_cache_untouched(self, tmp_path):
+        tool = CompressionTool()
+        original = (Path(__file__).parent / "fixtures" / "verbose_api_doc.md").read_text()
+        doc_path = tmp_path / "doc.md"
+        doc_path.write_text(original)
+        cache_path = tmp_path / "cache.json"
+
+        self._run(tool, doc_path, tmp_path / "never.json", dry_run=True)
+        assert not (tmp_path / "never.json").exists()
+
+        self._run(tool, doc_path, cache_path)
+        before = (cache_path.stat().st_mtime_ns, cache_path.read_bytes())
+        doc_path.write_text(original.replace("exclusively", "exclusively and only"))
+        _, stats, _ = self._run(tool, doc_path, cache_path, dry_run=True)
+        assert stats['recomputed'] == 1
+        assert (cache_path.stat().st_mtime_ns, cache_path.read_bytes()) == before
+
+        # The next real run still sees the change
+        _, stats, _ = self._run(tool, doc_path, cache_path)
+        assert stats['recomputed'] == 1
+
+    def test_output_carries_section_baselines(self, tmp_path):
+        tool = CompressionTool()
+        doc_path = tmp_path / "doc.md"
+        doc_path.write_text((Path(__file__).parent / "fixtures" / "verbose_api_doc.md").read_text())
+        compressed, _, _ = self._run(tool, doc_path, tmp_path / "cache.json")
+
+        out_path = tmp_path / "out.md"
+        out_path.write_text(compressed)
+        assert tool.drift_detector.check_drift(str(out_path))['recommendation'] == "none"
+        assert all(r['has_header'] for r in tool.drift_detector.check_section_drift(str(out_path)))
+
 
 class TestSafetyIntegration:
     """Test safety validation integration (6 tests)"""
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test suite for the compression daemon transport.
+"""
+import os
+import stat
+import tempfile
+import threading
+
+import pytest
+
+from scripts.compression_daemon import (SOCKET_ENV_VAR, DaemonError, daemon_running, default_socket_path,
+                                        send_request, serve)
+
+
+def echo_dispatch(method, params):
+    if method == 'echo':
+        return params
+    raise FileNotFoundError(f"no such method {method}")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run a daemon in a background thread and stop it after the test"""
+    socket_path = str(tmp_path / "daemon.sock")
+    thread = threading.Thread(target=serve, args=(echo_dispatch, socket_path), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon_running(socket_path):
+            break
+        threading.Event().wait(0.02)
+    yield socket_path
+    if daemon_running(socket_path):
+        send_request('shutdown', socket_path=socket_path)
+    thread.join(timeout=5)
+
+
+class TestCompressionDaemon:
+    """Test cases for the request/response protocol."""
+
+    def test_round_trip(self, daemon):
+        params = {'text': "Unicode ✅ and\nnewlines", 'n': 3}
+        assert send_request('echo', params, socket_path=daemon) == params
+
+    def test_errors_are_reported_with_type(self, daemon):
+        with pytest.raises(DaemonError) as excinfo:
+            send_request('missing', socket_path=daemon)
+        assert excinfo.value.error_type == 'FileNotFoundError'
+        # The daemon survives a failed request
+        assert daemon_running(daemon)
+
+    def test_no_daemon_raises_connection_error(self, tmp_path):
+        with pytest.raises(ConnectionError):
+            send_request('ping', socket_path=str(tmp_path / "absent.sock"))
+        assert daemon_running(str(tmp_path / "absent.sock")) is False
+
+    def test_shutdown_removes_socket(self, daemon, tmp_path):
+        send_request('shutdown', socket_path=daemon)
+        for _ in range(100):
+            if not (tmp_path / "daemon.sock").exists():
+                break
+            threading.Event().wait(0.02)
+        assert not (tmp_path / "daemon.sock").exists()
+
+    def test_refuses_to_replace_running_daemon(self, daemon):
+        with pytest.raises(RuntimeError):
+            serve(echo_dispatch, daemon)
+
+    def test_busy_daemon_still_answers_ping(self, tmp_path):
+        socket_path = str(tmp_path / "busy.sock")
+        release = threading.Event()
+        running = []
+
+        def slow_dispatch(method, params):
+            running.append(method)
+            assert len(running) == 1, "dispatch calls overlapped"
+            release.wait(5)
+            running.pop()
+            return params
+
+        server = threading.Thread(target=serve, args=(slow_dispatch, socket_path), daemon=True)
+        server.start()
+        for _ in range(100):
+            if daemon_running(socket_path):
+                break
+            threading.Event().wait(0.02)
+
+        results = []
+        clients = [threading.Thread(target=lambda n=n: results.append(
+            send_request('echo', {'n': n}, socket_path=socket_path))) for n in range(2)]
+        for client in clients:
+            client.start()
+        threading.Event().wait(0.1)
+
+        # A request is in flight and another queued behind it: the daemon is still there
+        assert daemon_running(socket_path)
+        release.set()
+        for client in clients:
+            client.join(timeout=5)
+        assert sorted(r['n'] for r in results) == [0, 1]
+        send_request('shutdown', socket_path=socket_path)
+        server.join(timeout=5)
+
+    def test_socket_of_another_user_is_not_used(self, daemon, monkeypatch):
+        monkeypatch.setattr(os, 'getuid', lambda: os.geteuid() + 1)
+        with pytest.raises(ConnectionError):
+            send_request('echo', {'text': "private"}, socket_path=daemon)
+        assert daemon_running(daemon) is False
+
+    def test_non_socket_path_is_not_used(self, tmp_path):
+        impostor = tmp_path / "daemon.sock"
+        impostor.write_text("")
+        assert daemon_running(str(impostor)) is False
+
+
+class TestDefaultSocketPath:
+    """Without XDG_RUNTIME_DIR the socket goes in a private per-user directory."""
+
+    @pytest.fixture(autouse=True)
+    def shared_tmp(self, tmp_path, monkeypatch):
+        monkeypatch.delenv(SOCKET_ENV_VAR, raising=False)
+        monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    def test_private_directory_is_created(self, tmp_path):
+        socket_path = default_socket_path()
+        directory = os.path.dirname(socket_path)
+        assert os.path.dirname(directory) == str(tmp_path)
+
+        thread = threading.Thread(target=serve, args=(echo_dispatch, None), daemon=True)
+        thread.start()
+        for _ in range(100):
+            if daemon_running():
+                break
+            threading.Event().wait(0.02)
+        try:
+            assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+            assert send_request('echo', {'n': 1}) == {'n': 1}
+        finally:
+            send_request('shutdown')
+            thread.join(timeout=5)
+
+    def test_shared_directory_is_refused(self):
+        directory = os.path.dirname(default_socket_path())
+        os.mkdir(directory, 0o777)
+        os.chmod(directory, 0o777)
+        with pytest.raises(PermissionError):
+            serve(echo_dispatch)
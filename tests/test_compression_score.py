@@ -1,4 +1,6 @@
 import pytest
+import re
+from collections import Counter
 from pathlib import Path
 from scripts.compression_score import CompressionScorer
 
@@ -233,4 +235,81 @@ class TestMetricCalculations:
         high_entropy_value = result["metrics"]["information_entropy"]
 
         # High entropy should be greater than low entropy
-        assert high_entropy_value > low_entropy_value
\ No newline at end of file
+        assert high_entropy_value > low_entropy_value
+
+    def test_text_is_tokenized_once(self, scorer, test_docs_dir, monkeypatch):
+        """All token-based metrics come from a single encode call."""
+        text = (test_docs_dir / "verbose_doc.md").read_text()
+        calls = []
+        encode = scorer.encoding.encode
+        monkeypatch.setattr(scorer.encoding, 'encode', lambda s, **kw: calls.append(s) or encode(s, **kw))
+        scorer.token_cache.clear()
+
+        scorer.calculate_score(text)
+        scorer.calculate_score(text)
+
+        assert calls == [text]
+
+    def test_line_token_counts_cover_every_token(self, scorer):
+        text = "# Title\n\nÜnïcode prose line here.\n- item one\n\n\n- item two"
+        tokens = scorer.encoding.encode(text)
+        counts = scorer._line_token_counts(tokens, text.split('\n'))
+
+        assert counts[0].sum() == len(tokens)
+        assert (counts[1] <= counts[0]).all()
+        # A line's tokens are the ones its text encodes to on its own
+        assert counts[1][3] == len(scorer.encoding.encode("- item one"))
+
+    def test_score_text_is_memoized_per_run(self, scorer, test_docs_dir, monkeypatch):
+        text = (test_docs_dir / "moderate_doc.md").read_text()
+        calls = []
+        calculate_metrics = scorer._calculate_metrics
+        monkeypatch.setattr(scorer, '_calculate_metrics', lambda t: calls.append(t) or calculate_metrics(t))
+
+        first = scorer.score_text(text)
+        assert scorer.score_text(text) is first
+        assert len(calls) == 1
+        assert first.compression_score == scorer.calculate_score(text)["overall_score"]
+
+        scorer.clear_memo()
+        scorer.score_text(text)
+        assert len(calls) == 3
+
+    def test_redundancy_matches_phrase_counting(self, scorer, test_docs_dir):
+        """Integer trigram keys give the same score as counting phrase strings."""
+        def phrase_redundancy(text):
+            words = re.findall(r'\b\w+\b', text.lower())
+            if len(words) < 3:
+                return 1.0
+            counts = Counter(' '.join(words[i:i+3]) for i in range(len(words) - 2))
+            repeated = sum(1 for count in counts.values() if count > 1)
+            return max(0.0, 1.0 - repeated / len(counts))
+
+        texts = [path.read_text() for path in sorted(test_docs_dir.glob("*.md"))]
+        texts += ["", "one two", "one two three", "Go go GO go go", "a b c a b c a b d"]
+        for text in texts:
+            assert scorer._calculate_redundancy(text) == phrase_redundancy(text)
+
+
+class TestBatchScoring:
+    """calculate_scores must agree with calculate_score document by document."""
+
+    def test_matches_single_document_scores(self, scorer, test_docs_dir):
+        texts = [path.read_text() for path in sorted(test_docs_dir.glob("*.md"))]
+        texts += ["", "   \n", "- only\n- a list"]
+
+        batch = scorer.calculate_scores(texts)
+
+        assert len(batch["overall_score"]) == len(texts)
+        for i, text in enumerate(texts):
+            single = scorer.calculate_score(text)
+            assert batch["overall_score"][i] == single["overall_score"]
+            assert batch["interpretation"][i] == single["interpretation"]
+            assert bool(batch["safe_to_compress"][i]) == single["safe_to_compress"]
+            for name, value in single["metrics"].items():
+                assert batch["metrics"][name][i] == value, (name, i)
+
+    def test_empty_batch(self, scorer):
+        batch = scorer.calculate_scores([])
+        assert len(batch["overall_score"]) == 0
+        assert batch["interpretation"] == []
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test suite for the persistent embedding cache.
+"""
+import numpy as np
+
+from scripts.embedding_cache import EmbeddingCache, embedding_key
+
+
+def vector(seed, dim=8):
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+class TestEmbeddingKey:
+    """Keys must change with everything that changes the vector."""
+
+    def test_key_changes_with_text_model_and_config(self):
+        base = embedding_key("text", "all-MiniLM-L6-v2", "chunk_tokens=200")
+        assert embedding_key("text", "all-MiniLM-L6-v2", "chunk_tokens=200") == base
+        assert embedding_key("text.", "all-MiniLM-L6-v2", "chunk_tokens=200") != base
+        assert embedding_key("text", "all-mpnet-base-v2", "chunk_tokens=200") != base
+        assert embedding_key("text", "all-MiniLM-L6-v2", "chunk_tokens=100") != base
+
+
+class TestEmbeddingCache:
+    """Test cases for storage, persistence and eviction."""
+
+    def test_round_trip_across_instances(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put(embedding_key("a", "m"), vector(1))
+        cache.put(embedding_key("b", "m"), vector(2))
+        cache.close()
+
+        reloaded = EmbeddingCache(str(tmp_path))
+        assert len(reloaded) == 2
+        np.testing.assert_allclose(reloaded.get(embedding_key("a", "m")), vector(1), rtol=1e-3, atol=1e-3)
+        assert reloaded.get(embedding_key("c", "m")) is None
+        assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+    def test_lru_eviction_keeps_within_budget(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), max_bytes=3 * (8 * 2 + 16))
+        keys = [embedding_key(str(i), "m") for i in range(4)]
+        for i in range(3):
+            cache.put(keys[i], vector(i))
+        cache.get(keys[0])                  # Most recently used now
+        cache.put(keys[3], vector(3))       # Evicts keys[1]
+        cache.save()
+
+        assert cache.evictions == 1
+        assert cache.get(keys[1]) is None
+        for i in (0, 2, 3):
+            np.testing.assert_allclose(cache.get(keys[i]), vector(i), rtol=1e-3, atol=1e-3)
+        assert sum(path.stat().st_size for path in tmp_path.glob("*.*")
+                   if path.suffix != ".json") <= cache.max_bytes
+
+    def test_second_process_reads_without_writing(self, tmp_path):
+        writer = EmbeddingCache(str(tmp_path))
+        writer.put(embedding_key("a", "m"), vector(1))
+        writer.save()
+
+        reader = EmbeddingCache(str(tmp_path))
+        assert reader.writable is False
+        assert reader.get(embedding_key("a", "m")) is not None
+        reader.put(embedding_key("b", "m"), vector(2))
+        assert len(reader) == 1
+
+    def test_rewritten_slot_is_a_miss_for_stale_readers(self, tmp_path):
+        writer = EmbeddingCache(str(tmp_path), max_bytes=8 * 2 + 16)
+        writer.put(embedding_key("a", "m"), vector(1))
+        writer.save()
+        reader = EmbeddingCache(str(tmp_path))
+
+        writer.put(embedding_key("b", "m"), vector(2))   # Reuses a's slot
+        assert reader.get(embedding_key("a", "m")) is None
+
+    def test_corrupt_index_is_ignored(self, tmp_path):
+        (tmp_path / "index.json").write_text("{not json")
+        cache = EmbeddingCache(str(tmp_path))
+        assert len(cache) == 0
+        cache.put(embedding_key("a", "m"), vector(1))
+        assert cache.get(embedding_key("a", "m")) is not None
+
+    def test_dimension_change_resets(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put(embedding_key("a", "m"), vector(1, dim=8))
+        cache.put(embedding_key("b", "m"), vector(2, dim=16))
+        assert len(cache) == 1
+        assert cache.get(embedding_key("b", "m")).shape == (16,)
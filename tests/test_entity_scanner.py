@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test suite for the single-pass technical entity scanner.
+"""
+import re
+
+from scripts.entity_scanner import (ACRONYM, CALL, CAMEL_CASE, CODE, CONSTANT, EXTENSION, PATH,
+                                    PROPER_NOUN, SNAKE_CASE, TECHNICAL_KINDS, URL, line_numbers,
+                                    scan_entities)
+
+
+class TestScanEntities:
+    """Test cases for categories and positions."""
+
+    def test_categories_and_spans(self):
+        text = ("See `user_id` at /api/v1/users or https://example.com, call getUser() "
+                "and set MAX_RETRIES for HTTP in config.json.")
+        entities = scan_entities(text)
+        assert [(e.kind, e.text) for e in entities] == [
+            (PROPER_NOUN, "See"),
+            (CODE, "user_id"),
+            (SNAKE_CASE, "user_id"),
+            (PATH, "/api/v1/users"),
+            (URL, "https://example.com"),
+            (CAMEL_CASE, "getUser"),
+            (CALL, "getUser()"),
+            (CONSTANT, "MAX_RETRIES"),
+            (ACRONYM, "HTTP"),
+            (EXTENSION, ".json"),
+        ]
+        for entity in entities:
+            assert text[entity.start:entity.end] == entity.text
+
+    def test_kinds_filter(self):
+        text = "React calls fetchData() on /items"
+        assert [e.text for e in scan_entities(text, {PATH, CALL})] == ["fetchData()", "/items"]
+
+    def test_words_are_matched_whole(self):
+        text = "HTTPServer v2_API snake_case2 mixedCASE_name ABCDEF"
+        assert [(e.kind, e.text) for e in scan_entities(text)] == [(CONSTANT, "ABCDEF")]
+
+    def test_camel_case_needs_two_letters_after_the_capital(self):
+        text = r"Split on \nA, match a-zA-Z, call getX and getUser"
+        assert [e.text for e in scan_entities(text, {CAMEL_CASE})] == ["getUser"]
+
+    def test_technical_kinds_match_separate_patterns(self):
+        """Outside paths and URLs, one scan finds what the old per-category regexes did."""
+        text = ("The auth_service uses JWT and OAUTH_TOKEN, reads settings.yaml and "
+                "calls parseConfig before the API returns JSON.")
+        patterns = [r'\b[a-z]+_[a-z_]+\b', r'\b[a-z]+[A-Z][a-zA-Z]+\b', r'\b[A-Z]{2,5}\b',
+                    r'\.[a-z]{2,4}\b', r'\b[A-Z][A-Z_]{2,}\b']
+        expected = {match for pattern in patterns for match in re.findall(pattern, text)}
+        assert {e.text for e in scan_entities(text, TECHNICAL_KINDS)} == expected
+
+    def test_words_inside_paths_are_reported(self):
+        text = "Export JSON/CSV, run CI/CD and parsing/ETL, see tests/test_compression_score.py"
+        entities = [(e.kind, e.text) for e in scan_entities(text, TECHNICAL_KINDS)]
+        for acronym in ("JSON", "CSV", "CI", "CD", "ETL"):
+            assert (ACRONYM, acronym) in entities
+        assert (PATH, "/CSV") in entities
+        assert (SNAKE_CASE, "test_compression_score") in entities
+        assert scan_entities("/api/v1/users", TECHNICAL_KINDS) == [scan_entities("/api/v1/users")[0]]
+
+        # Writing "A and B" as "A/B" keeps every acronym
+        expanded = {e.text for e in scan_entities("Export to JSON and CSV, run CI and CD", {ACRONYM})}
+        assert expanded <= {e.text for e in scan_entities("JSON/CSV; CI/CD", {ACRONYM})}
+
+    def test_line_numbers(self):
+        text = "one\ntwo /path\n\nfour"
+        offsets = [e.start for e in scan_entities(text, {PATH})] + [0, len(text) - 1]
+        assert line_numbers(text, offsets) == [2, 1, 4]
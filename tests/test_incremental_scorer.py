@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test suite for incremental scoring of edited documents.
+"""
+import random
+from pathlib import Path
+
+import pytest
+
+from scripts.compression_score import CompressionScorer
+from scripts.incremental_scorer import IncrementalScorer
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return CompressionScorer()
+
+
+def assert_matches_full_score(incremental, scorer):
+    expected = scorer.calculate_score(incremental.text)
+    result = incremental.score()
+    assert result["overall_score"] == pytest.approx(expected["overall_score"], abs=1e-9)
+    assert result["metrics"] == pytest.approx(expected["metrics"], abs=1e-9)
+    assert result["interpretation"] == expected["interpretation"]
+    assert result["safe_to_compress"] == expected["safe_to_compress"]
+
+
+class TestIncrementalScorer:
+    """Test cases for edits against from-scratch scoring."""
+
+    def test_initial_score_matches(self, scorer):
+        for path in sorted(FIXTURES.glob("*.md")):
+            assert_matches_full_score(IncrementalScorer(path.read_text(), scorer), scorer)
+
+    def test_random_edits_match(self, scorer):
+        rng = random.Random(3)
+        documents = [path.read_text() for path in sorted(FIXTURES.glob("*.md"))]
+        pool = [line for document in documents for line in document.split('\n')]
+        pool += ["```", "~~~", "    indented code", "", "- item", " leading space"]
+
+        for document in documents:
+            incremental = IncrementalScorer(document, scorer)
+            lines = document.split('\n')
+            for _ in range(10):
+                start = rng.randint(0, len(lines))
+                end = rng.randint(start, min(len(lines), start + 3))
+                new_lines = [rng.choice(pool) for _ in range(rng.randint(0, 3))]
+                incremental.edit(start, end, new_lines)
+                lines[start:end] = new_lines
+                assert incremental.text == '\n'.join(lines)
+                assert_matches_full_score(incremental, scorer)
+
+    def test_opening_fence_reclassifies_following_lines(self, scorer):
+        incremental = IncrementalScorer("# List\n\n- one\n- two\n- three\n\nEnd.", scorer)
+        assert incremental.score()["metrics"]["list_density"] > 0
+
+        incremental.edit(1, 1, ["```"])
+        assert incremental.score()["metrics"]["list_density"] == 0.0
+        assert_matches_full_score(incremental, scorer)
+
+        incremental.edit(1, 2, [])
+        assert_matches_full_score(incremental, scorer)
+
+    def test_update_with_new_text(self, scorer):
+        text = (FIXTURES / "mixed_state.md").read_text()
+        incremental = IncrementalScorer(text, scorer)
+
+        edited = text.replace("\n", "\nAn inserted sentence that says for example the same thing.\n", 1)
+        incremental.update(edited)
+        assert incremental.text == edited
+        assert_matches_full_score(incremental, scorer)
+
+        assert incremental.update("")["overall_score"] == 0.0
+        assert incremental.text == ""
+
+    def test_invalid_range(self, scorer):
+        incremental = IncrementalScorer("one\ntwo", scorer)
+        with pytest.raises(ValueError):
+            incremental.edit(1, 3, ["x"])
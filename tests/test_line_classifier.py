@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test suite for the one-pass markdown line classifier.
+"""
+from scripts.compression_score import CompressionScorer
+from scripts.line_classifier import (BLANK, CODE, HEADING, LIST, PROSE, TABLE, TEXT,
+                                     classify_lines)
+
+
+class TestClassifyLines:
+    """Test cases for line types."""
+
+    def test_line_types(self):
+        lines = [
+            "# Title",
+            "",
+            "This paragraph line has plenty of words to count as prose.",
+            "- bullet item",
+            "  2. numbered item",
+            "b. lettered item",
+            "| a | b |",
+            "Label:",
+            "key: value pair with several more words here",
+            "**Bold** start is formatting, not prose at all.",
+            "Short line.",
+        ]
+        assert list(classify_lines(lines)) == [
+            HEADING, BLANK, PROSE, LIST, LIST, LIST, TABLE, TEXT, TEXT, TEXT, TEXT,
+        ]
+
+    def test_fenced_code_is_code(self):
+        lines = [
+            "```python",
+            "- not a list item",
+            "This line inside the fence reads like a proper sentence.",
+            "~~~",
+            "# not a heading",
+            "```",
+            "- a list item",
+        ]
+        assert list(classify_lines(lines)) == [CODE, CODE, CODE, CODE, CODE, CODE, LIST]
+
+    def test_closing_fence_must_match_opening(self):
+        lines = ["````", "```", "````", "- item"]
+        assert list(classify_lines(lines)) == [CODE, CODE, CODE, LIST]
+
+    def test_unclosed_fence_runs_to_end(self):
+        assert list(classify_lines(["```", "- item", "Text"])) == [CODE, CODE, CODE]
+
+    def test_code_does_not_count_as_lists_or_prose(self):
+        scorer = CompressionScorer()
+        fenced = "```\n" + "- item one\n- item two\nThis sentence has enough long words to be prose.\n" * 5 + "```"
+        metrics = scorer.calculate_score(fenced)["metrics"]
+        assert metrics["list_density"] == 0.0
+        assert metrics["prose_ratio"] == 0.0
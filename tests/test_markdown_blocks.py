@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test suite for the markdown block tree used by the AST compression pipeline.
+"""
+import io
+
+import pytest
+from pathlib import Path
+
+from scripts.markdown_blocks import Block, iter_blocks, parse_blocks, render_blocks
+
+
+@pytest.fixture
+def fixtures_dir():
+    """Path to test fixtures directory."""
+    return Path(__file__).parent / "fixtures"
+
+
+class TestMarkdownBlocks:
+    """Test cases for parsing and rendering block trees."""
+
+    def test_round_trip_fixtures(self, fixtures_dir):
+        """Rendering an untouched tree reproduces every fixture exactly."""
+        for path in fixtures_dir.rglob("*.md"):
+            text = path.read_text(encoding='utf-8')
+            assert render_blocks(parse_blocks(text)) == text, path.name
+
+    def test_block_kinds(self):
+        text = """# Title
+
+Prose paragraph
+over two lines.
+
+```python
+x = 1
+```
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+- item
+"""
+        kinds = [b.kind for b in parse_blocks(text) if b.kind != 'gap']
+        assert kinds == ['heading', 'paragraph', 'fence', 'table', 'bullet_list']
+
+    def test_only_paragraphs_are_prose(self):
+        blocks = parse_blocks("# Title\n\nSome prose.\n\n    indented code\n")
+        assert [b.text for b in blocks if b.is_prose] == ["Some prose.\n"]
+
+    def test_front_matter_is_not_parsed(self):
+        """YAML front matter would otherwise parse as a setext heading"""
+        text = "---\ncompression:\n  baseline_tokens: 120\n---\n# Title\n\nBody.\n"
+        blocks = parse_blocks(text)
+        assert blocks[0] == Block('front_matter', "---\ncompression:\n  baseline_tokens: 120\n---\n")
+        assert blocks[1].kind == 'heading'
+
+    def test_crlf_line_endings(self):
+        text = "First paragraph\r\n\r\nSecond paragraph\r\n"
+        blocks = parse_blocks(text)
+        assert [b.text for b in blocks if b.is_prose] == ["First paragraph\r\n", "Second paragraph\r\n"]
+        assert render_blocks(blocks) == text
+
+    def test_empty_document(self):
+        assert parse_blocks("") == []
+        assert render_blocks([]) == ""
+
+
+class TestIterBlocks:
+    """Test cases for the streaming block reader."""
+
+    def test_round_trip_fixtures_in_small_pieces(self, fixtures_dir):
+        """Concatenated blocks reproduce the input even when every block is split"""
+        for path in fixtures_dir.rglob("*.md"):
+            text = path.read_text(encoding='utf-8')
+            for max_block_chars in (16, 1 << 20):
+                blocks = list(iter_blocks(io.StringIO(text, newline=''), max_block_chars))
+                assert render_blocks(blocks) == text, path.name
+
+    def test_prose_matches_parse_blocks(self):
+        text = """# Title
+
+Prose paragraph
+over two lines.
+- item one
+- item two
+
+```python
+x = 1
+```
+
+| a | b |
+|---|---|
+
+Closing words.
+"""
+        streamed = [b.text for b in iter_blocks(io.StringIO(text)) if b.is_prose]
+        assert streamed == [b.text for b in parse_blocks(text) if b.is_prose]
+
+    def test_fence_split_across_pieces_stays_verbatim(self):
+        code = ''.join(f"line {i} of code that mentions configuration\n" for i in range(50))
+        text = f"Intro.\n\n```\n{code}```\n\nOutro.\n"
+        blocks = list(iter_blocks(io.StringIO(text), max_block_chars=100))
+
+        fence_pieces = [b for b in blocks if b.kind == 'fence']
+        assert len(fence_pieces) > 1
+        assert ''.join(b.text for b in fence_pieces) == f"```\n{code}```\n"
+        assert [b.text for b in blocks if b.is_prose] == ["Intro.\n", "Outro.\n"]
+
+    def test_front_matter_and_rules(self):
+        text = "---\ntitle: x\n---\nBody.\n\n---\n\nMore.\n"
+        blocks = list(iter_blocks(io.StringIO(text)))
+        assert blocks[0] == Block('front_matter', "---\ntitle: x\n---\n")
+        assert [b.text for b in blocks if b.is_prose] == ["Body.\n", "More.\n"]
+
+    def test_reads_lazily(self):
+        """Blocks are yielded before the rest of the input is read"""
+        def lines():
+            yield "First paragraph.\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+
+        assert next(iter_blocks(lines())) == Block('paragraph', "First paragraph.\n")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test suite for the MinHash/LSH near-duplicate index used by remove_redundancy.
+"""
+import random
+
+import pytest
+
+from scripts.near_duplicates import NearDuplicateIndex, jaccard, word_set
+
+
+def brute_force_keep(sentences, threshold=0.7):
+    """Reference: compare every sentence with every kept sentence."""
+    kept = []
+    for sentence in sentences:
+        words = word_set(sentence)
+        if not any(jaccard(words, word_set(k)) >= threshold for k in kept):
+            kept.append(sentence)
+    return kept
+
+
+@pytest.fixture
+def rng():
+    return random.Random(11)
+
+
+class TestNearDuplicateIndex:
+    """Test cases for near-duplicate lookup."""
+
+    def test_jaccard_matches_word_overlap(self):
+        assert jaccard(word_set("The API uses JWT"), word_set("the api uses jwt")) == 1.0
+        assert jaccard(word_set("a b c d"), word_set("a b c e")) == pytest.approx(0.6)
+        assert jaccard(frozenset(), word_set("a")) == 0.0
+
+    def test_exact_duplicate_detected(self):
+        index = NearDuplicateIndex(exact_below=0)
+        assert index.is_duplicate("Use HTTPS for every request") is False
+        assert index.is_duplicate("use https for every request") is True
+        assert len(index) == 1
+
+    def test_threshold_is_inclusive(self):
+        index = NearDuplicateIndex(threshold=0.7, exact_below=0)
+        index.is_duplicate("one two three four five six seven")
+        # 7 shared of 10 total words: exactly 0.7
+        assert index.is_duplicate("one two three four five six seven x y z") is True
+
+    def test_dissimilar_sentences_kept(self):
+        index = NearDuplicateIndex(exact_below=0)
+        assert index.is_duplicate("Tokens are counted with tiktoken") is False
+        assert index.is_duplicate("Tables are preserved verbatim") is False
+        assert len(index) == 2
+
+    def test_small_documents_match_brute_force(self, rng):
+        vocab = [f"w{i}" for i in range(30)]
+        sentences = [' '.join(rng.choice(vocab) for _ in range(rng.randint(3, 8))) for _ in range(60)]
+        index = NearDuplicateIndex()
+        kept = [s for s in sentences if not index.is_duplicate(s)]
+        assert kept == brute_force_keep(sentences)
+
+    def test_lsh_recall_on_large_documents(self, rng):
+        """LSH candidates find nearly every near-duplicate the quadratic scan finds."""
+        vocab = [f"w{i}" for i in range(300)]
+        sentences = []
+        for _ in range(1500):
+            if sentences and rng.random() < 0.3:
+                words = rng.choice(sentences).split()
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+                sentences.append(' '.join(words))
+            else:
+                sentences.append(' '.join(rng.choice(vocab) for _ in range(rng.randint(6, 14))))
+
+        index = NearDuplicateIndex()
+        kept = [s for s in sentences if not index.is_duplicate(s)]
+        expected = brute_force_keep(sentences)
+
+        assert len(kept) >= len(expected)
+        assert len(kept) - len(expected) <= len(sentences) * 0.005
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test suite for the precompiled substitution rule engine.
+
+Fused application must be byte-identical to applying every rule in order.
+"""
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.rule_engine import Rule, RuleTable
+import compress_v7_hybrid
+from compress4llm import V7Techniques
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+PRODUCTION_TABLES = {
+    'v7_hybrid_abbreviations': compress_v7_hybrid.ABBREVIATION_TABLE,
+    'v7_hybrid_symbols': compress_v7_hybrid.SYMBOL_TABLE,
+    'v7_hybrid_prose': compress_v7_hybrid.PROSE_TABLE,
+    'v7_headers': V7Techniques.HEADERS,
+    'v7_abbreviations': V7Techniques.ABBREVIATIONS,
+    'v7_symbols': V7Techniques.SYMBOLS,
+    'v7_prose_fragments': V7Techniques.PROSE_FRAGMENTS,
+    'v7_table_headers': V7Techniques.TABLE_HEADERS,
+    'v7_scaffolding': V7Techniques.SCAFFOLDING,
+}
+
+try:
+    from compress import LSCTechniques
+    PRODUCTION_TABLES['lsc_technical_shorthand'] = LSCTechniques.TECHNICAL_SHORTHAND
+    PRODUCTION_TABLES['lsc_information_density'] = LSCTechniques.INFORMATION_DENSITY
+except (ImportError, SystemExit):
+    pass  # compress.py needs the full validation stack
+
+
+def adversarial_texts(table: RuleTable, count: int = 300, seed: int = 0):
+    """Random texts built from the table's own patterns and replacements."""
+    rng = random.Random(seed)
+    pieces = [' ', '\n', ',', '.', 'a', '_', '5', 'It ', 'The ']
+    for rule in table.rules:
+        pieces.append(rule.pattern if rule.literal else re.sub(r'\\[bAZ]|[\\^$?*+()\[\]|]', '', rule.pattern))
+        pieces.append(rule.replacement)
+
+    texts = []
+    for _ in range(count):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 12)))
+        texts.append(text.lower() if rng.random() < 0.3 else text)
+    return texts
+
+
+class TestProductionTables:
+    """Every production table must match its sequential reference exactly."""
+
+    @pytest.mark.parametrize("name", sorted(PRODUCTION_TABLES))
+    def test_fixtures_identical(self, name):
+        table = PRODUCTION_TABLES[name]
+        for path in FIXTURES_DIR.glob("*.md"):
+            text = path.read_text(encoding='utf-8')
+            assert table.apply(text) == table.apply_sequential(text), path.name
+
+    @pytest.mark.parametrize("name", sorted(PRODUCTION_TABLES))
+    def test_adversarial_identical(self, name):
+        table = PRODUCTION_TABLES[name]
+        for text in adversarial_texts(table):
+            assert table.apply(text) == table.apply_sequential(text), repr(text)
+
+    def test_tables_are_fused(self):
+        """Plain word tables collapse into far fewer passes than rules"""
+        assert V7Techniques.ABBREVIATIONS.pass_count < len(V7Techniques.ABBREVIATIONS) // 4
+        assert V7Techniques.SYMBOLS.pass_count < len(V7Techniques.SYMBOLS)
+
+
+class TestRuleAnalysis:
+    """Fusion decisions for small hand-written tables."""
+
+    def test_independent_words_fuse(self):
+        table = RuleTable.from_regex({r'\bwith\b': 'w/', r'\bwithout\b': 'w/o'})
+        assert table.pass_count == 1
+        assert table.apply("with or without") == "w/ or w/o"
+
+    def test_overlapping_literals_stay_ordered(self):
+        """'ab' must be replaced before 'bc' gets a chance at 'abc'"""
+        table = RuleTable.from_literals([('ab', 'X'), ('bc', 'Y')])
+        assert table.pass_count == 2
+        assert table.apply("abc") == table.apply_sequential("abc") == "Xc"
+
+    def test_cascading_replacement_stays_ordered(self):
+        """A later rule that matches an earlier replacement must see it"""
+        table = RuleTable.from_literals([('cat', 'dog'), ('dog', 'wolf')])
+        assert table.pass_count == 2
+        assert table.apply("cat") == "wolf"
+
+    def test_deletion_joining_neighbours_stays_ordered(self):
+        table = RuleTable.from_literals([('-', ''), ('ab', 'X')])
+        assert table.pass_count == 2
+        assert table.apply("a-b") == "X"
+
+    def test_word_boundary_change_stays_ordered(self):
+        """Replacing a word with a symbol can create a new word boundary"""
+        table = RuleTable.from_regex([(r'foo', '+'), (r'\bbar', 'X')])
+        assert table.pass_count == 2
+        assert table.apply("foobar") == table.apply_sequential("foobar") == "+X"
+
+    def test_line_start_rules_fuse(self):
+        table = RuleTable.from_regex([(r'^It ', '- '), (r'^This ', '- ')], re.MULTILINE)
+        assert table.pass_count == 1
+        assert table.apply("It works\nThis too") == "- works\n- too"
+
+    def test_line_start_deletion_stays_ordered(self):
+        """Deleting 'It ' moves 'This' to the start of the line"""
+        table = RuleTable.from_regex([(r'^It ', ''), (r'^This ', '')], re.MULTILINE)
+        assert table.pass_count == 2
+        assert table.apply("It This works") == "works"
+
+    def test_open_ended_rules_run_alone(self):
+        table = RuleTable.from_regex([(r'In order to\s+', ''), (r'\bfoo\b', 'f')])
+        assert table.pass_count == 2
+
+    def test_templated_replacement_runs_alone(self):
+        table = RuleTable.from_regex([(r'(\d)\s?lines', r'\1L'), (r'\bfoo\b', 'f')])
+        assert table.pass_count == 2
+        assert table.apply("5 lines of foo") == "5L of f"
+
+    def test_mixed_flags_are_scoped(self):
+        table = RuleTable([Rule(r'\bfoo\b', 'f', re.IGNORECASE), Rule(r'\bbar\b', 'b')])
+        assert table.pass_count == 1
+        assert table.apply("FOO BAR bar") == "f BAR b"
+
+
+class TestRandomTables:
+    """Randomised tables over a tiny alphabet to shake out analysis bugs."""
+
+    def test_random_tables_match_sequential(self):
+        rng = random.Random(7)
+
+        def pattern():
+            core = re.escape(''.join(rng.choice('ab ') for _ in range(rng.randint(1, 3))))
+            if rng.random() < 0.2:
+                core += 'b?'
+            return rng.choice(['', r'\b', '^', r'\A']) + core + rng.choice(['', r'\b', '$', r'\Z'])
+
+        for _ in range(2000):
+            flags = rng.choice([0, re.IGNORECASE, re.MULTILINE])
+            table = RuleTable(
+                Rule(pattern(), rng.choice(['', 'a', 'b', ' ', '\n', 'A']), flags)
+                for _ in range(rng.randint(2, 4))
+            )
+            for _ in range(10):
+                text = ''.join(rng.choice('abAB \n') for _ in range(rng.randint(0, 12)))
+                assert table.apply(text) == table.apply_sequential(text), (table.rules, text)
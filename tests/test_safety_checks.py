@@ -21,6 +21,11 @@ Test Strategy:
 import pytest
 import sys
 import os
+import re
+import time
+import zlib
+
+import numpy as np
 
 # Add scripts directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
@@ -564,6 +569,380 @@ class TestPerformanceRequirements:
         assert validator.nlp is not None
 
 
+class TestLazyModelLoading:
+    """Models load only when the check that needs them runs."""
+
+    @pytest.fixture
+    def validator(self):
+        if SafetyValidator is None:
+            pytest.skip("SafetyValidator not implemented yet (TDD Phase 1)")
+        return SafetyValidator()
+
+    def test_precheck_refusal_loads_no_models(self, validator):
+        compressed_text = """## POST /auth
+- Body: `{username, password}`
+- Returns: `{token}` (200) | `{error}` (401)
+- Auth: None required
+
+## GET /users
+- Auth: Bearer token
+- Returns: User array"""
+
+        result = validator.validate_compression(compressed_text, compressed_text)
+
+        assert result["recommendation"] == "refuse"
+        assert result["model_load_time"] == 0.0
+        assert validator.model_load_times == {}
+
+    def test_token_check_loads_no_models(self, validator):
+        validator.check_minimal_benefit("A long original sentence here.", "Short.")
+        assert validator.model_load_times == {}
+
+    def test_injected_models_are_used(self, validator):
+        sentinel = object()
+        validator.nlp = sentinel
+        assert validator.nlp is sentinel
+        assert "nlp" not in validator.model_load_times
+
+
+class WordHashEmbedder:
+    """Bag-of-words embedding that, like MiniLM, only sees the start of each input"""
+
+    def __init__(self, max_words=100):
+        self.max_words = max_words
+        self.batches = []
+
+    def encode(self, texts, batch_size=32):
+        self.batches.append(list(texts))
+        embeddings = np.zeros((len(texts), 256))
+        for i, text in enumerate(texts):
+            for word in text.lower().split()[:self.max_words]:
+                embeddings[i, zlib.crc32(word.encode()) % 256] += 1
+        return embeddings
+
+
+class TestChunkedSimilarity:
+    """Long texts are compared chunk by chunk in one batched encode."""
+
+    @pytest.fixture
+    def validator(self):
+        if SafetyValidator is None:
+            pytest.skip("SafetyValidator not implemented yet (TDD Phase 1)")
+        validator = SafetyValidator()
+        validator.similarity_model = WordHashEmbedder()
+        return validator
+
+    @staticmethod
+    def document(topics):
+        return "\n\n".join(
+            f"## Section {i}\n\n" + " ".join(f"{topic}{j} {topic}{i}" for j in range(40))
+            for i, topic in enumerate(topics))
+
+    def test_short_texts_are_one_chunk(self, validator):
+        result = validator.check_semantic_similarity("The cat sat on the mat.", "A cat sat on a mat.")
+        assert result["chunks"] == [1, 1]
+        assert len(validator.similarity_model.batches) == 1
+
+    def test_chunks_fit_budget_and_encode_in_one_batch(self, validator):
+        original = self.document(["alpha", "beta", "gamma", "delta"] * 3)
+        compressed = self.document(["alpha", "beta", "gamma", "delta"] * 2)
+
+        result = validator.check_semantic_similarity(original, compressed)
+
+        assert result["chunks"][0] > result["chunks"][1] > 1
+        assert len(validator.similarity_model.batches) == 1
+        chunks, weights = validator._similarity_chunks(original)
+        assert max(weights) <= validator.similarity_chunk_tokens
+        assert len(chunks) == result["chunks"][0]
+
+    def test_changes_past_truncation_are_detected(self, validator):
+        original = self.document(["alpha"] * 2 + ["beta"] * 10)
+        rewritten = self.document(["alpha"] * 2 + ["omega"] * 10)
+
+        # The whole-text embedding only sees the unchanged opening
+        embedder = validator.similarity_model
+        whole = embedder.encode([original, rewritten])
+        assert (whole[0] == whole[1]).all()
+
+        result = validator.check_semantic_similarity(original, rewritten)
+        assert result["passed"] is False
+        assert result["similarity_score"] < 0.5
+
+    def test_embedding_cache_skips_unchanged_text(self, validator, tmp_path):
+        from scripts.embedding_cache import EmbeddingCache
+
+        original = self.document(["alpha", "beta", "gamma"])
+        first = self.document(["alpha", "beta"])
+        second = self.document(["alpha", "omega"])
+        validator.embedding_cache = EmbeddingCache(str(tmp_path))
+        embedder = validator.similarity_model
+
+        validator.check_semantic_similarity(original, first)
+        cached = validator.check_semantic_similarity(original, second)
+
+        # Only the new chunks of the second candidate are encoded
+        original_chunks, _ = validator._similarity_chunks(original)
+        second_chunks, _ = validator._similarity_chunks(second)
+        assert embedder.batches[1] == [c for c in second_chunks if c not in original_chunks]
+
+        # A fresh validator reading the same cache never calls the model
+        validator.embedding_cache.close()
+        fresh = SafetyValidator()
+        fresh.similarity_model = WordHashEmbedder()
+        fresh.embedding_cache = EmbeddingCache(str(tmp_path))
+        assert fresh.check_semantic_similarity(original, second) == cached
+        assert fresh.similarity_model.batches == []
+
+
+class CapitalizedWordNLP:
+    """spaCy stand-in whose entities are capitalized words; rejects texts over max_length"""
+
+    def __init__(self, max_length=1000):
+        self.max_length = max_length
+        self.pipe_calls = []
+
+    def pipe(self, texts, as_tuples=False, batch_size=32):
+        items = list(texts)
+        self.pipe_calls.append(items)
+        for item in items:
+            text, context = item if as_tuples else (item, None)
+            if len(text) > self.max_length:
+                raise ValueError(f"Text of length {len(text)} exceeds maximum of {self.max_length}")
+            ents = [type("Span", (), {"text": word})() for word in re.findall(r'\b[A-Z][a-z]+\b', text)]
+            doc = type("Doc", (), {"ents": ents})()
+            yield (doc, context) if as_tuples else doc
+
+
+class TestBatchedEntityExtraction:
+    """Entity recognition runs over paragraph chunks in one nlp.pipe call."""
+
+    @pytest.fixture
+    def validator(self):
+        if SafetyValidator is None:
+            pytest.skip("SafetyValidator not implemented yet (TDD Phase 1)")
+        validator = SafetyValidator()
+        validator.nlp = CapitalizedWordNLP()
+        validator.ner_chunk_chars = 300
+        return validator
+
+    def test_long_documents_are_chunked_under_max_length(self, validator):
+        names = [f"Name{chr(97 + i % 26)}" for i in range(200)]
+        original = "\n\n".join(f"Paragraph with {name} in it and some filler words." for name in names)
+        original += "\n\n" + " ".join(["Runaway"] + ["word"] * 400)
+
+        result = validator.check_entity_preservation(original, original)
+
+        assert result["passed"] is True
+        assert len(validator.nlp.pipe_calls) == 1
+        chunks = validator._entity_chunks(original)
+        assert len(chunks) > 1
+        assert max(len(chunk) for chunk in chunks) <= validator.ner_chunk_chars
+        assert "runaway" in validator._named_entities([original])[0]
+
+    def test_entities_split_by_text(self, validator):
+        original_entities, compressed_entities = validator._named_entities(
+            ["Alice met Bob in Paris.", "Alice met Bob."])
+        assert original_entities == {"alice", "bob", "paris"}
+        assert compressed_entities == {"alice", "bob"}
+
+        result = validator.check_entity_preservation("Alice met Bob in Paris.", "Alice met Bob.")
+        assert result["lost_entities"] == ["paris"]
+
+    def test_lost_entities_are_located(self, validator):
+        original = "Intro line.\nCall /auth/login first.\nThen Paris and /users."
+        result = validator.check_entity_preservation(original, "Intro line.")
+
+        assert result["lost_entity_lines"] == {"/auth/login": 2, "/users": 3, "call": 2, "paris": 3, "then": 3}
+        assert "/auth/login (line 2)" in result["message"]
+
+
+class TestTieredValidation:
+    """Model-backed checks only run when the cheaper tiers leave the outcome open."""
+
+    ORIGINAL = ("The authentication service exposes the /auth/login and /users endpoints, "
+                "and it uses JWT tokens over HTTPS for every single client request that arrives.")
+
+    @pytest.fixture
+    def validator(self):
+        if SafetyValidator is None:
+            pytest.skip("SafetyValidator not implemented yet (TDD Phase 1)")
+        validator = SafetyValidator()
+        validator.nlp = CapitalizedWordNLP()
+        validator.similarity_model = WordHashEmbedder()
+        return validator
+
+    def models_used(self, validator):
+        return len(validator.nlp.pipe_calls), len(validator.similarity_model.batches)
+
+    def test_ner_tier_refuses_without_embeddings(self, validator):
+        compressed = ("The authentication service exposes the login and user endpoints, "
+                      "and it uses signed tokens over TLS for every single client request that arrives.")
+        result = validator.validate_compression(self.ORIGINAL, compressed)
+
+        assert result["recommendation"] == "refuse"
+        assert result["decided_by"] == "ner"
+        assert [f["check"] for f in result["failures"]] == ["entity_preservation", "minimal_benefit"]
+        assert result["skipped_checks"] == ["semantic_similarity"]
+        assert self.models_used(validator) == (1, 0)
+
+    def test_named_entities_dilute_lost_technical_entities(self, validator):
+        names = " ".join(f"Name{chr(97 + i)}" for i in range(16))
+        original = f"Owners {names} maintain the /api/users and /api/orders endpoints for the team."
+        compressed = f"Owners {names} maintain the endpoints."
+
+        tiered = validator.validate_compression(original, compressed)
+        validator.tiered_validation = False
+        untiered = validator.validate_compression(original, compressed)
+
+        assert tiered["checks"]["entity_preservation"]["passed"] is True
+        assert tiered["recommendation"] == untiered["recommendation"]
+        assert tiered["failures"] == untiered["failures"]
+
+    def test_accept_runs_every_tier(self, validator):
+        compressed = "Authentication service: /auth/login and /users endpoints, JWT tokens over HTTPS."
+        result = validator.validate_compression(self.ORIGINAL, compressed)
+
+        assert result["checks"]["entity_preservation"]["passed"] is True
+        assert result["decided_by"] == "embeddings"
+        assert result["skipped_checks"] == []
+        assert self.models_used(validator) == (1, 1)
+
+    def test_untiered_validation_runs_every_check(self, validator):
+        validator.tiered_validation = False
+        compressed = ("The authentication service exposes the login and user endpoints, "
+                      "and it uses signed tokens over TLS for every single client request that arrives.")
+        result = validator.validate_compression(self.ORIGINAL, compressed)
+
+        assert result["recommendation"] == "refuse"
+        assert result["skipped_checks"] == []
+        assert self.models_used(validator) == (1, 1)
+
+
+class SlowModel:
+    """Wraps a fake model so each call blocks without holding the GIL, like spaCy and torch kernels"""
+
+    def __init__(self, model, seconds):
+        self.model = model
+        self.seconds = seconds
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def pipe(self, *args, **kwargs):
+        time.sleep(self.seconds)
+        return self.model.pipe(*args, **kwargs)
+
+    def encode(self, *args, **kwargs):
+        time.sleep(self.seconds)
+        return self.model.encode(*args, **kwargs)
+
+
+class TestConcurrentChecks:
+    """Model-backed checks can run in a thread pool with serial results."""
+
+    ORIGINAL = TestTieredValidation.ORIGINAL
+    COMPRESSED = "Authentication service: /auth/login and /users endpoints, JWT tokens over HTTPS."
+
+    @pytest.fixture
+    def validator(self):
+        if SafetyValidator is None:
+            pytest.skip("SafetyValidator not implemented yet (TDD Phase 1)")
+        validator = SafetyValidator()
+        validator.nlp = SlowModel(CapitalizedWordNLP(), 0.2)
+        validator.similarity_model = SlowModel(WordHashEmbedder(), 0.2)
+        return validator
+
+    @pytest.mark.parametrize("tiered", [True, False])
+    def test_results_match_serial(self, validator, tiered):
+        validator.tiered_validation = tiered
+        serial = validator.validate_compression(self.ORIGINAL, self.COMPRESSED)
+        validator.concurrent_checks = True
+        concurrent = validator.validate_compression(self.ORIGINAL, self.COMPRESSED)
+
+        assert serial.pop("check_times").keys() == concurrent.pop("check_times").keys()
+        assert concurrent == serial
+
+    def test_check_times_show_overlap(self, validator):
+        validator.concurrent_checks = True
+        start = time.perf_counter()
+        result = validator.validate_compression(self.ORIGINAL, self.COMPRESSED)
+        elapsed = time.perf_counter() - start
+
+        times = result["check_times"]
+        assert set(times) == {"pre_check", "minimal_benefit", "entity_preservation", "semantic_similarity"}
+        assert times["entity_preservation"] >= 0.2 and times["semantic_similarity"] >= 0.2
+        assert sum(times.values()) > elapsed
+
+
+class TestValidateMany:
+    """Bulk validation batches model work across pairs with single-pair results."""
+
+    ORIGINAL = TestTieredValidation.ORIGINAL
+    PAIRS = [
+        # Pre-check refusal
+        ("## POST /auth\n- Body: `{username, password}`\n- Returns: `{token}` (200) | `{error}` (401)",
+         "## POST /auth\n- Body: user/pass"),
+        # Too little benefit and entities lost: NER refuses before embeddings
+        (ORIGINAL, "The authentication service exposes the login and user endpoints, and it uses "
+                   "signed tokens over TLS for every single client request that arrives."),
+        # Entities lost: NER and embeddings
+        (ORIGINAL, "Authentication service: login and user endpoints, signed tokens."),
+        # Too little benefit: NER before embeddings
+        (ORIGINAL, ORIGINAL.replace(" single", "")),
+        # Every check runs (the word-hash similarity only warns)
+        (ORIGINAL, "Authentication service: /auth/login and /users endpoints, JWT tokens over HTTPS."),
+    ]
+
+    @pytest.fixture
+    def validator(self):
+        if SafetyValidator is None:
+            pytest.skip("SafetyValidator not implemented yet (TDD Phase 1)")
+        validator = SafetyValidator()
+        validator.nlp = CapitalizedWordNLP()
+        validator.similarity_model = WordHashEmbedder()
+        return validator
+
+    @pytest.mark.parametrize("tiered", [True, False])
+    @pytest.mark.parametrize("concurrent", [False, True])
+    def test_results_match_single_pair_api(self, validator, tiered, concurrent):
+        validator.tiered_validation = tiered
+        validator.concurrent_checks = concurrent
+        many = validator.validate_many(self.PAIRS)
+        single = [validator.validate_compression(original, compressed) for original, compressed in self.PAIRS]
+
+        assert len(many) == len(self.PAIRS)
+        for bulk, one in zip(many, single):
+            assert bulk.pop("check_times").keys() == one.pop("check_times").keys()
+            assert bulk == one
+        if tiered:
+            assert [result["decided_by"] for result in many] == ["pre_check", "ner", "embeddings",
+                                                                 "embeddings", "embeddings"]
+
+    def test_model_work_is_batched(self, validator):
+        validator.validate_many(self.PAIRS)
+
+        # NER for the four pairs past the pre-check (one shared original), embeddings for three
+        assert len(validator.nlp.pipe_calls) == 1
+        assert len(validator.similarity_model.batches) == 1
+        texts = [text for text, _ in validator.nlp.pipe_calls[0]]
+        assert sorted(texts) == sorted({self.ORIGINAL} | {compressed for _, compressed in self.PAIRS[1:]})
+
+    def test_failing_text_only_fails_its_pair(self, validator):
+        class PoisonEmbedder(WordHashEmbedder):
+            def encode(self, texts, batch_size=32):
+                if any("poison" in text for text in texts):
+                    raise ValueError("cannot embed")
+                return super().encode(texts, batch_size)
+
+        validator.similarity_model = PoisonEmbedder()
+        results = validator.validate_many([self.PAIRS[4], (self.ORIGINAL, self.PAIRS[4][1] + " poison")])
+
+        single = validator.validate_compression(*self.PAIRS[4])
+        assert results[0].pop("check_times").keys() == single.pop("check_times").keys()
+        assert results[0] == single
+        assert "cannot embed" in results[1]["checks"]["semantic_similarity"]["message"]
+
+
 # Test fixtures for different scenarios
 class TestFixtures:
     """Test with predefined document fixtures."""
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test suite for the persistent per-section compression cache.
+"""
+import json
+
+import pytest
+
+from scripts.section_cache import CachedSection, SectionCache, section_key
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "sections.json"
+
+
+class TestSectionKey:
+    """Cache keys must be stable and sensitive to everything that changes output."""
+
+    def test_key_is_stable(self):
+        assert section_key("## A\n\ntext", "text", "v1") == section_key("## A\n\ntext", "text", "v1")
+
+    def test_key_changes_with_text_pipeline_and_rules(self):
+        base = section_key("## A\n\ntext", "text", "v1")
+        assert section_key("## A\n\ntext.", "text", "v1") != base
+        assert section_key("## A\n\ntext", "ast", "v1") != base
+        assert section_key("## A\n\ntext", "text", "v2") != base
+
+
+class TestSectionCache:
+    """Test cases for cache persistence."""
+
+    def test_round_trip(self, cache_path):
+        cache = SectionCache(str(cache_path))
+        entry = CachedSection(compressed="## A\n\nshort", techniques=["technical_shorthand"],
+                              safety={"passed": True, "warnings": [], "failure_reason": ""}, title="A")
+        cache.put("k1", entry)
+        cache.save()
+
+        reloaded = SectionCache(str(cache_path))
+        assert reloaded.get("k1") == entry
+        assert reloaded.get("missing") is None
+        assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+    def test_prune_drops_unused_entries(self, cache_path):
+        cache = SectionCache(str(cache_path))
+        cache.put("keep", CachedSection(compressed="a"))
+        cache.put("stale", CachedSection(compressed="b"))
+        cache.prune(["keep"])
+        cache.save()
+        assert len(SectionCache(str(cache_path))) == 1
+
+    def test_corrupt_or_old_cache_is_ignored(self, cache_path):
+        cache_path.write_text("{not json")
+        assert len(SectionCache(str(cache_path))) == 0
+
+        cache_path.write_text(json.dumps({"version": 0, "sections": {"k": {"compressed": "x"}}}))
+        assert len(SectionCache(str(cache_path))) == 0
+
+    def test_save_without_changes_does_not_write(self, cache_path):
+        SectionCache(str(cache_path)).save()
+        assert not cache_path.exists()
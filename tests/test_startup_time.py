@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the CLIs.
+
+Pre-commit hooks and CI call `compress.py analyze` and `--help` on every run,
+so spaCy, sentence-transformers, scikit-learn and nltk must stay out of the
+import path. These tests fail when a heavy import creeps back in or startup
+regresses past the budget.
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Wall-clock budget in seconds for one CLI run, best of RUNS
+STARTUP_BUDGET = 1.0
+RUNS = 3
+
+HEAVY_MODULES = ('spacy', 'sentence_transformers', 'torch', 'sklearn', 'nltk')
+
+
+def best_run_time(args):
+    """Fastest of RUNS wall-clock timings of `python <args>` from the repo root"""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, *args], cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        assert result.returncode == 0, result.stderr
+    return min(timings)
+
+
+class TestStartupTime:
+    """Startup budget for analyze-only runs."""
+
+    @pytest.mark.parametrize("args", [
+        ["compress.py", "--help"],
+        ["compress.py", "--no-daemon", "analyze", "tests/fixtures/verbose_doc.md"],
+        ["compress4llm.py", "--help"],
+    ])
+    def test_cli_starts_within_budget(self, args):
+        elapsed = best_run_time(args)
+        assert elapsed < STARTUP_BUDGET, \
+            f"`{' '.join(args)}` took {elapsed:.2f}s (budget {STARTUP_BUDGET}s)"
+
+    def test_analyze_does_not_import_heavy_modules(self):
+        script = (
+            "import sys\n"
+            "from compress import CompressionTool\n"
+            "CompressionTool().analyze_document('tests/fixtures/verbose_doc.md')\n"
+            f"print('loaded:', *[m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        loaded = result.stdout.strip().splitlines()[-1].split()[1:]
+        assert loaded == [], f"Heavy modules imported: {loaded}"
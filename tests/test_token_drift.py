@@ -320,4 +320,51 @@ class TestIntegration:
                 # Should not raise exceptions
                 result = detector.check_drift(str(file_path))
                 assert isinstance(result, dict)
-                assert "recommendation" in result
\ No newline at end of file
+                assert "recommendation" in result
+
+
+class TestSectionBaselines:
+    """Per-section baselines written for incremental recompression."""
+
+    DOCUMENT = """---
+title: Guide
+---
+# Setup
+
+Install the package.
+
+```bash
+# not a section header
+pip install tool
+```
+
+## Usage
+
+Run the tool.
+"""
+
+    def test_stamp_baseline_keeps_other_keys(self, detector):
+        stamped = detector.stamp_baseline(self.DOCUMENT)
+        assert stamped.startswith("---\ntitle: Guide\ncompression:\n")
+        assert detector._extract_baseline(stamped) == detector._count_tokens(self.DOCUMENT)
+        assert detector._strip_frontmatter(stamped) == detector._strip_frontmatter(self.DOCUMENT)
+
+    def test_stamp_baseline_per_section(self, detector):
+        stamped = detector.stamp_baseline(self.DOCUMENT, per_section=True)
+        sections = detector._compression_header(stamped)["sections"]
+        assert [s["title"] for s in sections] == ["Setup", "Usage"]
+        assert all(len(s["hash"]) == 16 and s["baseline_tokens"] > 0 for s in sections)
+
+    def test_section_drift_flags_only_grown_section(self, detector, tmp_path):
+        stamped = detector.stamp_baseline(self.DOCUMENT, per_section=True)
+        grown = stamped.replace("Run the tool.", "Run the tool. " + "It now does much more. " * 5)
+        file_path = tmp_path / "doc.md"
+        file_path.write_text(grown)
+
+        results = {r["title"]: r for r in detector.check_section_drift(str(file_path))}
+        assert results["Setup"]["recommendation"] == "none"
+        assert results["Usage"]["recommendation"] == "compress"
+
+    def test_section_drift_without_baselines(self, detector, fixtures_dir):
+        results = detector.check_section_drift(str(fixtures_dir / "no_header.md"))
+        assert results and all(r["recommendation"] == "untracked" for r in results)
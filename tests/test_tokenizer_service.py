@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared, content-addressed token count cache.
+"""
+import pytest
+
+from scripts.tokenizer_service import TokenizerService, shared_tokenizer
+
+
+@pytest.fixture
+def service():
+    return TokenizerService()
+
+
+class TestTokenizerService:
+    """Test cases for cached tokenization."""
+
+    def test_matches_tiktoken(self, service):
+        text = "The API uses JSON Web Tokens (JWT) for auth. ✅"
+        assert service.encode(text) == service.encoding.encode(text)
+        assert service.count(text) == len(service.encoding.encode(text))
+
+    def test_hits_and_misses(self, service):
+        service.count("first text")
+        service.count("first text")
+        service.encode("second text")
+
+        stats = service.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+
+    def test_returned_tokens_do_not_alias_cache(self, service):
+        tokens = service.encode("mutable result")
+        tokens.append(0)
+        assert service.encode("mutable result") == service.encoding.encode("mutable result")
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        service = TokenizerService(max_bytes=1000)
+        texts = [f"document number {i} " * 20 for i in range(10)]
+        for text in texts:
+            service.count(text)
+
+        stats = service.stats()
+        assert stats['bytes'] <= 1000
+        assert stats['evictions'] == 10 - stats['entries']
+
+        service.count(texts[-1])
+        assert service.hits == 1  # Most recent entry survived
+
+    def test_entry_limit(self):
+        service = TokenizerService(max_entries=3)
+        for i in range(5):
+            service.count(f"text {i}")
+        assert service.stats()['entries'] == 3
+
+    def test_components_share_one_service(self):
+        from scripts.compression_score import CompressionScorer
+        from scripts.detect_token_drift import TokenDriftDetector
+
+        assert CompressionScorer().token_cache is shared_tokenizer()
+        assert TokenDriftDetector().token_cache is shared_tokenizer()
+
+    def test_encode_batch_matches_encode(self, service):
+        texts = ["alpha beta", "gamma", "alpha beta", ""]
+        service.count("gamma")
+
+        assert service.encode_batch(texts) == [service.encoding.encode(t) for t in texts]
+        # "gamma" was cached and "alpha beta" is encoded once for both copies
+        assert (service.hits, service.misses) == (2, 3)